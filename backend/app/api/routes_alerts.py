@@ -1,28 +1,142 @@
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session
 from typing import List, Optional
+from app.core.compression import IDENTITY, CompressedPayloadCache, negotiate_encoding
+from app.core.config import settings
 from app.db.session import get_session
-from app.schemas.alert import FrontendAlertResponse, AlertFilter
-from app.services.alerts import get_filtered_alerts_with_reports
+from app.db.models import DisasterType
+from app.schemas.alert import (
+    FrontendAlertResponse, AlertFilter, AlertGridResponse, AlertStatsResponse, TimeseriesResponse
+)
+from app.services.alert_json import json_array
+from app.services.alerts import get_filtered_alerts_json
+from app.services.grid import get_grid_cells
+from app.services.hot_store import hot_alerts
+from app.services.rollups import GROUP_BY_DIMENSIONS, get_alert_stats
+from app.services.timeseries import INTERVALS, get_timeseries
 
 router = APIRouter()
 
+# Feeds answered from the hot store, compressed once per store version and filter
+_feed_payloads = CompressedPayloadCache()
+
 
 @router.get("/alerts", response_model=List[FrontendAlertResponse])
 async def get_alerts(
+        request: Request,
         type: Optional[str] = Query(None, description="Filter by disaster type"),
         min_severity: Optional[int] = Query(None, ge=0, le=100, description="Minimum severity score"),
         limit: Optional[int] = Query(None, ge=1, le=100, description="Limit number of results"),
         active_only: bool = Query(True, description="Show only active alerts"),
+        archived: bool = Query(False, description="Query archived (expired) alerts instead"),
         session: Session = Depends(get_session)
 ):
     """Get alerts with proper frontend-compatible format"""
+    alert_filter = AlertFilter(
+        type=type,
+        min_severity=min_severity,
+        limit=limit,
+        active_only=active_only,
+        archived=archived
+    )
+
+    # Active alert feeds are usually answered from memory; either way the body is
+    # assembled from per-alert JSON encoded once, not re-serialized per request
+    version = hot_alerts.version
+    alerts = hot_alerts.query(alert_filter)
+    if alerts is None:
+        return Response(content=get_filtered_alerts_json(session, alert_filter), media_type="application/json")
+
+    encoding = IDENTITY
+    if settings.COMPRESSION_ENABLED:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    key = (version, alert_filter.type, alert_filter.min_severity, alert_filter.limit)
+    body, encoding = _feed_payloads.get(key, encoding, lambda: json_array(alert.json for alert in alerts))
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding != IDENTITY:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Alerts are stored in naive UTC"""
+    if value is not None and value.tzinfo:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@router.get("/alerts/stats", response_model=AlertStatsResponse, response_model_exclude_none=True)
+async def get_alerts_stats(
+        type: Optional[str] = Query(None, description="Filter by disaster type"),
+        min_severity: Optional[int] = Query(None, ge=0, le=100, description="Minimum severity score"),
+        active_only: bool = Query(True, description="Count only active alerts"),
+        group_by: str = Query("disaster_type", description="Comma separated: disaster_type, severity_bucket, source, hour"),
+        since: Optional[datetime] = Query(None, description="Only alerts created at or after this time"),
+        until: Optional[datetime] = Query(None, description="Only alerts created before this time"),
+        limit: Optional[int] = Query(None, ge=1, le=1000, description="Limit number of groups"),
+        session: Session = Depends(get_session)
+):
+    """Alert counts and severity aggregated per group"""
+    dimensions = [name.strip() for name in group_by.split(",") if name.strip()]
+    unknown = [name for name in dimensions if name not in GROUP_BY_DIMENSIONS]
+    if unknown or len(set(dimensions)) != len(dimensions):
+        raise HTTPException(status_code=400, detail=f"Invalid group_by; choose from {', '.join(GROUP_BY_DIMENSIONS)}")
+
+    since, until = _naive_utc(since), _naive_utc(until)
+
     alert_filter = AlertFilter(
         type=type,
         min_severity=min_severity,
         limit=limit,
         active_only=active_only
     )
+    buckets = get_alert_stats(session, alert_filter, dimensions, since=since, until=until)
+    return AlertStatsResponse(group_by=dimensions, buckets=buckets)
+
+
+@router.get("/alerts/timeseries", response_model=TimeseriesResponse)
+async def get_alerts_timeseries(
+        interval: str = Query("1h", description=f"Bucket width: {', '.join(INTERVALS)}"),
+        since: Optional[datetime] = Query(None, description="Start of the range; defaults to 100 intervals ago"),
+        until: Optional[datetime] = Query(None, description="End of the range (exclusive); defaults to now"),
+        type: Optional[DisasterType] = Query(None, description="Filter alerts by disaster type"),
+        session: Session = Depends(get_session)
+):
+    """Alert counts and severity percentiles per time bucket and disaster type, and report volume"""
+    if interval not in INTERVALS:
+        raise HTTPException(status_code=400, detail=f"Invalid interval; choose from {', '.join(INTERVALS)}")
+    since, until = _naive_utc(since), _naive_utc(until)
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+    return get_timeseries(session, interval, since=since, until=until, disaster_type=type)
+
+
+def _parse_bbox(bbox: str):
+    """Parse "west,south,east,north" into (south, west, north, east), wrapping longitudes"""
+    try:
+        west, south, east, north = [float(value) for value in bbox.split(",")]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be west,south,east,north")
+    if south > north:
+        raise HTTPException(status_code=400, detail="bbox south must not exceed north")
+
+    if east - west >= 360:
+        west, east = -180.0, 180.0
+    else:
+        west, east = [value if -180.0 <= value <= 180.0 else ((value + 180.0) % 360.0) - 180.0
+                      for value in (west, east)]
+    south = min(max(south, -90.0), 90.0)
+    north = min(max(north, -90.0), 90.0)
+    return south, west, north, east
 
-    alerts = get_filtered_alerts_with_reports(session, alert_filter)
-    return alerts
\ No newline at end of file
+
+@router.get("/alerts/grid", response_model=AlertGridResponse)
+async def get_alerts_grid(
+        bbox: str = Query("-180,-90,180,90", description="Map bounds as west,south,east,north"),
+        zoom: int = Query(2, ge=0, le=22, description="Map zoom level"),
+        active_only: bool = Query(True, description="Count only active alerts"),
+        session: Session = Depends(get_session)
+):
+    """Per-cell alert counts and max severity at a resolution matching the zoom"""
+    return get_grid_cells(session, _parse_bbox(bbox), zoom, active_only=active_only)
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.schemas.alert import AlertFilter
+from app.services.export import (
+    ALERT_COLUMNS, EXPORT_FORMATS, REPORT_COLUMNS, alert_export_query, report_export_query, stream_export
+)
+
+router = APIRouter()
+
+FORMAT_PATTERN = "^(" + "|".join(EXPORT_FORMATS) + ")$"
+
+
+def _streaming_response(query, columns, export_format: str, name: str) -> StreamingResponse:
+    extension = "json" if export_format == "geojson" else export_format
+    return StreamingResponse(
+        stream_export(query, columns, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'},
+    )
+
+
+@router.get("/export/alerts")
+def export_alerts(
+        format: str = Query("ndjson", pattern=FORMAT_PATTERN, description="ndjson, csv or geojson"),
+        type: Optional[str] = Query(None, description="Filter by disaster type"),
+        min_severity: Optional[int] = Query(None, ge=0, le=100, description="Minimum severity score"),
+        limit: Optional[int] = Query(None, ge=1, description="Limit number of rows"),
+        active_only: bool = Query(True, description="Export only active alerts"),
+        archived: bool = Query(False, description="Export archived alerts instead of live ones"),
+):
+    """Stream all matching alerts"""
+    alert_filter = AlertFilter(type=type, min_severity=min_severity, limit=limit, active_only=active_only,
+                               archived=archived)
+    return _streaming_response(alert_export_query(alert_filter), ALERT_COLUMNS, format, "alerts")
+
+
+@router.get("/export/reports")
+def export_reports(
+        format: str = Query("ndjson", pattern=FORMAT_PATTERN, description="ndjson, csv or geojson"),
+        type: Optional[str] = Query(None, description="Only reports clustered into alerts of this type"),
+        min_severity: Optional[int] = Query(None, ge=0, le=100, description="Minimum severity of the report's alert"),
+        limit: Optional[int] = Query(None, ge=1, description="Limit number of rows"),
+        active_only: bool = Query(False, description="Only reports whose alert is active"),
+):
+    """Stream all matching reports; alert filters apply to the incident each report belongs to"""
+    alert_filter = AlertFilter(type=type, min_severity=min_severity, limit=limit, active_only=active_only)
+    return _streaming_response(report_export_query(alert_filter), REPORT_COLUMNS, format, "reports")
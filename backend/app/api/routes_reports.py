@@ -1,42 +1,115 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session
+from typing import Optional, Union
 from app.db.session import get_session
 from app.db.models import Report
-from app.schemas.report import ReportCreate, ReportResponse, AnalyzeRequest, ReportStatusResponse
+from app.schemas.report import (
+    ReportCreate, ReportResponse, AnalyzeRequest, ReportStatusResponse, ReanalyzeResponse
+)
+from app.services.admission import admit_report
+from app.services.idempotency import IdempotencyConflict, find_replay, remember_key, request_fingerprint
+from app.services.alerts import reanalyze_report
 from app.services.analyzer import analyze_report
-from app.services.alerts import run_analysis_and_create_alert
+from app.services.analysis_queue import prescore_report, region_rates, submit_report
+from app.services.timeseries import report_received
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+STATUS_MESSAGES = {
+    "received": "Report received, analysis in progress",
+    "deferred": "Report received, analysis delayed due to high load",
+}
+
+
+def _replay(session: Session, report_data: ReportCreate, key: str, fingerprint: str,
+            response: Response) -> Optional[Union[Response, ReportStatusResponse]]:
+    """The original response for a retried submission, or None if the key is new"""
+    try:
+        entry = find_replay(session, report_data.source, key, fingerprint)
+    except IdempotencyConflict:
+        raise HTTPException(status_code=422, detail="Idempotency key was already used for a different report")
+    if entry is None:
+        return None
+    logger.info("Replayed report ID: %s for idempotency key %s", entry.report_id, key)
+    if entry.response_body is not None:
+        # Byte for byte what the first request got, not the report as it is now
+        return Response(content=entry.response_body, status_code=entry.response_status,
+                        media_type="application/json", headers={"Idempotent-Replayed": "true"})
+
+    # Remembered before responses were stored with the key
+    response.headers["Idempotent-Replayed"] = "true"
+    report = session.get(Report, entry.report_id)
+    return ReportStatusResponse(status=entry.status, report=report, message=STATUS_MESSAGES[entry.status])
+
+
 @router.post("/report", response_model=ReportStatusResponse)
 async def create_report(
         report_data: ReportCreate,
-        background_tasks: BackgroundTasks,
-        session: Session = Depends(get_session)
+        response: Response,
+        session: Session = Depends(get_session),
+        idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
 ):
     """Create a new disaster report and trigger background analysis"""
+    # Client retries with the same key get the original response: one indexed lookup, no insert or analysis
+    key = idempotency_key or report_data.dedup_key
+    fingerprint = request_fingerprint(report_data) if key else None
+    if key:
+        replay = _replay(session, report_data, key, fingerprint, response)
+        if replay is not None:
+            return replay
+
+    # Shed load before touching the database when the analysis backlog is over its hard limit
+    admission = admit_report(report_data.source)
+    if admission.decision == "reject":
+        raise HTTPException(
+            status_code=429,
+            detail="Too many reports awaiting analysis, please retry later",
+            headers={"Retry-After": str(admission.retry_after)},
+        )
+
     try:
-        db_report = Report(**report_data.dict())
+        db_report = Report(**report_data.dict(exclude={"dedup_key"}))
+        region_count = region_rates.record(db_report.lat, db_report.lon)
+        db_report.priority = prescore_report(db_report.text, db_report.source, region_count)
+        db_report.analysis_deferred = admission.decision == "defer"
+        status = "deferred" if db_report.analysis_deferred else "received"
         session.add(db_report)
-        session.commit()
+        report_received(session, db_report)
+        if key:
+            session.flush()
+            original = ReportStatusResponse(status=status, report=db_report, message=STATUS_MESSAGES[status])
+            remember_key(session, db_report.source, key, fingerprint, db_report, status, original.model_dump_json())
+        try:
+            session.commit()
+        except IntegrityError:
+            if not key:
+                raise
+            # A concurrent retry with the same key won the race; answer with its report
+            session.rollback()
+            replay = _replay(session, report_data, key, fingerprint, response)
+            if replay is None:
+                raise
+            return replay
         session.refresh(db_report)
 
-        # Trigger background analysis
-        background_tasks.add_task(run_analysis_and_create_alert, db_report.id)
+        # Queue for background analysis, highest priority first
+        submit_report(db_report)
 
-        logger.info(f"Created report ID: {db_report.id}, analysis queued")
+        if db_report.analysis_deferred:
+            logger.info("Created report ID: %s, analysis deferred under load", db_report.id)
+        else:
+            logger.info("Created report ID: %s, analysis queued at priority %s", db_report.id, db_report.priority)
 
-        return ReportStatusResponse(
-            status="received",
-            report=db_report,
-            message="Report received, analysis in progress"
-        )
+        return ReportStatusResponse(status=status, report=db_report, message=STATUS_MESSAGES[status])
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error creating report: {str(e)}")
+        logger.error("Error creating report: %s", e)
         raise HTTPException(status_code=500, detail="Failed to create report")
 
 
@@ -52,13 +125,42 @@ async def analyze_report_endpoint(analyze_request: AnalyzeRequest, session: Sess
         # Call the AI analyzer
         analysis_result = await analyze_report(report.text, report.lat, report.lon)
 
-        logger.info(f"Analysis completed for report {analyze_request.report_id}: "
-                    f"{analysis_result['disaster_type']} (severity: {analysis_result['severity_score']})")
+        logger.info("Analysis completed for report %s: %s (severity: %s)", analyze_request.report_id,
+                    analysis_result["disaster_type"], analysis_result["severity_score"])
 
         return analysis_result
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Analysis failed for report {analyze_request.report_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail="Analysis failed")
\ No newline at end of file
+        logger.error("Analysis failed for report %s: %s", analyze_request.report_id, e)
+        raise HTTPException(status_code=500, detail="Analysis failed")
+
+
+@router.post("/reports/{report_id}/reanalyze", response_model=ReanalyzeResponse)
+async def reanalyze_report_endpoint(report_id: int, session: Session = Depends(get_session)):
+    """Re-derive a report's type and severity, calling only adapters whose stored evidence is missing or stale"""
+    report = session.get(Report, report_id)
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    try:
+        analysis_result, alert = await reanalyze_report(session, report)
+    except Exception as e:
+        logger.error("Re-analysis failed for report %s: %s", report_id, e)
+        raise HTTPException(status_code=500, detail="Analysis failed")
+
+    reused = analysis_result["reused_stages"]
+    logger.info("Re-analyzed report %s: %s (severity: %s), reused %s", report_id,
+                analysis_result["disaster_type"], analysis_result["severity_score"], reused or "nothing")
+
+    return ReanalyzeResponse(
+        report_id=report_id,
+        disaster_type=analysis_result["disaster_type"],
+        severity_score=analysis_result["severity_score"],
+        summary=analysis_result["summary"],
+        location_name=analysis_result["location_name"],
+        alert_id=alert.id if alert is not None else report.alert_id,
+        reused_stages=reused,
+        recomputed_stages=sorted(set(analysis_result["evidence"]) - set(reused)),
+    )
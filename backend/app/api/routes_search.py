@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+from typing import Optional
+from app.db.models import DisasterType
+from app.db.session import get_session
+from app.schemas.alert import AlertFilter, SearchResponse
+from app.services.search import SearchUnavailable, search
+
+router = APIRouter()
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search_alerts_and_reports(
+        q: str = Query(..., min_length=1, max_length=500, description="Words or \"quoted phrases\"; all must match"),
+        type: Optional[DisasterType] = Query(None, description="Filter by disaster type"),
+        min_severity: Optional[int] = Query(None, ge=0, le=100, description="Minimum severity score"),
+        active_only: bool = Query(True, description="Only active alerts and their reports"),
+        limit: int = Query(20, ge=1, le=100, description="Limit number of results per list"),
+        session: Session = Depends(get_session)
+):
+    """Full-text search over alert summaries and report text, best matches first"""
+    alert_filter = AlertFilter(type=type, min_severity=min_severity, active_only=active_only)
+    try:
+        results = search(session, q, alert_filter, limit=limit)
+    except SearchUnavailable:
+        raise HTTPException(status_code=503, detail="Search index is not available")
+    return SearchResponse(query=q, **results)
@@ -0,0 +1,230 @@
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip is always available
+    brotli = None
+
+# Levels for responses compressed on the fly, and for payloads compressed once and cached
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+CACHED_GZIP_LEVEL = 9
+CACHED_BROTLI_QUALITY = 9
+
+IDENTITY = "identity"
+
+
+def available_encodings() -> List[str]:
+    """Supported content codings, most preferred first"""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: str) -> str:
+    """The preferred supported coding the client accepts, or identity"""
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            accepted[name.strip()] = quality
+
+    best, best_quality = IDENTITY, 0.0
+    for encoding in available_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=CACHED_BROTLI_QUALITY if cached else BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=CACHED_GZIP_LEVEL if cached else GZIP_LEVEL, mtime=0)
+    return body
+
+
+class _StreamCompressor:
+    """Compresses a streamed body chunk by chunk, flushing each so clients can decode as it arrives"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def compressible(content_type: str) -> bool:
+    content_type = content_type.split(";")[0].strip().lower()
+    return content_type.startswith("text/") or content_type.endswith("json") or content_type.endswith("+xml")
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing text and JSON responses with brotli or gzip.
+
+    Whole bodies under COMPRESSION_MIN_BYTES go out as they are; streamed
+    bodies (exports) are compressed chunk by chunk. Responses that already
+    carry a Content-Encoding, such as precompressed cached payloads, pass through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        encoding = negotiate_encoding(accept_encoding) if accept_encoding else IDENTITY
+
+        start_message = None
+        compressor: Optional[_StreamCompressor] = None
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor
+            if message["type"] == "http.response.start":
+                headers = {name.lower(): value for name, value in message.get("headers", [])}
+                if (b"content-encoding" in headers
+                        or not compressible(headers.get(b"content-type", b"").decode("latin-1"))):
+                    await send(message)
+                    return
+                # Held until the first body chunk shows whether the body is whole or streamed
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                start, start_message = start_message, None
+                if encoding == IDENTITY or (not more_body and len(body) < settings.COMPRESSION_MIN_BYTES):
+                    await send(_with_headers(start))
+                    await send(message)
+                    return
+                if not more_body:
+                    body = compress(body, encoding)
+                    await send(_with_headers(start, encoding=encoding, length=len(body)))
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                compressor = _StreamCompressor(encoding)
+                await send(_with_headers(start, encoding=encoding))
+                # Keeps the remaining chunks on this path
+                start_message = start
+
+            data = compressor.chunk(body) if body else b""
+            if not more_body:
+                data += compressor.finish()
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _with_headers(message, encoding: Optional[str] = None, length: Optional[int] = None):
+    """The response start message with Vary, Content-Encoding and Content-Length adjusted"""
+    headers = []
+    varies = False
+    for name, value in message.get("headers", []):
+        lowered = name.lower()
+        if lowered == b"content-length" and (encoding or length is not None):
+            continue
+        if lowered == b"vary":
+            varies = True
+            if b"accept-encoding" not in value.lower():
+                value = value + b", Accept-Encoding"
+        headers.append((name, value))
+    if not varies:
+        headers.append((b"vary", b"Accept-Encoding"))
+    if encoding:
+        headers.append((b"content-encoding", encoding.encode()))
+    if length is not None:
+        headers.append((b"content-length", str(length).encode()))
+    return {**message, "headers": headers}
+
+
+class CompressedPayloadCache:
+    """
+    Response bodies kept in every negotiated coding, least recently used evicted.
+
+    Keys must change whenever the payload would, e.g. by including a version
+    of the data it was built from, so entries are never invalidated explicitly.
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        self._lock = threading.Lock()
+        self._capacity = capacity
+        self._payloads: "OrderedDict[Hashable, Dict[str, bytes]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def get(self, key: Hashable, encoding: str, build: Callable[[], bytes]) -> Tuple[bytes, str]:
+        """
+        The payload for key and the coding it is in, built and compressed on first use.
+
+        Payloads under COMPRESSION_MIN_BYTES are returned uncompressed, as identity.
+        """
+        with self._lock:
+            codings = self._payloads.get(key)
+            if codings is not None:
+                self._payloads.move_to_end(key)
+                payload = codings.get(encoding)
+            else:
+                payload = None
+        record_cache_lookup("compressed_payloads", payload is not None)
+        if payload is not None:
+            return payload, (encoding if payload is not codings[IDENTITY] else IDENTITY)
+
+        # Built outside the lock; concurrent misses for one key do the same work once each
+        identity = codings.get(IDENTITY) if codings is not None else None
+        if identity is None:
+            identity = build()
+        payload, coding = identity, IDENTITY
+        if encoding != IDENTITY and len(identity) >= settings.COMPRESSION_MIN_BYTES:
+            payload, coding = compress(identity, encoding, cached=True), encoding
+
+        capacity = self._capacity or settings.COMPRESSION_CACHE_SIZE
+        with self._lock:
+            codings = self._payloads.setdefault(key, {})
+            codings[IDENTITY] = identity
+            codings[encoding] = payload
+            self._payloads.move_to_end(key)
+            while len(self._payloads) > capacity:
+                self._payloads.popitem(last=False)
+        return payload, coding
+
+    def clear(self):
+        with self._lock:
+            self._payloads.clear()
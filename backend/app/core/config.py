@@ -7,6 +7,17 @@ class Settings:
     """Application settings"""
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./alertrix.db")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+
+    # Logging pipeline
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")  # text | json
+    LOG_FILE: str = os.getenv("LOG_FILE", "alertrix.log")  # empty disables file output
+    LOG_MAX_BYTES: int = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT: int = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # Per-logger controls for sub-WARNING records, e.g. "app.services.analyzer=0.1"
+    LOG_SAMPLING: str = os.getenv("LOG_SAMPLING", "")
+    LOG_RATE_LIMITS: str = os.getenv("LOG_RATE_LIMITS", "")  # records per second
 
     # AI Integration Settings
     USE_MOCK_AI: bool = os.getenv("USE_MOCK_AI", "true").lower() == "true"
@@ -14,4 +25,112 @@ class Settings:
     HF_API_KEY: str = os.getenv("HF_API_KEY", "")
     OPENWEATHER_KEY: str = os.getenv("OPENWEATHER_KEY", "")
 
+    # Adaptive (AIMD) in-flight limits per upstream provider
+    ADAPTIVE_LIMIT_INITIAL: int = int(os.getenv("ADAPTIVE_LIMIT_INITIAL", "4"))
+    ADAPTIVE_LIMIT_MIN: int = int(os.getenv("ADAPTIVE_LIMIT_MIN", "1"))
+    ADAPTIVE_LIMIT_MAX: int = int(os.getenv("ADAPTIVE_LIMIT_MAX", "64"))
+    ADAPTIVE_LIMIT_MAX_OVERRIDES: str = os.getenv("ADAPTIVE_LIMIT_MAX_OVERRIDES", "nominatim=1")
+    ADAPTIVE_LATENCY_TOLERANCE: float = float(os.getenv("ADAPTIVE_LATENCY_TOLERANCE", "2.5"))
+    ADAPTIVE_BACKOFF: float = float(os.getenv("ADAPTIVE_BACKOFF", "0.7"))
+
+    # Local keyword classifier tier; ambiguous texts go to the remote model
+    LOCAL_CLASSIFIER_ENABLED: bool = os.getenv("LOCAL_CLASSIFIER_ENABLED", "true").lower() == "true"
+    LOCAL_CLASSIFIER_MIN_SCORE: float = float(os.getenv("LOCAL_CLASSIFIER_MIN_SCORE", "2.0"))
+    LOCAL_CLASSIFIER_MIN_SHARE: float = float(os.getenv("LOCAL_CLASSIFIER_MIN_SHARE", "0.6"))
+
+    # Summary routing: short reports stay local, long or severe ones go to the LLM
+    SUMMARY_LOCAL_MAX_CHARS: int = int(os.getenv("SUMMARY_LOCAL_MAX_CHARS", "200"))
+    SUMMARY_LLM_MIN_CHARS: int = int(os.getenv("SUMMARY_LLM_MIN_CHARS", "800"))
+    SUMMARY_LLM_MIN_SEVERITY: int = int(os.getenv("SUMMARY_LLM_MIN_SEVERITY", "75"))
+
+    # Analysis scheduling: worker pool fed by a priority queue with aging.
+    # inprocess runs it inside each API process; worker leaves it to scripts/analysis_worker.py,
+    # whose processes claim reports from the database
+    ANALYSIS_MODE: str = os.getenv("ANALYSIS_MODE", "inprocess")  # inprocess | worker
+    ANALYSIS_WORKERS: int = int(os.getenv("ANALYSIS_WORKERS", "8"))
+    ANALYSIS_POLL_SECONDS: float = float(os.getenv("ANALYSIS_POLL_SECONDS", "1.0"))
+    ANALYSIS_REFILL_INTERVAL_SECONDS: float = float(os.getenv("ANALYSIS_REFILL_INTERVAL_SECONDS", "1.0"))  # Deferred report release checks
+    ANALYSIS_CLAIM_TIMEOUT_SECONDS: float = float(os.getenv("ANALYSIS_CLAIM_TIMEOUT_SECONDS", "300"))
+    PRIORITY_AGING_PER_MINUTE: float = float(os.getenv("PRIORITY_AGING_PER_MINUTE", "10"))
+    PRIORITY_RATE_WINDOW_SECONDS: float = float(os.getenv("PRIORITY_RATE_WINDOW_SECONDS", "600"))
+    PRIORITY_SOURCE_WEIGHTS: str = os.getenv(
+        "PRIORITY_SOURCE_WEIGHTS", "emergency_services=40,web_portal=20,mobile_app=20,sms=15,twitter=5"
+    )
+
+    # Ingest admission control on analysis backlog depth and oldest wait:
+    # above a soft limit reports are stored with analysis deferred, above a hard limit they get a 429
+    ADMISSION_SOFT_DEPTH: int = int(os.getenv("ADMISSION_SOFT_DEPTH", "500"))
+    ADMISSION_HARD_DEPTH: int = int(os.getenv("ADMISSION_HARD_DEPTH", "5000"))
+    ADMISSION_SOFT_AGE_SECONDS: float = float(os.getenv("ADMISSION_SOFT_AGE_SECONDS", "120"))
+    ADMISSION_HARD_AGE_SECONDS: float = float(os.getenv("ADMISSION_HARD_AGE_SECONDS", "900"))
+    ADMISSION_RETRY_AFTER_SECONDS: int = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "30"))
+    ADMISSION_TRUSTED_SOURCES: str = os.getenv("ADMISSION_TRUSTED_SOURCES", "emergency_services")
+
+    # Idempotent report submission: how long Idempotency-Key / dedup_key values are remembered
+    IDEMPOTENCY_TTL_HOURS: float = float(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+
+    # CPU-bound local stages (keyword classifier, extractive summarizer): inline on the event loop,
+    # or micro-batched into a process pool (0 processes = one per core)
+    STAGE_EXECUTOR: str = os.getenv("STAGE_EXECUTOR", "inline")  # inline | process
+    STAGE_PROCESSES: int = int(os.getenv("STAGE_PROCESSES", "0"))
+    STAGE_BATCH_SIZE: int = int(os.getenv("STAGE_BATCH_SIZE", "32"))
+    STAGE_BATCH_WAIT_MS: float = float(os.getenv("STAGE_BATCH_WAIT_MS", "2"))
+
+    # Incident clustering: reports within radius and time window join one alert
+    CLUSTERING_ENABLED: bool = os.getenv("CLUSTERING_ENABLED", "true").lower() == "true"
+    CLUSTER_RADIUS_KM: float = float(os.getenv("CLUSTER_RADIUS_KM", "5"))
+    CLUSTER_WINDOW_MINUTES: float = float(os.getenv("CLUSTER_WINDOW_MINUTES", "180"))
+
+    # Map grid: upper bound on cells returned per request; coarser levels are used beyond it
+    GRID_MAX_CELLS: int = int(os.getenv("GRID_MAX_CELLS", "2000"))
+
+    # Hot alert store: the newest active alerts held in memory to serve /alerts, synced from the
+    # database every few seconds for alerts written by other processes
+    HOT_STORE_ENABLED: bool = os.getenv("HOT_STORE_ENABLED", "true").lower() == "true"
+    HOT_STORE_SIZE: int = int(os.getenv("HOT_STORE_SIZE", "1000"))
+    HOT_STORE_SYNC_SECONDS: float = float(os.getenv("HOT_STORE_SYNC_SECONDS", "2"))
+
+    # Encoded JSON kept per alert for /alerts listings read from the database
+    ALERT_JSON_CACHE_SIZE: int = int(os.getenv("ALERT_JSON_CACHE_SIZE", "10000"))
+
+    # Response compression (brotli when the brotli package is installed, otherwise gzip)
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_BYTES: int = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))  # Smaller whole bodies go out as they are
+    COMPRESSION_CACHE_SIZE: int = int(os.getenv("COMPRESSION_CACHE_SIZE", "256"))  # Precompressed /alerts feeds kept
+
+    # Time series: upper bound on buckets per response; longer ranges are served at coarser intervals
+    TIMESERIES_MAX_POINTS: int = int(os.getenv("TIMESERIES_MAX_POINTS", "500"))
+
+    # Alert expiry: per-type TTL (hours since the last report) and archival of expired alerts
+    EXPIRY_ENABLED: bool = os.getenv("EXPIRY_ENABLED", "true").lower() == "true"
+    EXPIRY_INTERVAL_SECONDS: float = float(os.getenv("EXPIRY_INTERVAL_SECONDS", "300"))
+    EXPIRY_BATCH_SIZE: int = int(os.getenv("EXPIRY_BATCH_SIZE", "500"))
+    ALERT_TTL_HOURS: str = os.getenv(
+        "ALERT_TTL_HOURS", "storm=24,fire=48,flood=72,earthquake=72,volcano=168,other=24"
+    )
+    ARCHIVE_AFTER_HOURS: float = float(os.getenv("ARCHIVE_AFTER_HOURS", "168"))  # Inactive alerts older than this move to the archive
+
+    # One-time startup work (schema, seeding) runs in one process under this lease
+    STARTUP_LEASE_SECONDS: float = float(os.getenv("STARTUP_LEASE_SECONDS", "300"))
+
+    # Full-text search: matches ranked per query, newest first, bounding latency for common words
+    SEARCH_MAX_CANDIDATES: int = int(os.getenv("SEARCH_MAX_CANDIDATES", "5000"))
+
+    # Bulk export: rows fetched from the server-side cursor and written per chunk
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+
+    # Analysis backfill: analyses in flight (adapters still obey their adaptive limits) and reports per commit
+    BACKFILL_CONCURRENCY: int = int(os.getenv("BACKFILL_CONCURRENCY", "64"))
+    BACKFILL_BATCH_SIZE: int = int(os.getenv("BACKFILL_BATCH_SIZE", "200"))
+
+    # Cold import of app.main must stay under this; checked by tests/test_import_time.py,
+    # profiled with python -m scripts.profile_imports
+    IMPORT_TIME_BUDGET_SECONDS: float = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", "2.0"))
+
+    # Request profiling (Server-Timing headers and sampled stack profiles)
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0.0"))
+    PROFILING_INTERVAL_MS: float = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "profiles")
+
 settings = Settings()
\ No newline at end of file
@@ -1,14 +1,190 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
 from app.core.config import settings
 
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes present on every LogRecord; anything else was passed via `extra=`
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_exception_formatter = logging.Formatter()
+
+
+def parse_logger_map(spec: str) -> Dict[str, float]:
+    """Parse "logger=value,other.logger=value" settings into a dict"""
+    result = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, value = item.split("=", 1)
+        result[name.strip()] = float(value)
+    return result
+
+
+def _lookup(name: str, table: Dict[str, float], cache: Dict[str, Optional[float]]) -> Optional[float]:
+    """Find the setting for a logger, inheriting from the closest configured parent"""
+    try:
+        return cache[name]
+    except KeyError:
+        pass
+    value = None
+    candidate = name
+    while candidate:
+        if candidate in table:
+            value = table[candidate]
+            break
+        candidate = candidate.rpartition(".")[0]
+    cache[name] = value
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any `extra=` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # Rendered by DroppingQueueHandler.prepare before the record crossed the queue
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a fraction of sub-WARNING records for configured loggers"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._cache: Dict[str, Optional[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = _lookup(record.name, self.rates, self._cache)
+        return rate is None or random.random() < rate
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per logger capping sub-WARNING records per second"""
+
+    def __init__(self, limits: Dict[str, float]):
+        super().__init__()
+        self.limits = limits
+        self._cache: Dict[str, Optional[float]] = {}
+        self._buckets: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        limit = _lookup(record.name, self.limits, self._cache)
+        if limit is None:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                bucket = self._buckets[record.name] = [limit, now]
+            tokens = min(limit, bucket[0] + (now - bucket[1]) * limit)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                return False
+            bucket[0] = tokens - 1
+            return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Render the message and traceback separately for the writer thread.
+
+        QueueHandler.prepare folds the traceback into msg and clears
+        exc_info, which left JSON output with no exc_info field. The
+        traceback goes in exc_text instead, which formatters print as is.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def _build_output_handlers():
+    formatter = JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if settings.LOG_FILE:
+        handlers.append(logging.handlers.RotatingFileHandler(
+            settings.LOG_FILE,
+            maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def setup_logging():
-    """Setup basic logging configuration"""
-    logging.basicConfig(
-        level=settings.LOG_LEVEL,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler("alertrix.log")
-        ]
-    )
\ No newline at end of file
+    """Setup queue-based logging; records are written to stdout and file by a background thread"""
+    global _listener
+    stop_logging()
+
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(parse_logger_map(settings.LOG_SAMPLING)))
+    queue_handler.addFilter(RateLimitFilter(parse_logger_map(settings.LOG_RATE_LIMITS)))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, DroppingQueueHandler):
+            root.removeHandler(handler)
+    root.setLevel(settings.LOG_LEVEL)
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *_build_output_handlers(), respect_handler_level=True)
+    _listener.start()
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,346 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Default latency buckets in seconds (5ms .. 30s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "_upper_bounds", "counts", "sum", "count")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self._upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect_left(self._upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self) -> "_Timer":
+        """Context manager observing the elapsed wall time of its block"""
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, child: _HistogramChild):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._child.observe(time.perf_counter() - self._start)
+
+
+class _Metric:
+    """Base class for a metric family with optional labels"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Return the child for the given label values, creating it on first use"""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._new_child()
+                    self._children[values] = child
+        return child
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._children[()].inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}_total{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+            for values, child in list(self._children.items())
+        ]
+
+
+class Gauge(_Metric):
+    """Gauge that is either set directly or read from a callback at scrape time"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 callback: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._callback = callback
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._children[()].set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._children[()].inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._children[()].dec(amount)
+
+    def _samples(self) -> List[str]:
+        if self._callback is not None:
+            return [f"{self.name} {_format_value(self._callback())}"]
+        return [
+            f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+            for values, child in list(self._children.items())
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed upper bounds"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.upper_bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float):
+        self._children[()].observe(value)
+
+    def time(self) -> _Timer:
+        return self._children[()].time()
+
+    def _samples(self) -> List[str]:
+        lines = []
+        bucket_names = self.labelnames + ("le",)
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total_sum = child.sum
+                total_count = child.count
+            cumulative = 0
+            for bound, count in zip(self.upper_bounds + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(bucket_names, values + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total_sum)}")
+            lines.append(f"{self.name}_count{labels} {total_count}")
+        return lines
+
+
+class Registry:
+    """Collection of metric families rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class BacklogTracker:
+    """Tracks queued background work so depth and age can be exported"""
+
+    def __init__(self):
+        # Insertion ordered, so the first entry is always the oldest pending item
+        self._pending: Dict[int, float] = {}
+
+    def add(self, item_id: int):
+        self._pending[item_id] = time.monotonic()
+
+    def remove(self, item_id: int) -> Optional[float]:
+        """Stop tracking an item, returning how long it waited"""
+        enqueued_at = self._pending.pop(item_id, None)
+        if enqueued_at is None:
+            return None
+        return time.monotonic() - enqueued_at
+
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def oldest_age(self) -> float:
+        try:
+            enqueued_at = next(iter(self._pending.values()))
+        except (StopIteration, RuntimeError):
+            return 0.0
+        return time.monotonic() - enqueued_at
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+analysis_backlog = BacklogTracker()
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "alertrix_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+))
+ADAPTER_CALL_DURATION = REGISTRY.register(Histogram(
+    "alertrix_adapter_call_duration_seconds",
+    "AI/integration adapter call latency by outcome (real, local, mock, fallback, error)",
+    ("adapter", "outcome"),
+))
+DB_QUERY_DURATION = REGISTRY.register(Histogram(
+    "alertrix_db_query_duration_seconds",
+    "Database statement execution time by statement type",
+    ("operation",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+))
+ANALYSIS_QUEUE_WAIT = REGISTRY.register(Histogram(
+    "alertrix_analysis_queue_wait_seconds",
+    "Time a report waited in the background analysis queue",
+))
+REPORT_TO_ALERT = REGISTRY.register(Histogram(
+    "alertrix_report_to_alert_seconds",
+    "End-to-end time from report creation to alert creation",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+))
+ADAPTER_CONCURRENCY_LIMIT = REGISTRY.register(Gauge(
+    "alertrix_adapter_concurrency_limit",
+    "Current adaptive in-flight request limit per upstream provider",
+    ("provider",),
+))
+ADAPTER_INFLIGHT = REGISTRY.register(Gauge(
+    "alertrix_adapter_inflight_requests",
+    "Requests currently in flight per upstream provider",
+    ("provider",),
+))
+ADAPTER_LIMIT_WAIT = REGISTRY.register(Histogram(
+    "alertrix_adapter_limit_wait_seconds",
+    "Time upstream calls waited for a concurrency slot",
+    ("provider",),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+))
+ADAPTER_OVERLOAD = REGISTRY.register(Counter(
+    "alertrix_adapter_overload_signals",
+    "Limit decreases per provider by reason (throttled, server_error, timeout, latency)",
+    ("provider", "reason"),
+))
+LOCAL_STAGE_BATCH = REGISTRY.register(Histogram(
+    "alertrix_local_stage_batch_size",
+    "Items per batch sent to the local stage process pool",
+    ("stage",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+))
+ADMISSION_DECISIONS = REGISTRY.register(Counter(
+    "alertrix_admission_decisions",
+    "Report ingest admission decisions (accept, defer, reject)",
+    ("decision",),
+))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "alertrix_cache_requests",
+    "Cache lookups by cache name and result (hit, miss)",
+    ("cache", "result"),
+))
+REGISTRY.register(Gauge(
+    "alertrix_analysis_backlog",
+    "Reports waiting for background analysis",
+    callback=analysis_backlog.depth,
+))
+REGISTRY.register(Gauge(
+    "alertrix_analysis_backlog_oldest_age_seconds",
+    "Age of the oldest report waiting for background analysis",
+    callback=analysis_backlog.oldest_age,
+))
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    """Count a cache lookup; hit ratio is hits / (hits + misses)"""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
@@ -0,0 +1,32 @@
+import time
+from app.core.metrics import HTTP_REQUEST_DURATION
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request latency per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Use the matched route template to keep label cardinality bounded
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "<unmatched>"
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"], route_path, str(status_holder[0])
+            ).observe(time.perf_counter() - start)
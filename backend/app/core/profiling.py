@@ -0,0 +1,194 @@
+import asyncio
+import functools
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+from sqlalchemy import event
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Per-request phase durations in seconds; None when no profiled request is active
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+_ENDPOINT_DONE = "_endpoint_done"
+
+
+def record_timing(phase: str, seconds: float):
+    """Add time spent in a phase to the current request's Server-Timing header"""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed_phase(phase: str):
+    """Time a block of code as a Server-Timing phase"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(phase, time.perf_counter() - start)
+
+
+def _format_server_timing(timings: Dict[str, float], total: float) -> str:
+    entries = [
+        f"{phase};dur={seconds * 1000:.2f}"
+        for phase, seconds in timings.items()
+        if not phase.startswith("_")
+    ]
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+
+class SamplingProfiler:
+    """Statistical profiler sampling thread stacks into collapsed (folded) stack format"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="alertrix-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def dump(self, path: str):
+        """Write samples in the folded format read by flamegraph.pl, inferno and speedscope"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            for stack, count in self.samples.items():
+                f.write(f"{stack} {count}\n")
+
+
+def _profile_path(scope) -> str:
+    route = scope.get("route")
+    route_path = getattr(route, "path", None) or scope.get("path", "unknown")
+    slug = route_path.strip("/").replace("/", "_").replace("{", "").replace("}", "") or "root"
+    filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-{scope['method']}-{slug}.folded"
+    return os.path.join(settings.PROFILING_DIR, filename)
+
+
+class ProfilingMiddleware:
+    """Adds Server-Timing headers and samples requests through the stack profiler"""
+
+    def __init__(self, app, sample_rate: float = 0.0, interval_ms: float = 5.0):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000.0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, float] = {}
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+
+        profiler = None
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            profiler = SamplingProfiler(self.interval)
+            profiler.start()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                endpoint_done = timings.get(_ENDPOINT_DONE)
+                if endpoint_done is not None:
+                    # Response model validation, encoding and rendering after the endpoint returned
+                    timings["serialize"] = timings.get("serialize", 0.0) + (now - endpoint_done)
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _format_server_timing(timings, now - start).encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_timings.reset(token)
+            if profiler is not None:
+                profiler.stop()
+                path = _profile_path(scope)
+                try:
+                    profiler.dump(path)
+                    logger.info("Wrote request profile %s", path)
+                except OSError as e:
+                    logger.warning("Failed to write request profile %s: %s", path, e)
+
+
+def _mark_endpoint_done():
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[_ENDPOINT_DONE] = time.perf_counter()
+
+
+def _wrap_endpoint(call):
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def async_endpoint(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                _mark_endpoint_done()
+        return async_endpoint
+
+    @functools.wraps(call)
+    def sync_endpoint(*args, **kwargs):
+        try:
+            return call(*args, **kwargs)
+        finally:
+            _mark_endpoint_done()
+    return sync_endpoint
+
+
+def install_profiling(app, engine):
+    """Instrument the app for Server-Timing and sampled profiling; call after routers are included"""
+    from fastapi.routing import APIRoute
+    from starlette.routing import request_response
+
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            route.dependant.call = _wrap_endpoint(route.dependant.call)
+            route.app = request_response(route.get_route_handler())
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("timing_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        record_timing("db", time.perf_counter() - conn.info["timing_start"].pop())
+
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval_ms=settings.PROFILING_INTERVAL_MS,
+    )
+    logger.info("Request profiling enabled (sample rate %s)", settings.PROFILING_SAMPLE_RATE)
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, Index, LargeBinary, UniqueConstraint
 from typing import Optional
 from datetime import datetime
 from enum import Enum
@@ -14,21 +15,158 @@ class DisasterType(str, Enum):
 class Report(SQLModel, table=True):
     """Report model for disaster reports"""
     id: Optional[int] = Field(default=None, primary_key=True)
-    text: str = Field(index=True)
+    text: str  # Searched through the full-text index, see app/services/search.py
     lat: float
     lon: float
     source: str
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-    is_analyzed: bool = Field(default=False)
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, index=True)  # Hot store delta sync
+    is_analyzed: bool = Field(default=False, index=True)
+    alert_id: Optional[int] = Field(default=None, index=True)  # Incident this report was clustered into
+    priority: int = Field(default=0)  # Ingest pre-score used to order analysis
+    analysis_deferred: bool = Field(default=False)  # Admitted under load; analyzed once the backlog drains
+    evidence: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary))  # See app/services/evidence.py
+    evidence_version: Optional[int] = None
+    severity_variation: Optional[int] = None  # Random variation the analyzer applied; reused on re-analysis
+    claimed_by: Optional[str] = None  # Analysis worker process holding the report (ANALYSIS_MODE=worker)
+    claimed_at: Optional[datetime] = None
 
-class Alert(SQLModel, table=True):
-    """Alert model for disaster alerts"""
-    id: Optional[int] = Field(default=None, primary_key=True)
-    report_id: int = Field(foreign_key="report.id")
+class AlertBase(SQLModel):
+    """Columns shared by live alerts and the archive"""
+    report_id: int = Field(foreign_key="report.id")  # First report of the incident
     disaster_type: DisasterType = Field(default=DisasterType.OTHER)
     severity_score: int = Field(default=0, ge=0, le=100)
     summary: str
     location_name: str
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    is_active: bool = Field(default=True)
+
+    # Incident clustering
+    lat: Optional[float] = None  # Centroid of the clustered reports
+    lon: Optional[float] = None
+    report_count: int = Field(default=1)
+    source: Optional[str] = None  # Source of the first report
+    grid_cell: Optional[str] = Field(default=None, index=True)
+    last_report_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Scoring inputs, persisted so severity can be recomputed when rules change
+    classifier_confidence: Optional[float] = None
+    wind_speed: Optional[float] = None
+    weather_conditions: Optional[str] = None
+    severity_variation: Optional[int] = None  # Mock random variation added by the analyzer
+
+
+class Alert(AlertBase, table=True):
+    """Alert model for disaster alerts - one alert per incident (cluster of reports)"""
+    __table_args__ = (
+        Index("ix_alert_lat_lon", "lat", "lon"),  # Grid cell max recomputed from the alerts inside a cell
+        {"sqlite_autoincrement": True},  # Never reuse ids of archived alerts
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+
+class AlertArchive(AlertBase, table=True):
+    """Expired alerts moved out of the hot table; ids are kept from the alert table"""
+    id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    archived_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
+class AlertRollup(SQLModel, table=True):
+    """Incrementally maintained alert aggregates per hour, type, severity bucket and source"""
+    __table_args__ = (
+        UniqueConstraint("bucket_start", "disaster_type", "severity_bucket", "source", "is_active",
+                         name="uq_alertrollup_key"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    bucket_start: datetime = Field(index=True)  # Hour the alerts were created in
+    disaster_type: DisasterType
+    severity_bucket: int  # Lower bound of a 10-point severity band
+    source: str
+    is_active: bool
+    alert_count: int = Field(default=0)
+    report_count: int = Field(default=0)
+    severity_sum: int = Field(default=0)
+    severity_max: int = Field(default=0)
+
+
+class AlertHistogram(SQLModel, table=True):
+    """Alerts per time bucket, type and exact severity for time series; archived alerts stay counted"""
+    __table_args__ = (
+        UniqueConstraint("resolution", "bucket_start", "disaster_type", "severity_score",
+                         name="uq_alerthistogram_key"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    resolution: int  # Bucket width in seconds, kept per hour and per day
+    bucket_start: datetime  # When the alerts were created
+    disaster_type: DisasterType
+    severity_score: int
+    alert_count: int = Field(default=0)
+    report_count: int = Field(default=0)
+
+
+class ReportVolume(SQLModel, table=True):
+    """Reports received per time bucket, kept per hour and per day"""
+    __table_args__ = (UniqueConstraint("resolution", "bucket_start", name="uq_reportvolume_key"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    resolution: int
+    bucket_start: datetime
+    report_count: int = Field(default=0)
+
+
+class AlertGridCell(SQLModel, table=True):
+    """Per-cell alert counts for the map, kept at several grid resolutions"""
+    __table_args__ = (
+        UniqueConstraint("level", "cell_x", "cell_y", "is_active", name="uq_alertgridcell_key"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    level: int  # Cells are 360 / 2**level degrees wide
+    cell_x: int
+    cell_y: int
+    is_active: bool
+    alert_count: int = Field(default=0)
+    severity_sum: int = Field(default=0)
+    severity_max: int = Field(default=0)
+    lat_sum: float = Field(default=0.0)  # For the centroid of the cell's alerts
+    lon_sum: float = Field(default=0.0)
+
+
+class BackfillCheckpoint(SQLModel, table=True):
+    """Progress of a named analysis backfill, committed with each batch so a restart resumes after last_id"""
+    name: str = Field(primary_key=True)
+    last_id: int = Field(default=0)  # Every report up to this id has been processed
+    end_id: Optional[int] = None  # Inclusive upper bound of the run, None for all reports
+    processed: int = Field(default=0)
+    failed: int = Field(default=0)
+    started_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+
+class Lease(SQLModel, table=True):
+    """Named, expiring lock shared by all processes using the database"""
+    name: str = Field(primary_key=True)
+    holder: str  # host:pid of the owning process
+    acquired_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+
+
+class IdempotencyKey(SQLModel, table=True):
+    """Client-supplied key of a submitted report, so retries replay the original response"""
+    __table_args__ = (UniqueConstraint("source", "key", name="uq_idempotencykey_key"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    source: str  # Keys are scoped to the submitting source
+    key: str
+    request_hash: str  # Fingerprint of the report body the key was first used with
+    report_id: int = Field(foreign_key="report.id")
+    status: str  # received | deferred
+    response_body: Optional[str] = None  # JSON body first returned, replayed verbatim to retries
+    response_status: int = 200
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    is_active: bool = Field(default=True)
\ No newline at end of file
+    expires_at: datetime = Field(index=True)
@@ -1,6 +1,8 @@
 from sqlmodel import Session
 from app.db.models import Report, Alert
 from app.db.session import engine
+from app.services.clustering import place_alert
+from app.services.alert_events import rebuild_aggregates
 import logging
 
 logger = logging.getLogger(__name__)
@@ -88,10 +90,13 @@ def seed_database():
             )
         ]
 
-        for alert in sample_alerts:
+        for alert, report in zip(sample_alerts, sample_reports):
+            place_alert(alert, report.lat, report.lon, report.created_at)
+            alert.source = report.source
             session.add(alert)
 
         session.commit()
+        rebuild_aggregates(session)
         logger.info(f"Seeded database with {len(sample_reports)} reports and {len(sample_alerts)} alerts")
 
 
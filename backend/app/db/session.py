@@ -1,14 +1,74 @@
+import logging
+import time
+from sqlalchemy import event, inspect, literal
 from sqlmodel import SQLModel, create_engine, Session
 from app.core.config import settings
+from app.core.metrics import DB_QUERY_DURATION
+
+logger = logging.getLogger(__name__)
 
 # Create database engine
-engine = create_engine(settings.DATABASE_URL, echo=True)
+engine = create_engine(settings.DATABASE_URL, echo=settings.DB_ECHO)
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    operation = statement.lstrip()[:6].upper()
+    if operation not in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+        operation = "OTHER"
+    DB_QUERY_DURATION.labels(operation).observe(elapsed)
+
+
+@event.listens_for(engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time so the stack stays balanced
+    conn = exception_context.connection
+    if conn is not None and exception_context.execution_context is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def add_missing_columns(bind=None):
+    """
+    Add columns and indexes introduced after a table was created; create_all only creates whole tables.
+
+    Columns are added nullable unless the model has a scalar default to fill existing rows with.
+    """
+    bind = bind if bind is not None else engine
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(bind.dialect)}"
+                default = column.default.arg if column.default is not None and column.default.is_scalar else None
+                if default is not None:
+                    value = literal(default).compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+                    ddl += f" NOT NULL DEFAULT {value}"
+                conn.exec_driver_sql(ddl)
+                logger.info("Added column %s.%s", table.name, column.name)
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
 
 def create_db_and_tables():
     """Create all database tables"""
+    from app.db import models  # noqa: F401 - registers the tables
+    from app.services.search import ensure_search_index
     SQLModel.metadata.create_all(engine)
+    add_missing_columns()
+    ensure_search_index(engine)
 
 def get_session():
     """Get database session"""
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
@@ -1,11 +1,23 @@
-from app.integrations.summarizer import SummarizerAdapter
-from app.integrations.classifier import ClassifierAdapter
-from app.integrations.weather import WeatherAdapter
-from app.integrations.geo import GeoAdapter
+import importlib
+
+# Adapters are imported on first use: the summarizer pulls in NumPy and the
+# stage process pool, which API processes only need once analysis runs
+_ADAPTERS = {
+    "SummarizerAdapter": "app.integrations.summarizer",
+    "ClassifierAdapter": "app.integrations.classifier",
+    "WeatherAdapter": "app.integrations.weather",
+    "GeoAdapter": "app.integrations.geo",
+}
 
 __all__ = [
     "SummarizerAdapter",
     "ClassifierAdapter",
     "WeatherAdapter",
     "GeoAdapter"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _ADAPTERS:
+        return getattr(importlib.import_module(_ADAPTERS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
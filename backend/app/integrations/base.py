@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict
 import logging
+import time
+from app.core.metrics import ADAPTER_CALL_DURATION
+from app.core.profiling import record_timing
+from app.integrations.concurrency import UpstreamError, get_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +15,8 @@ class AIAdapter(ABC):
     def __init__(self, use_mock: bool = True):
         self.use_mock = use_mock
         self.logger = logging.getLogger(self.__class__.__name__)
+        # Server-Timing phase name, e.g. "adapter_classifier"
+        self.timing_name = "adapter_" + self.__class__.__name__.replace("Adapter", "").lower()
 
     @abstractmethod
     async def analyze(self, *args, **kwargs) -> Dict[str, Any]:
@@ -19,15 +25,48 @@ class AIAdapter(ABC):
 
     async def _call_api(self, *args, **kwargs) -> Dict[str, Any]:
         """Helper method for API calls with error handling"""
+        start = time.perf_counter()
+        outcome = "error"
         try:
             if self.use_mock:
-                return await self._mock_analyze(*args, **kwargs)
+                result = await self._mock_analyze(*args, **kwargs)
+                outcome = "mock"
             else:
-                return await self._real_analyze(*args, **kwargs)
+                result = await self._real_analyze(*args, **kwargs)
+                # Real adapters degrade to mock themselves when keys are missing,
+                # and may answer from a local tier without calling upstream
+                outcome = {"mock": "fallback", "local": "local", "extractive": "local"}.get(result.get("source"), "real")
+            return result
         except Exception as e:
-            self.logger.error(f"Error in {self.__class__.__name__}: {str(e)}")
+            self.logger.error("Error in %s: %s", self.__class__.__name__, e)
             # Fallback to mock mode on error
-            return await self._mock_analyze(*args, **kwargs)
+            result = await self._mock_analyze(*args, **kwargs)
+            outcome = "fallback"
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            ADAPTER_CALL_DURATION.labels(self.__class__.__name__, outcome).observe(elapsed)
+            record_timing(self.timing_name, elapsed)
+
+    async def _request(self, provider: str, method: str, url: str, **kwargs):
+        """
+        HTTP call to an upstream provider under its adaptive concurrency limit.
+
+        Raises UpstreamError on 429, 5xx and timeouts so the limiter backs off.
+        """
+        import httpx
+
+        async def send():
+            try:
+                async with httpx.AsyncClient() as client:
+                    response = await client.request(method, url, **kwargs)
+            except httpx.TimeoutException as e:
+                raise UpstreamError(f"{provider} request timed out", timed_out=True) from e
+            if response.status_code == 429 or response.status_code >= 500:
+                raise UpstreamError(f"{provider} API error: {response.status_code}", response.status_code)
+            return response
+
+        return await get_limiter(provider).run(send)
 
     @abstractmethod
     async def _real_analyze(self, *args, **kwargs) -> Dict[str, Any]:
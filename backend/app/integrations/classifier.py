@@ -1,8 +1,8 @@
-import httpx
-import random
 import logging
 from typing import Dict, Any
 from app.integrations.base import AIAdapter
+from app.integrations.concurrency import UpstreamError
+from app.integrations.executor import get_stage_executor
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -22,77 +22,63 @@ class ClassifierAdapter(AIAdapter):
         return await self._call_api(text)
 
     async def _real_analyze(self, text: str) -> Dict[str, Any]:
-        """Real classification using Hugging Face"""
+        """Local keyword tier first; only ambiguous texts go to Hugging Face"""
+        if settings.LOCAL_CLASSIFIER_ENABLED:
+            local_result = await get_stage_executor().run("classify", text)
+            if not local_result["ambiguous"]:
+                return self._format_local(local_result, "local")
+
         if not self.hf_key:
             logger.warning("No HF API key, falling back to mock classifier")
             return await self._mock_analyze(text)
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api-inference.huggingface.co/models/facebook/bart-large-mnli",
-                    headers={"Authorization": f"Bearer {self.hf_key}"},
-                    json={
-                        "inputs": text,
-                        "parameters": {
-                            "candidate_labels": self.disaster_types
-                        }
-                    },
-                    timeout=30.0
-                )
+            response = await self._request(
+                "huggingface", "POST",
+                "https://api-inference.huggingface.co/models/facebook/bart-large-mnli",
+                headers={"Authorization": f"Bearer {self.hf_key}"},
+                json={
+                    "inputs": text,
+                    "parameters": {
+                        "candidate_labels": self.disaster_types
+                    }
+                },
+                timeout=30.0
+            )
 
-                if response.status_code == 200:
-                    result = response.json()
-                    labels = result.get("labels", [])
-                    scores = result.get("scores", [])
+            if response.status_code == 200:
+                result = response.json()
+                labels = result.get("labels", [])
+                scores = result.get("scores", [])
 
-                    if labels and scores:
-                        # Get the highest scoring label
-                        max_score = max(scores)
-                        max_index = scores.index(max_score)
-                        disaster_type = labels[max_index]
+                if labels and scores:
+                    # Get the highest scoring label
+                    max_score = max(scores)
+                    max_index = scores.index(max_score)
+                    disaster_type = labels[max_index]
 
-                        return {
-                            "disaster_type": disaster_type,
-                            "confidence": max_score,
-                            "all_scores": dict(zip(labels, scores)),
-                            "source": "huggingface"
-                        }
+                    return {
+                        "disaster_type": disaster_type,
+                        "confidence": max_score,
+                        "all_scores": dict(zip(labels, scores)),
+                        "source": "huggingface"
+                    }
 
-                raise Exception(f"Classification API error: {response.status_code}")
+            raise UpstreamError(f"Classification API error: {response.status_code}", response.status_code)
 
         except Exception as e:
             logger.error(f"Classification failed: {str(e)}")
             raise
 
     async def _mock_analyze(self, text: str) -> Dict[str, Any]:
-        """Mock classification - random choice with weighted probabilities"""
-        # Simple keyword-based mock classification
-        text_lower = text.lower()
-
-        if any(word in text_lower for word in ["flood", "rain", "water", "inundat"]):
-            disaster_type = "flood"
-            confidence = random.uniform(0.7, 0.95)
-        elif any(word in text_lower for word in ["fire", "burn", "blaze", "smoke"]):
-            disaster_type = "fire"
-            confidence = random.uniform(0.7, 0.95)
-        elif any(word in text_lower for word in ["earthquake", "quake", "tremor", "seismic"]):
-            disaster_type = "earthquake"
-            confidence = random.uniform(0.7, 0.95)
-        elif any(word in text_lower for word in ["storm", "hurricane", "cyclone", "wind"]):
-            disaster_type = "storm"
-            confidence = random.uniform(0.7, 0.95)
-        # ADDED: Volcano detection
-        elif any(word in text_lower for word in ["volcano", "eruption", "volcanic", "ash", "magma", "lava"]):
-            disaster_type = "volcano"
-            confidence = random.uniform(0.8, 0.98)  # High confidence for clear volcano terms
-        else:
-            disaster_type = "other"
-            confidence = random.uniform(0.3, 0.6)
+        """Offline classification with the compiled keyword classifier"""
+        return self._format_local(await get_stage_executor().run("classify", text), "mock")
 
+    def _format_local(self, result: Dict[str, Any], source: str) -> Dict[str, Any]:
         return {
-            "disaster_type": disaster_type,
-            "confidence": confidence,
-            "all_scores": {disaster_type: confidence},
-            "source": "mock"
-        }
\ No newline at end of file
+            "disaster_type": result["disaster_type"],
+            "confidence": result["confidence"],
+            "all_scores": result["all_scores"],
+            "matched_terms": result["matched_terms"],
+            "source": source
+        }
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+from app.core.config import settings
+from app.core.metrics import ADAPTER_CONCURRENCY_LIMIT, ADAPTER_INFLIGHT, ADAPTER_LIMIT_WAIT, ADAPTER_OVERLOAD
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Baseline latency creeps up by this fraction per sample so it can follow a slower provider
+BASELINE_DRIFT = 0.02
+
+
+class UpstreamError(Exception):
+    """Failed upstream call; overloaded marks throttling, server errors and timeouts"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, timed_out: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.timed_out = timed_out
+
+    @property
+    def overload_reason(self) -> Optional[str]:
+        if self.timed_out:
+            return "timeout"
+        if self.status_code == 429:
+            return "throttled"
+        if self.status_code is not None and self.status_code >= 500:
+            return "server_error"
+        return None
+
+
+def _parse_limits(spec: str) -> Dict[str, int]:
+    limits = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        provider, limit = item.split("=", 1)
+        limits[provider.strip()] = int(limit)
+    return limits
+
+
+class AdaptiveLimiter:
+    """
+    AIMD in-flight limit for one upstream provider.
+
+    Each successful call that used the full limit grows it by 1/limit (about +1
+    per round trip). A 429, 5xx, timeout or latency above tolerance x baseline
+    multiplies it by backoff, at most once per round trip: calls started
+    before the last decrease cannot trigger another.
+    """
+
+    def __init__(self, provider: str, initial: Optional[int] = None, min_limit: Optional[int] = None,
+                 max_limit: Optional[int] = None, tolerance: Optional[float] = None,
+                 backoff: Optional[float] = None):
+        self.provider = provider
+        self.min_limit = min_limit or settings.ADAPTIVE_LIMIT_MIN
+        self.max_limit = max_limit or _parse_limits(settings.ADAPTIVE_LIMIT_MAX_OVERRIDES).get(
+            provider, settings.ADAPTIVE_LIMIT_MAX)
+        self.tolerance = tolerance or settings.ADAPTIVE_LATENCY_TOLERANCE
+        self.backoff = backoff or settings.ADAPTIVE_BACKOFF
+        self.limit = float(min(max(initial or settings.ADAPTIVE_LIMIT_INITIAL, self.min_limit), self.max_limit))
+        self.inflight = 0
+        self.baseline: Optional[float] = None
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+        ADAPTER_CONCURRENCY_LIMIT.labels(provider).set(self.limit)
+
+    @property
+    def slots(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Run call once a slot is free, feeding its latency and outcome back into the limit"""
+        wait_start = time.perf_counter()
+        await self._acquire()
+        ADAPTER_LIMIT_WAIT.labels(self.provider).observe(time.perf_counter() - wait_start)
+
+        started = time.monotonic()
+        reason = None
+        completed = False
+        try:
+            result = await call()
+            completed = True
+            return result
+        except UpstreamError as e:
+            reason = e.overload_reason
+            completed = True
+            raise
+        except asyncio.TimeoutError:
+            reason = "timeout"
+            completed = True
+            raise
+        finally:
+            self._release(started, reason, completed)
+
+    async def _acquire(self):
+        while self.inflight >= self.slots:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._wake()
+                raise
+        self.inflight += 1
+        ADAPTER_INFLIGHT.labels(self.provider).set(self.inflight)
+
+    def _release(self, started: float, reason: Optional[str], completed: bool):
+        saturated = self.inflight >= self.slots
+        self.inflight -= 1
+        ADAPTER_INFLIGHT.labels(self.provider).set(self.inflight)
+        if completed:
+            self._update(started, time.monotonic() - started, reason, saturated)
+        self._wake()
+
+    def _update(self, started: float, latency: float, reason: Optional[str], saturated: bool):
+        if reason is None and self.baseline is not None and latency > self.tolerance * self.baseline:
+            reason = "latency"
+
+        if reason is not None:
+            if started >= self._last_decrease:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = time.monotonic()
+                ADAPTER_OVERLOAD.labels(self.provider, reason).inc()
+                logger.info("%s limit decreased to %.1f (%s)", self.provider, self.limit, reason)
+        else:
+            self.baseline = latency if self.baseline is None else min(latency, self.baseline * (1 + BASELINE_DRIFT))
+            # Only grow when the limit was actually the constraint
+            if saturated:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+        ADAPTER_CONCURRENCY_LIMIT.labels(self.provider).set(round(self.limit, 2))
+
+    def _wake(self):
+        free = self.slots - self.inflight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done() and not waiter.get_loop().is_closed():
+                waiter.set_result(None)
+                free -= 1
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+
+
+def get_limiter(provider: str) -> AdaptiveLimiter:
+    """Process-wide limiter per provider, shared by every adapter calling it"""
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        limiter = _limiters[provider] = AdaptiveLimiter(provider)
+    return limiter
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import LOCAL_STAGE_BATCH
+
+logger = logging.getLogger(__name__)
+
+
+# Stage functions take and return lists so one pickled submission carries a whole batch.
+# They live at module level so pool processes can import them by name.
+def classify_texts(texts: List[str]) -> List[Dict[str, Any]]:
+    from app.integrations.keyword_classifier import get_keyword_classifier
+    return get_keyword_classifier().classify_batch(texts)
+
+
+def summarize_texts(texts: List[str]) -> List[str]:
+    from app.integrations.extractive_summarizer import get_extractive_summarizer
+    return get_extractive_summarizer().summarize_batch(texts)
+
+
+STAGES: Dict[str, Callable[[List[Any]], List[Any]]] = {
+    "classify": classify_texts,
+    "summarize": summarize_texts,
+}
+
+
+def warm_stages():
+    """Pool initializer: compile lexicons and patterns once per process rather than on the first batch"""
+    from app.integrations.extractive_summarizer import get_extractive_summarizer
+    from app.integrations.keyword_classifier import get_keyword_classifier
+    get_keyword_classifier()
+    get_extractive_summarizer()
+
+
+class StageExecutor:
+    """
+    Runs CPU-bound local stages inline or in a process pool.
+
+    In process mode, calls arriving within batch_wait_ms of each other are
+    sent as one batch (up to batch_size), so pickling and IPC are paid per
+    batch rather than per report, and the event loop only awaits the result.
+    """
+
+    def __init__(self, mode: Optional[str] = None, processes: Optional[int] = None,
+                 batch_size: Optional[int] = None, batch_wait_ms: Optional[float] = None):
+        self.mode = mode or settings.STAGE_EXECUTOR
+        self.processes = processes or settings.STAGE_PROCESSES or os.cpu_count() or 1
+        self.batch_size = batch_size or settings.STAGE_BATCH_SIZE
+        self.batch_wait = (settings.STAGE_BATCH_WAIT_MS if batch_wait_ms is None else batch_wait_ms) / 1000.0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[str, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+
+    async def run(self, stage: str, item: Any) -> Any:
+        """Result of one stage for one item"""
+        if self.mode != "process":
+            return STAGES[stage]([item])[0]
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop, self._pending, self._timers = loop, {}, {}
+        future = loop.create_future()
+        pending = self._pending.setdefault(stage, [])
+        pending.append((item, future))
+        if len(pending) >= self.batch_size:
+            self._flush(stage)
+        elif stage not in self._timers:
+            self._timers[stage] = loop.call_later(self.batch_wait, self._flush, stage)
+        return await future
+
+    def _flush(self, stage: str):
+        timer = self._timers.pop(stage, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(stage, [])
+        if not batch:
+            return
+        LOCAL_STAGE_BATCH.labels(stage).observe(len(batch))
+        try:
+            submitted = self._get_pool().submit(STAGES[stage], [item for item, _ in batch])
+        except (BrokenProcessPool, RuntimeError) as e:
+            self._deliver(batch, None, e)
+            return
+        asyncio.wrap_future(submitted, loop=self._loop).add_done_callback(
+            lambda done: self._deliver(batch, done)
+        )
+
+    def _deliver(self, batch: List[Tuple[Any, asyncio.Future]], done: Optional[asyncio.Future],
+                 error: Optional[BaseException] = None):
+        if done is not None:
+            error = asyncio.CancelledError() if done.cancelled() else done.exception()
+        if isinstance(error, BrokenProcessPool):
+            # A pool process died; the next batch gets a fresh pool
+            logger.error("Local stage pool broke: %s", error)
+            self._pool = None
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result()[index])
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: pool processes must not inherit the server's threads, sockets or DB connections
+            self._pool = ProcessPoolExecutor(max_workers=self.processes,
+                                             mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=warm_stages)
+            logger.info("Started local stage pool with %s processes", self.processes)
+        return self._pool
+
+    def shutdown(self):
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: Optional[StageExecutor] = None
+
+
+def get_stage_executor() -> StageExecutor:
+    """Process-wide executor shared by the local tiers of all adapters"""
+    global _executor
+    if _executor is None:
+        _executor = StageExecutor()
+    return _executor
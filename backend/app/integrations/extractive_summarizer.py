@@ -0,0 +1,120 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from app.integrations.keyword_classifier import DISASTER_LEXICONS
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_TOKEN = re.compile(r"\w+")
+
+# Facts responders care about most, on top of the disaster lexicons
+URGENCY_TERMS = {
+    "dead": 3.0, "killed": 3.0, "deaths": 3.0, "casualties": 3.0, "injured": 2.5, "trapped": 3.0,
+    "missing": 2.5, "evacuate": 2.0, "evacuated": 2.0, "evacuation": 2.0, "evacuations": 2.0,
+    "collapsed": 2.5, "collapse": 2.5, "rescue": 2.0, "stranded": 2.0, "urgent": 1.5, "emergency": 1.5,
+    "blocked": 1.0, "destroyed": 2.0, "damage": 1.0, "damaged": 1.0, "spreading": 1.5, "rising": 1.0,
+}
+
+STOPWORDS = {
+    "the", "a", "an", "and", "or", "of", "in", "on", "at", "to", "for", "is", "are", "was", "were", "be",
+    "been", "it", "this", "that", "with", "as", "by", "from", "has", "have", "had", "there", "we", "i",
+    "our", "my", "they", "their", "near", "very", "some", "all", "just", "now", "still",
+}
+
+
+class ExtractiveSummarizer:
+    """
+    Local summarizer that picks the highest-scoring sentences.
+
+    Sentence scores are sums of term weights (lexicon weight + in-document
+    frequency) over a sparse sentence x term matrix, length normalized, with a
+    small lead-sentence bonus. A batch is scored with one set of array ops.
+    """
+
+    def __init__(self, max_chars: int = 240, lead_bonus: float = 0.5):
+        self.max_chars = max_chars
+        self.lead_bonus = lead_bonus
+        self.term_weights: Dict[str, float] = dict(URGENCY_TERMS)
+        for languages in DISASTER_LEXICONS.values():
+            for terms in languages.values():
+                for term, weight in terms.items():
+                    for word in term.rstrip("*").split():
+                        self.term_weights[word.casefold()] = max(self.term_weights.get(word.casefold(), 0.0), weight)
+
+    def summarize(self, text: str) -> str:
+        return self.summarize_batch([text])[0]
+
+    def summarize_batch(self, texts: List[str]) -> List[str]:
+        # NumPy is imported here: URGENCY_TERMS is needed at ingest, the summarizer only once analysis runs
+        import numpy as np
+
+        sentences: List[str] = []
+        tokens: List[List[str]] = []
+        doc_ranges: List[Tuple[int, int]] = []
+
+        for text in texts:
+            start = len(sentences)
+            for sentence in _SENTENCE_SPLIT.split(text.strip()):
+                sentence = sentence.strip()
+                if sentence:
+                    sentences.append(sentence)
+                    tokens.append([t for t in _TOKEN.findall(sentence.casefold()) if t not in STOPWORDS])
+            doc_ranges.append((start, len(sentences)))
+
+        if not sentences:
+            return ["" for _ in texts]
+
+        vocabulary: Dict[str, int] = {}
+        rows, cols = [], []
+        for row, sentence_tokens in enumerate(tokens):
+            for token in sentence_tokens:
+                rows.append(row)
+                cols.append(vocabulary.setdefault(token, len(vocabulary)))
+
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int64)
+        sentence_doc = np.repeat(np.arange(len(doc_ranges)), [end - start for start, end in doc_ranges])
+
+        # Sparse (sentence, term) entries: weight = lexicon weight + bonus for terms repeated across sentences
+        entry_doc = sentence_doc[rows]
+        doc_term = entry_doc * len(vocabulary) + cols
+        _, first_in_sentence = np.unique(rows * len(vocabulary) + cols, return_index=True)
+        unique_doc_terms, doc_frequency = np.unique(doc_term[first_in_sentence], return_counts=True)
+        entry_frequency = doc_frequency[np.searchsorted(unique_doc_terms, doc_term)]
+
+        lexicon_weights = np.array([self.term_weights.get(term, 0.0) for term in vocabulary], dtype=np.float64)
+        entry_weights = lexicon_weights[cols] + 0.5 * np.log1p(entry_frequency - 1)
+
+        lengths = np.sqrt(np.maximum(np.bincount(rows, minlength=len(sentences)), 1))
+        scores = np.bincount(rows, weights=entry_weights, minlength=len(sentences)) / lengths
+        starts = np.array([start for start, end in doc_ranges if end > start], dtype=np.intp)
+        scores[starts] += self.lead_bonus
+
+        summaries = []
+        for start, end in doc_ranges:
+            summaries.append(self._select(sentences[start:end], scores[start:end]) if end > start else "")
+        return summaries
+
+    def _select(self, sentences: List[str], scores: "np.ndarray") -> str:
+        import numpy as np
+
+        chosen = []
+        used = 0
+        order = np.argsort(-scores, kind="stable")
+        # Filler sentences with little weight are left out even when they would fit
+        threshold = max(scores[order[0]] * 0.25, 1e-9)
+        for index in order:
+            length = len(sentences[index])
+            if chosen and (used + length > self.max_chars or scores[index] < threshold):
+                continue
+            chosen.append(int(index))
+            used += length + 1
+        summary = " ".join(sentences[i] for i in sorted(chosen))
+        if len(summary) > self.max_chars:
+            summary = summary[:self.max_chars - 3].rstrip() + "..."
+        return summary
+
+
+@lru_cache(maxsize=1)
+def get_extractive_summarizer() -> ExtractiveSummarizer:
+    """Process-wide summarizer with precomputed term weights"""
+    return ExtractiveSummarizer()
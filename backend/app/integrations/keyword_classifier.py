@@ -0,0 +1,158 @@
+import math
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+
+# Weighted disaster lexicons by language. A trailing "*" matches any word ending,
+# spaces match any whitespace. Terms only match on word boundaries, so "ash"
+# does not fire inside "crash" or "wash". Short stems that begin unrelated words
+# ("wind" in "window", "hail" in "hailed") list their inflections instead of a "*".
+DISASTER_LEXICONS: Dict[str, Dict[str, Dict[str, float]]] = {
+    "flood": {
+        "en": {"flood*": 2.0, "flash flood*": 3.0, "inundat*": 2.0, "submerged": 1.5, "overflow*": 1.5,
+               "waterlogg*": 1.5, "deluge": 2.0, "rain": 1.0, "rains": 1.0, "rainfall": 1.0, "raining": 1.0,
+               "rainy": 1.0, "rainstorm": 1.0, "water level*": 1.5, "water": 0.5},
+        "es": {"inundaci*": 2.0, "crecida*": 1.5, "desbordamiento*": 1.5, "lluvia*": 1.0},
+        "fr": {"inondation*": 2.0, "crue": 1.5, "crues": 1.5, "débordement*": 1.5, "pluie*": 1.0},
+        "pt": {"enchente*": 2.0, "alagamento*": 2.0, "chuva*": 1.0},
+    },
+    "fire": {
+        "en": {"fire": 2.0, "fires": 2.0, "wildfire*": 3.0, "bushfire*": 3.0, "burn": 1.5, "burns": 1.5,
+               "burning": 1.5, "burned": 1.5, "burnt": 1.5, "blaze*": 2.0,
+               "flames": 2.0, "smoke": 1.0, "on fire": 2.5},
+        "es": {"incendio*": 2.5, "fuego*": 1.5, "llamas": 1.5, "humo": 1.0},
+        "fr": {"incendie*": 2.5, "feu": 1.5, "flammes": 1.5, "fumée": 1.0},
+        "pt": {"incêndio*": 2.5, "fogo": 1.5, "fumaça": 1.0},
+    },
+    "earthquake": {
+        "en": {"earthquake*": 3.0, "quake*": 2.5, "tremor*": 2.0, "seismic": 2.0, "aftershock*": 2.5,
+               "magnitude": 1.0, "epicent*": 2.0},
+        "es": {"terremoto*": 3.0, "sismo*": 2.5, "temblor*": 2.0, "réplica*": 1.0},
+        "fr": {"séisme*": 3.0, "tremblement de terre": 3.0, "secousse*": 2.0},
+        "pt": {"terremoto*": 3.0, "sismo*": 2.5, "abalo sísmico": 2.5},
+    },
+    "storm": {
+        "en": {"storm*": 2.0, "thunderstorm*": 2.5, "hurricane*": 3.0, "cyclone*": 3.0, "typhoon*": 3.0,
+               "tornado*": 3.0, "gale": 1.5, "gales": 1.5, "wind": 1.0, "winds": 1.0, "windy": 1.0,
+               "windstorm": 1.0, "windstorms": 1.0, "lightning": 1.0, "hail": 1.5, "hailstorm": 1.5,
+               "hailstorms": 1.5, "hailstones": 1.5},
+        "es": {"tormenta*": 2.0, "huracán": 3.0, "huracan*": 3.0, "ciclón": 3.0, "tornado*": 3.0},
+        "fr": {"tempête*": 2.0, "ouragan*": 3.0, "orage*": 2.0, "cyclone*": 3.0},
+        "pt": {"tempestade*": 2.0, "furacão": 3.0, "ciclone*": 3.0},
+    },
+    "volcano": {
+        "en": {"volcan*": 3.0, "eruption*": 3.0, "erupt*": 2.5, "magma*": 2.5, "lava": 2.5,
+               "pyroclastic": 3.0, "ash cloud*": 2.0, "ash plume*": 2.0, "ash": 1.0, "ashfall": 2.0},
+        "es": {"volcán": 3.0, "erupción": 3.0, "ceniza*": 1.0},
+        "fr": {"éruption*": 3.0, "cendre*": 1.0},
+        "pt": {"vulcão": 3.0, "erupção": 3.0, "cinza*": 1.0},
+    },
+}
+
+NO_MATCH_CONFIDENCE = 0.45
+
+
+class KeywordClassifier:
+    """
+    Offline disaster classifier.
+
+    All lexicons compile into a single word-boundary regex so each text is
+    scanned once; matched tokens are mapped to weighted per-type scores.
+    """
+
+    def __init__(self, lexicons: Dict[str, Dict[str, Dict[str, float]]] = DISASTER_LEXICONS,
+                 min_score: Optional[float] = None, min_share: Optional[float] = None):
+        self.disaster_types = list(lexicons) + ["other"]
+        self.min_score = settings.LOCAL_CLASSIFIER_MIN_SCORE if min_score is None else min_score
+        self.min_share = settings.LOCAL_CLASSIFIER_MIN_SHARE if min_share is None else min_share
+
+        # term -> [(disaster_type, weight)]; wildcard prefixes are kept separately
+        self._exact: Dict[str, List[Tuple[str, float]]] = {}
+        self._prefixes: List[Tuple[str, str, float]] = []
+        patterns = set()
+
+        for disaster_type, languages in lexicons.items():
+            for terms in languages.values():
+                for term, weight in terms.items():
+                    term = term.casefold()
+                    body = r"\s+".join(re.escape(word) for word in term.rstrip("*").split())
+                    if term.endswith("*"):
+                        prefix = " ".join(term[:-1].split())
+                        self._prefixes.append((prefix, disaster_type, weight))
+                        patterns.add(body + r"\w*")
+                    else:
+                        self._exact.setdefault(term, []).append((disaster_type, weight))
+                        patterns.add(body)
+
+        # Longest prefixes first so "flash flood*" wins over "flood*"
+        self._prefixes.sort(key=lambda item: len(item[0]), reverse=True)
+        alternation = "|".join(sorted(patterns, key=len, reverse=True))
+        self._pattern = re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+        self._token_cache: Dict[str, List[Tuple[str, float]]] = {}
+
+    def _token_weights(self, token: str) -> List[Tuple[str, float]]:
+        cached = self._token_cache.get(token)
+        if cached is not None:
+            return cached
+
+        weights = {}
+        for disaster_type, weight in self._exact.get(token, []):
+            weights[disaster_type] = max(weights.get(disaster_type, 0.0), weight)
+        for prefix, disaster_type, weight in self._prefixes:
+            if disaster_type not in weights and token.startswith(prefix):
+                weights[disaster_type] = weight
+        result = list(weights.items())
+
+        if len(self._token_cache) < 50_000:
+            self._token_cache[token] = result
+        return result
+
+    def classify(self, text: str) -> Dict[str, Any]:
+        """Classify one text; `ambiguous` marks results that should go to a remote model"""
+        scores: Dict[str, float] = {}
+        matched = []
+        seen = set()
+
+        for match in self._pattern.finditer(text):
+            token = " ".join(match.group().casefold().split())
+            if token in seen:
+                continue
+            seen.add(token)
+            matched.append(token)
+            for disaster_type, weight in self._token_weights(token):
+                scores[disaster_type] = scores.get(disaster_type, 0.0) + weight
+
+        if not scores:
+            return {
+                "disaster_type": "other",
+                "confidence": NO_MATCH_CONFIDENCE,
+                "all_scores": {"other": NO_MATCH_CONFIDENCE},
+                "matched_terms": [],
+                "ambiguous": True,
+            }
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        top_type, top_score = ranked[0]
+        total = sum(scores.values())
+        share = top_score / total
+        # Confidence grows with the winning type's share and with the amount of evidence
+        confidence = round(0.5 + 0.48 * share * (1 - math.exp(-top_score / 2)), 3)
+
+        return {
+            "disaster_type": top_type,
+            "confidence": confidence,
+            "all_scores": {disaster_type: round(score / total, 3) for disaster_type, score in ranked},
+            "matched_terms": matched,
+            "ambiguous": top_score < self.min_score or share < self.min_share,
+        }
+
+    def classify_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Classify many texts with the same compiled pattern"""
+        return [self.classify(text) for text in texts]
+
+
+@lru_cache(maxsize=1)
+def get_keyword_classifier() -> KeywordClassifier:
+    """Process-wide classifier; the pattern is compiled once on first use"""
+    return KeywordClassifier()
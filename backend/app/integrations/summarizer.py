@@ -1,9 +1,10 @@
-import httpx
 import logging
 from app.integrations.base import AIAdapter
+from app.integrations.concurrency import UpstreamError
+from app.integrations.executor import get_stage_executor
 from app.core.config import settings
 
-from typing import Dict, Any # for Dict and Any
+from typing import Dict, Any, Optional # for Dict and Any
 
 
 logger = logging.getLogger(__name__)
@@ -17,12 +18,31 @@ class SummarizerAdapter(AIAdapter):
         self.openai_key = settings.OPENAI_API_KEY
         self.hf_key = settings.HF_API_KEY
 
-    async def analyze(self, text: str) -> Dict[str, Any]:
-        """Summarize the input text"""
-        return await self._call_api(text)
+    async def analyze(self, text: str, severity: Optional[int] = None) -> Dict[str, Any]:
+        """Summarize the input text, routing to the local tier unless an LLM call is warranted"""
+        return await self._call_api(text, severity=severity)
 
-    async def _real_analyze(self, text: str) -> Dict[str, Any]:
-        """Real summarization using available APIs"""
+    @staticmethod
+    def should_use_llm(text: str, severity: Optional[int] = None) -> bool:
+        """Routing policy: short reports never, long or high-severity reports always"""
+        if len(text) < settings.SUMMARY_LOCAL_MAX_CHARS:
+            return False
+        if severity is not None and severity >= settings.SUMMARY_LLM_MIN_SEVERITY:
+            return True
+        return len(text) >= settings.SUMMARY_LLM_MIN_CHARS
+
+    async def _local_summarize(self, text: str, source: str) -> Dict[str, Any]:
+        """Extractive summary computed locally, off the event loop when a stage pool is configured"""
+        return {
+            "summary": await get_stage_executor().run("summarize", text),
+            "source": source,
+            "confidence": 0.75
+        }
+
+    async def _real_analyze(self, text: str, severity: Optional[int] = None) -> Dict[str, Any]:
+        """Extractive tier for routine reports; an LLM only for long or severe ones"""
+        if not self.should_use_llm(text, severity):
+            return await self._local_summarize(text, "extractive")
         # Try OpenAI first if key is available
         if self.openai_key:
             return await self._openai_summarize(text)
@@ -37,40 +57,40 @@ class SummarizerAdapter(AIAdapter):
     async def _openai_summarize(self, text: str) -> Dict[str, Any]:
         """Summarize using OpenAI API"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.openai_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "gpt-4o-mini",
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a disaster response assistant. Summarize the disaster report concisely, focusing on key facts and urgency."
-                            },
-                            {
-                                "role": "user",
-                                "content": f"Summarize this disaster report: {text}"
-                            }
-                        ],
-                        "max_tokens": 150
-                    },
-                    timeout=30.0
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    summary = result["choices"][0]["message"]["content"].strip()
-                    return {
-                        "summary": summary,
-                        "source": "openai",
-                        "confidence": 0.9
-                    }
-                else:
-                    raise Exception(f"OpenAI API error: {response.status_code}")
+            response = await self._request(
+                "openai", "POST",
+                "https://api.openai.com/v1/chat/completions",
+                headers={
+                    "Authorization": f"Bearer {self.openai_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "model": "gpt-4o-mini",
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are a disaster response assistant. Summarize the disaster report concisely, focusing on key facts and urgency."
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Summarize this disaster report: {text}"
+                        }
+                    ],
+                    "max_tokens": 150
+                },
+                timeout=30.0
+            )
+
+            if response.status_code == 200:
+                result = response.json()
+                summary = result["choices"][0]["message"]["content"].strip()
+                return {
+                    "summary": summary,
+                    "source": "openai",
+                    "confidence": 0.9
+                }
+            else:
+                raise UpstreamError(f"OpenAI API error: {response.status_code}", response.status_code)
 
         except Exception as e:
             logger.error(f"OpenAI summarization failed: {str(e)}")
@@ -79,34 +99,29 @@ class SummarizerAdapter(AIAdapter):
     async def _hf_summarize(self, text: str) -> Dict[str, Any]:
         """Summarize using Hugging Face API"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api-inference.huggingface.co/models/facebook/bart-large-cnn",
-                    headers={"Authorization": f"Bearer {self.hf_key}"},
-                    json={"inputs": text},
-                    timeout=30.0
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    if isinstance(result, list) and len(result) > 0:
-                        summary = result[0].get("summary_text", "").strip()
-                        return {
-                            "summary": summary,
-                            "source": "huggingface",
-                            "confidence": 0.8
-                        }
-                raise Exception(f"HF API error: {response.status_code}")
+            response = await self._request(
+                "huggingface", "POST",
+                "https://api-inference.huggingface.co/models/facebook/bart-large-cnn",
+                headers={"Authorization": f"Bearer {self.hf_key}"},
+                json={"inputs": text},
+                timeout=30.0
+            )
+
+            if response.status_code == 200:
+                result = response.json()
+                if isinstance(result, list) and len(result) > 0:
+                    summary = result[0].get("summary_text", "").strip()
+                    return {
+                        "summary": summary,
+                        "source": "huggingface",
+                        "confidence": 0.8
+                    }
+            raise UpstreamError(f"HF API error: {response.status_code}", response.status_code)
 
         except Exception as e:
             logger.error(f"Hugging Face summarization failed: {str(e)}")
             raise
 
-    async def _mock_analyze(self, text: str) -> Dict[str, Any]:
-        """Mock summarization - returns first 100 chars"""
-        summary = text[:100] + "..." if len(text) > 100 else text
-        return {
-            "summary": f"{summary} [summary generated]",
-            "source": "mock",
-            "confidence": 0.7
-        }
\ No newline at end of file
+    async def _mock_analyze(self, text: str, severity: Optional[int] = None) -> Dict[str, Any]:
+        """Offline summarization with the extractive tier; also the fallback when an LLM call fails"""
+        return await self._local_summarize(text, "mock")
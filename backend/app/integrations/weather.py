@@ -1,7 +1,7 @@
-import httpx
 import random
 import logging
 from app.integrations.base import AIAdapter
+from app.integrations.concurrency import UpstreamError
 from app.core.config import settings
 
 from typing import Dict, Any # for Dict and Any
@@ -28,29 +28,29 @@ class WeatherAdapter(AIAdapter):
             return await self._mock_analyze(lat, lon)
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"https://api.openweathermap.org/data/2.5/weather",
-                    params={
-                        "lat": lat,
-                        "lon": lon,
-                        "appid": self.api_key,
-                        "units": "metric"
-                    },
-                    timeout=10.0
-                )
+            response = await self._request(
+                "openweather", "GET",
+                f"https://api.openweathermap.org/data/2.5/weather",
+                params={
+                    "lat": lat,
+                    "lon": lon,
+                    "appid": self.api_key,
+                    "units": "metric"
+                },
+                timeout=10.0
+            )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "temperature": data["main"]["temp"],
-                        "conditions": data["weather"][0]["description"],
-                        "humidity": data["main"]["humidity"],
-                        "wind_speed": data["wind"]["speed"],
-                        "source": "openweather"
-                    }
-                else:
-                    raise Exception(f"Weather API error: {response.status_code}")
+            if response.status_code == 200:
+                data = response.json()
+                return {
+                    "temperature": data["main"]["temp"],
+                    "conditions": data["weather"][0]["description"],
+                    "humidity": data["main"]["humidity"],
+                    "wind_speed": data["wind"]["speed"],
+                    "source": "openweather"
+                }
+            else:
+                raise UpstreamError(f"Weather API error: {response.status_code}", response.status_code)
 
         except Exception as e:
             logger.error(f"Weather API failed: {str(e)}")
@@ -1,15 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
 from app.core.logging_config import setup_logging
-from app.api import routes_reports, routes_alerts, routes_health
-from app.db.session import create_db_and_tables
+from app.core.middleware import MetricsMiddleware
+from app.api import routes_reports, routes_alerts, routes_export, routes_health, routes_metrics, routes_search
+from app.db.session import create_db_and_tables, engine
 import logging
-import sys
-import os
-
-# Add the backend directory to Python path so scripts can be found
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Setup logging
 setup_logging()
@@ -30,15 +27,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for text and JSON; inside the metrics middleware so latency includes it
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Request latency metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(routes_health.router, tags=["health"])
+app.include_router(routes_metrics.router, tags=["metrics"])
 app.include_router(routes_reports.router, prefix="/api/v1", tags=["reports"])
 app.include_router(routes_alerts.router, prefix="/api/v1", tags=["alerts"])
+app.include_router(routes_export.router, prefix="/api/v1", tags=["export"])
+app.include_router(routes_search.router, prefix="/api/v1", tags=["search"])
 
+# Opt-in Server-Timing headers and sampled profiles; nothing is installed when disabled
+if settings.PROFILING_ENABLED:
+    from app.core.profiling import install_profiling
+    install_profiling(app, engine)
 
-@app.on_event("startup")
-def on_startup():
-    """Initialize database and seed data on startup"""
+
+def run_startup_work():
+    """Schema, seeding and aggregate setup; runs in one process when several start together"""
     create_db_and_tables()
 
     # Seed database on startup for deployment
@@ -49,19 +60,72 @@ def on_startup():
     except Exception as e:
         logger.warning(f"Basic seeding failed: {e}")
 
-    # Try to seed realistic data if available
     try:
-        from scripts.seed_realistic import seed_realistic_data
+        from app.db.seed_realistic import seed_realistic_data
         seed_realistic_data()
         logger.info("Realistic data seeding completed")
-    except ImportError as e:
-        logger.warning(f"Realistic data seeding not available: {e}")
     except Exception as e:
         logger.error(f"Realistic data seeding failed: {e}")
 
+    # Databases created before rollups and grid cells existed get them built once
+    try:
+        from sqlmodel import Session
+        from app.services.alert_events import ensure_aggregates
+        with Session(engine) as session:
+            ensure_aggregates(session)
+    except Exception as e:
+        logger.error(f"Building alert aggregates failed: {e}")
+
+    # Reports left unanalyzed by a previous run go back on this process's queue
+    if settings.ANALYSIS_MODE == "inprocess":
+        try:
+            from sqlmodel import Session
+            from app.services.analysis_queue import requeue_pending
+            with Session(engine) as session:
+                requeued = requeue_pending(session)
+            if requeued:
+                logger.info(f"Requeued {requeued} unanalyzed reports")
+        except Exception as e:
+            logger.error(f"Requeueing unanalyzed reports failed: {e}")
+
+
+@app.on_event("startup")
+def on_startup():
+    """Initialize database and seed data on startup"""
+    # With several workers (uvicorn/gunicorn --workers N) only one does the one-time work
+    from app.services.leases import run_once
+    if not run_once(engine, "startup", run_startup_work, settings.STARTUP_LEASE_SECONDS):
+        logger.info("Startup work was done by another process")
+
+    # Periodic alert expiry and archival; passes are leased, so one process runs each
+    if settings.EXPIRY_ENABLED:
+        from app.services.maintenance import start_scheduler
+        start_scheduler()
+
+    # Serve the active alert feed from memory
+    if settings.HOT_STORE_ENABLED:
+        from app.services.hot_store import start_hot_store
+        try:
+            start_hot_store(engine)
+        except Exception as e:
+            logger.error(f"Loading the hot alert store failed: {e}")
+
     logger.info("Alertrix API started successfully")
 
 
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Stop background maintenance, hot store sync, analysis workers and the local stage pool"""
+    from app.integrations.executor import get_stage_executor
+    from app.services.analysis_queue import analysis_queue
+    from app.services.hot_store import stop_hot_store
+    from app.services.maintenance import stop_scheduler
+    await stop_scheduler()
+    await stop_hot_store()
+    await analysis_queue.stop()
+    get_stage_executor().shutdown()
+
+
 @app.get("/")
 async def root():
     return {
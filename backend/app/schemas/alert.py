@@ -13,6 +13,9 @@ class AlertResponse(BaseModel):
     location_name: str
     created_at: datetime
     is_active: bool
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    report_count: int = 1
 
     class Config:
         from_attributes = True
@@ -28,6 +31,7 @@ class FrontendAlertResponse(BaseModel):
     severity: int    # Map from severity_score
     timestamp: str   # Map from created_at
     source: str      # Need to get from associated report
+    report_count: int = 1  # Reports clustered into this incident
 
     class Config:
         from_attributes = True
@@ -37,4 +41,82 @@ class AlertFilter(BaseModel):
     type: Optional[str] = None
     min_severity: Optional[int] = None
     limit: Optional[int] = None
-    active_only: Optional[bool] = True
\ No newline at end of file
+    active_only: Optional[bool] = True
+    archived: bool = False  # Query the archive table instead of live alerts
+
+class AlertStatsBucket(BaseModel):
+    """Aggregate for one group; grouping fields not requested are omitted"""
+    disaster_type: Optional[str] = None
+    severity_bucket: Optional[int] = None
+    source: Optional[str] = None
+    hour: Optional[datetime] = None
+    alert_count: int
+    report_count: int
+    avg_severity: float
+    max_severity: int
+
+class AlertStatsResponse(BaseModel):
+    """Schema for alert statistics"""
+    group_by: List[str]
+    buckets: List[AlertStatsBucket]
+
+
+class TimeseriesPoint(BaseModel):
+    """Alerts of one disaster type created in one time bucket"""
+    bucket_start: datetime
+    disaster_type: str
+    alert_count: int
+    report_count: int  # Reports clustered into these alerts
+    avg_severity: float
+    p50_severity: int
+    p90_severity: int
+    p99_severity: int
+    max_severity: int
+
+class TimeseriesReportPoint(BaseModel):
+    """Reports received in one time bucket"""
+    bucket_start: datetime
+    report_count: int
+
+class TimeseriesResponse(BaseModel):
+    """Schema for bucketed alert and report volume"""
+    interval: str  # May be coarser than requested to stay within the point limit
+    interval_seconds: int
+    since: datetime  # The requested range widened to whole buckets
+    until: datetime
+    points: List[TimeseriesPoint]
+    reports: List[TimeseriesReportPoint]  # All reports, whatever the type filter
+
+
+class AlertGridCellResponse(BaseModel):
+    """One map grid cell"""
+    lat: float  # Centroid of the cell's alerts
+    lon: float
+    bounds: List[float]  # [south, west, north, east]
+    count: int
+    max_severity: int
+    avg_severity: float
+
+class AlertGridResponse(BaseModel):
+    """Schema for aggregated map grid"""
+    level: int
+    cell_size_deg: float
+    cells: List[AlertGridCellResponse]
+
+
+class SearchHit(BaseModel):
+    """A matching alert or report, with the alert it belongs to"""
+    id: int
+    alert_id: Optional[int] = None  # None for reports not yet clustered into an alert
+    snippet: str  # Matched terms wrapped in <mark>
+    score: float  # Higher is a better match; comparable within one list only
+    alert_type: Optional[str] = None
+    severity: Optional[int] = None
+    location: Optional[str] = None
+    timestamp: str
+
+class SearchResponse(BaseModel):
+    """Schema for full-text search results"""
+    query: str
+    alerts: List[SearchHit]
+    reports: List[SearchHit]
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class ReportCreate(BaseModel):
     """Schema for creating a report"""
@@ -8,6 +8,7 @@ class ReportCreate(BaseModel):
     lat: float
     lon: float
     source: str
+    dedup_key: Optional[str] = Field(None, max_length=255)  # Same as the Idempotency-Key header
 
 class ReportResponse(BaseModel):
     """Schema for report response"""
@@ -30,4 +31,16 @@ class ReportStatusResponse(BaseModel):
     """Schema for report status response"""
     status: str
     report: ReportResponse
-    message: str
\ No newline at end of file
+    message: str
+
+
+class ReanalyzeResponse(BaseModel):
+    """Schema for a re-analysis from stored evidence"""
+    report_id: int
+    disaster_type: str
+    severity_score: int
+    summary: str
+    location_name: str
+    alert_id: Optional[int] = None
+    reused_stages: List[str]
+    recomputed_stages: List[str]
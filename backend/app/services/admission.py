@@ -0,0 +1,65 @@
+import random
+import time
+from datetime import datetime
+from typing import NamedTuple, Optional, Set, Tuple
+from sqlalchemy import func
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.core.metrics import ADMISSION_DECISIONS, analysis_backlog
+from app.db.models import Report
+
+# Worker mode reads the backlog from the database; at most once per interval per process
+BACKLOG_CACHE_SECONDS = 1.0
+
+_db_backlog: Tuple[float, int, float] = (float("-inf"), 0, 0.0)
+
+
+class Admission(NamedTuple):
+    decision: str  # accept | defer | reject
+    retry_after: Optional[int] = None
+
+
+def trusted_sources() -> Set[str]:
+    return {source.strip() for source in settings.ADMISSION_TRUSTED_SOURCES.split(",") if source.strip()}
+
+
+def backlog_status() -> Tuple[int, float]:
+    """Depth and oldest wait in seconds of analysis that has not started, deferred reports excluded"""
+    if settings.ANALYSIS_MODE != "worker":
+        return analysis_backlog.depth(), analysis_backlog.oldest_age()
+
+    global _db_backlog
+    now = time.monotonic()
+    if now - _db_backlog[0] >= BACKLOG_CACHE_SECONDS:
+        from app.db.session import engine
+        with Session(engine) as session:
+            depth, oldest = session.exec(
+                select(func.count(Report.id), func.min(Report.created_at))
+                .where(Report.is_analyzed == False)
+                .where(Report.analysis_deferred == False)
+            ).one()
+        age = max(0.0, (datetime.utcnow() - oldest).total_seconds()) if oldest else 0.0
+        _db_backlog = (now, depth, age)
+    return _db_backlog[1], _db_backlog[2]
+
+
+def admit_report(source: str) -> Admission:
+    """
+    Decide whether a new report is analyzed now, stored with analysis deferred, or refused.
+
+    Trusted sources are always accepted. Rejections carry a jittered
+    Retry-After so refused clients do not all come back at once.
+    """
+    if source in trusted_sources():
+        admission = Admission("accept")
+    else:
+        depth, age = backlog_status()
+        if depth >= settings.ADMISSION_HARD_DEPTH or age >= settings.ADMISSION_HARD_AGE_SECONDS:
+            base = settings.ADMISSION_RETRY_AFTER_SECONDS
+            admission = Admission("reject", base + random.randint(0, base // 2))
+        elif depth >= settings.ADMISSION_SOFT_DEPTH or age >= settings.ADMISSION_SOFT_AGE_SECONDS:
+            admission = Admission("defer")
+        else:
+            admission = Admission("accept")
+    ADMISSION_DECISIONS.labels(admission.decision).inc()
+    return admission
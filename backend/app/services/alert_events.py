@@ -0,0 +1,67 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
+from sqlmodel import Session
+from app.db.models import Alert
+
+
+class AlertSnapshot(NamedTuple):
+    """The alert fields derived aggregates depend on"""
+    created_at: datetime
+    disaster_type: str
+    severity_score: int
+    source: str
+    is_active: bool
+    report_count: int
+    lat: Optional[float]
+    lon: Optional[float]
+
+
+def snapshot_alert(alert: Alert) -> AlertSnapshot:
+    disaster_type = alert.disaster_type
+    return AlertSnapshot(
+        created_at=alert.created_at,
+        disaster_type=getattr(disaster_type, "value", disaster_type),
+        severity_score=alert.severity_score,
+        source=alert.source or "unknown",
+        is_active=alert.is_active,
+        report_count=alert.report_count or 1,
+        lat=alert.lat,
+        lon=alert.lon,
+    )
+
+
+def alert_changed(session: Session, before: Optional[AlertSnapshot], after: Optional[AlertSnapshot]):
+    """
+    Keep derived aggregates in step with an alert insert, update or deactivation.
+
+    Runs inside the caller's transaction so aggregates commit atomically with the alert.
+    """
+    from app.services import grid, rollups, timeseries
+
+    if before == after:
+        return
+    rollups.apply_change(session, before, after)
+    grid.apply_change(session, before, after)
+    timeseries.apply_change(session, before, after)
+
+
+def alert_created(session: Session, alert: Alert):
+    alert_changed(session, None, snapshot_alert(alert))
+
+
+def rebuild_aggregates(session: Session):
+    """Recompute every derived aggregate from the alert table (after bulk writes)"""
+    from app.services import grid, rollups, timeseries
+
+    rollups.rebuild_rollups(session)
+    grid.rebuild_grid(session)
+    timeseries.rebuild_timeseries(session)
+
+
+def ensure_aggregates(session: Session):
+    """Build aggregates missing from databases created before they existed"""
+    from app.services import grid, rollups, timeseries
+
+    rollups.ensure_rollups(session)
+    grid.ensure_grid(session)
+    timeseries.ensure_timeseries(session)
@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, Optional
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+from app.schemas.alert import FrontendAlertResponse
+
+
+def encode_alert(alert) -> bytes:
+    """One alert as FrontendAlertResponse JSON; alert is the response model or any object with its fields"""
+    if not isinstance(alert, FrontendAlertResponse):
+        alert = FrontendAlertResponse.model_validate(alert)
+    return alert.model_dump_json().encode()
+
+
+def json_array(fragments: Iterable[bytes]) -> bytes:
+    return b"[" + b",".join(fragments) + b"]"
+
+
+class AlertJSONCache:
+    """
+    Encoded alerts for listings served from the database, least recently used evicted.
+
+    Alerts change as reports are clustered into them, so a fragment is only
+    reused while the alert's updated_at matches the one it was encoded at.
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        self._lock = threading.Lock()
+        self._capacity = capacity
+        self._fragments: "OrderedDict[int, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+    def get(self, alert_id: int, updated_at: datetime) -> Optional[bytes]:
+        with self._lock:
+            entry = self._fragments.get(alert_id)
+            if entry is not None and entry[0] == updated_at:
+                self._fragments.move_to_end(alert_id)
+                fragment = entry[1]
+            else:
+                fragment = None
+        record_cache_lookup("alert_json", fragment is not None)
+        return fragment
+
+    def put(self, alert_id: int, updated_at: datetime, fragment: bytes):
+        capacity = self._capacity or settings.ALERT_JSON_CACHE_SIZE
+        with self._lock:
+            self._fragments[alert_id] = (updated_at, fragment)
+            self._fragments.move_to_end(alert_id)
+            while len(self._fragments) > capacity:
+                self._fragments.popitem(last=False)
+
+    def discard(self, alert_id: int):
+        with self._lock:
+            self._fragments.pop(alert_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
+
+
+alert_json_cache = AlertJSONCache()
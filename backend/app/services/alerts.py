@@ -1,7 +1,15 @@
 import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from sqlmodel import Session, select
-from app.db.models import Alert, Report
+from app.db.models import Alert, AlertArchive, Report
 from app.schemas.alert import AlertFilter, FrontendAlertResponse
+from app.core.metrics import analysis_backlog, ANALYSIS_QUEUE_WAIT, REPORT_TO_ALERT
+from app.core.profiling import timed_phase
+from app.services.alert_events import alert_changed, snapshot_alert
+from app.services.alert_json import alert_json_cache, encode_alert, json_array
+from app.services.clustering import cluster_report, rescore_alert
+from app.services.evidence import fresh_stages, store_evidence
 
 logger = logging.getLogger(__name__)
 
@@ -13,51 +21,54 @@ async def run_analysis_and_create_alert(report_id: int):
     from app.db.session import engine
     from app.services.analyzer import analyze_report
 
-    logger.info(f"Starting background analysis for report {report_id}")
+    waited = analysis_backlog.remove(report_id)
+    if waited is not None:
+        ANALYSIS_QUEUE_WAIT.observe(waited)
+
+    logger.info("Starting background analysis for report %s", report_id)
 
     try:
         with Session(engine) as session:
             # Get the report
             report = session.get(Report, report_id)
             if not report:
-                logger.error(f"Report {report_id} not found for analysis")
+                logger.error("Report %s not found for analysis", report_id)
                 return
 
             # Analyze the report using AI
             analysis_result = await analyze_report(report.text, report.lat, report.lon)
 
-            # Create alert from analysis results
-            alert = Alert(
-                report_id=report_id,
-                disaster_type=analysis_result["disaster_type"],
-                severity_score=analysis_result["severity_score"],
-                summary=analysis_result["summary"],
-                location_name=analysis_result["location_name"]
-            )
+            # Attach to a nearby incident or create a new alert
+            alert, created = cluster_report(session, report, analysis_result)
+
+            # Keep adapter outputs so re-analysis does not have to call them again
+            store_evidence(report, analysis_result)
 
             # Update report as analyzed
             report.is_analyzed = True
 
             # Save to database
-            session.add(alert)
             session.add(report)
             session.commit()
             session.refresh(alert)
 
+            REPORT_TO_ALERT.observe(max(0.0, (datetime.utcnow() - report.created_at).total_seconds()))
+
             # Log high severity alerts
             if alert.severity_score > 80:
-                logger.warning(f"⚠️ HIGH-SEVERITY ALERT! ID: {alert.id}, "
-                               f"Type: {alert.disaster_type}, "
-                               f"Severity: {alert.severity_score}")
+                logger.warning("⚠️ HIGH-SEVERITY ALERT! ID: %s, Type: %s, Severity: %s",
+                               alert.id, alert.disaster_type, alert.severity_score)
+            elif created:
+                logger.info("Alert created: ID %s, Type: %s, Severity: %s",
+                            alert.id, alert.disaster_type, alert.severity_score)
             else:
-                logger.info(f"Alert created: ID {alert.id}, "
-                            f"Type: {alert.disaster_type}, "
-                            f"Severity: {alert.severity_score}")
+                logger.info("Report %s attached to alert %s (%s reports)",
+                            report_id, alert.id, alert.report_count)
 
             return alert
 
     except Exception as e:
-        logger.error(f"Failed to analyze report {report_id}: {str(e)}")
+        logger.error("Failed to analyze report %s: %s", report_id, e)
         # Mark report as analyzed even if failed to prevent infinite retries
         try:
             with Session(engine) as session:
@@ -67,25 +78,113 @@ async def run_analysis_and_create_alert(report_id: int):
                     session.add(report)
                     session.commit()
         except Exception as inner_e:
-            logger.error(f"Failed to mark report {report_id} as analyzed: {str(inner_e)}")
+            logger.error("Failed to mark report %s as analyzed: %s", report_id, inner_e)
 
 
-def get_filtered_alerts(session: Session, alert_filter: AlertFilter):
+def apply_reanalysis(session: Session, report: Report, analysis_result: Dict[str, Any]) -> Optional[Alert]:
     """
-    Get alerts with optional filtering - ORIGINAL VERSION (keep for compatibility)
+    Store a re-analysis on the report and its incident. The caller commits.
+
+    Returns the live incident it updated or created, or None if that incident has been archived.
     """
-    from app.db.models import Alert
-    query = select(Alert)
+    store_evidence(report, analysis_result)
+    report.is_analyzed = True
+    session.add(report)
+
+    alert = session.get(Alert, report.alert_id) if report.alert_id is not None else None
+    if alert is not None:
+        before = snapshot_alert(alert)
+        rescore_alert(alert, report, analysis_result)
+        session.add(alert)
+        session.flush()
+        alert_changed(session, before, snapshot_alert(alert))
+    elif report.alert_id is None:
+        alert, _ = cluster_report(session, report, analysis_result)
+    return alert
+
 
-    # Apply filters
-    if alert_filter.active_only:
-        query = query.where(Alert.is_active == True)
+def analysis_failed(analysis_result: Dict[str, Any]) -> bool:
+    """The analyzer fell back after an error, so the result carries no usable evidence"""
+    return "error" in analysis_result["evidence"]["classifier"]
+
+
+async def reanalyze_report(session: Session, report: Report) -> Tuple[Dict[str, Any], Optional[Alert]]:
+    """
+    Re-derive a report's analysis, calling only stages whose stored evidence is missing or stale.
+
+    Returns the analysis result, with the stage names that were reused, and the
+    live incident it updated (None if that incident has been archived).
+    """
+    from app.services.analyzer import analyze_report
+
+    reused = fresh_stages(report.evidence, report.evidence_version)
+    variation = report.severity_variation
+    if variation is None and report.alert_id is not None:
+        # Analyzed before reports kept their variation; the incident stored the one it was scored with
+        alert = session.get(Alert, report.alert_id)
+        variation = alert.severity_variation if alert is not None else None
+    analysis_result = await analyze_report(report.text, report.lat, report.lon, evidence=reused,
+                                           severity_variation=variation)
+    if analysis_failed(analysis_result):
+        raise RuntimeError(f"Re-analysis of report {report.id} failed")
+    analysis_result["reused_stages"] = sorted(reused)
+
+    alert = apply_reanalysis(session, report, analysis_result)
+    session.commit()
+    if alert is not None:
+        session.refresh(alert)
+    return analysis_result, alert
+
+
+def deactivate_alert(session: Session, alert: Alert) -> Alert:
+    """Mark an alert inactive, keeping derived aggregates in step. The caller commits."""
+    if not alert.is_active:
+        return alert
+    before = snapshot_alert(alert)
+    alert.is_active = False
+    alert.updated_at = datetime.utcnow()
+    session.add(alert)
+    session.flush()
+    alert_changed(session, before, snapshot_alert(alert))
+    alert_json_cache.discard(alert.id)
+    return alert
+
+
+def alert_model(alert_filter: AlertFilter):
+    """Live alerts, or the archive when explicitly requested"""
+    return AlertArchive if alert_filter.archived else Alert
+
+
+def alert_filter_clauses(alert_filter: AlertFilter) -> List[Any]:
+    """The type, severity and active conditions shared by alert listings, exports and search"""
+    model = alert_model(alert_filter)
+    clauses = []
+    # Archived alerts are all inactive, so active_only does not apply to them
+    if alert_filter.active_only and not alert_filter.archived:
+        clauses.append(model.is_active == True)
 
     if alert_filter.type:
-        query = query.where(Alert.disaster_type == alert_filter.type)
+        clauses.append(model.disaster_type == alert_filter.type)
 
     if alert_filter.min_severity is not None:
-        query = query.where(Alert.severity_score >= alert_filter.min_severity)
+        clauses.append(model.severity_score >= alert_filter.min_severity)
+
+    return clauses
+
+
+def apply_alert_filter(query, alert_filter: AlertFilter):
+    """Apply the type, severity and active filters shared by alert listings and exports"""
+    for clause in alert_filter_clauses(alert_filter):
+        query = query.where(clause)
+    return query
+
+
+def get_filtered_alerts(session: Session, alert_filter: AlertFilter):
+    """
+    Get alerts with optional filtering - ORIGINAL VERSION (keep for compatibility)
+    """
+    from app.db.models import Alert
+    query = apply_alert_filter(select(Alert), alert_filter)
 
     # Order by creation date (newest first)
     query = query.order_by(Alert.created_at.desc())
@@ -98,43 +197,56 @@ def get_filtered_alerts(session: Session, alert_filter: AlertFilter):
     return alerts
 
 
-def get_filtered_alerts_with_reports(session: Session, alert_filter: AlertFilter):
-    """
-    Get alerts joined with report data for frontend compatibility
-    """
-    query = select(Alert, Report).join(Report, Alert.report_id == Report.id)
+def _filtered_alert_rows(session: Session, alert_filter: AlertFilter):
+    model = alert_model(alert_filter)
+    query = select(model, Report).join(Report, model.report_id == Report.id)
+    query = apply_alert_filter(query, alert_filter)
 
-    # Apply filters
-    if alert_filter.active_only:
-        query = query.where(Alert.is_active == True)
+    query = query.order_by(model.created_at.desc())
 
-    if alert_filter.type:
-        query = query.where(Alert.disaster_type == alert_filter.type)
+    if alert_filter.limit:
+        query = query.limit(alert_filter.limit)
 
-    if alert_filter.min_severity is not None:
-        query = query.where(Alert.severity_score >= alert_filter.min_severity)
+    return session.exec(query).all()
 
-    query = query.order_by(Alert.created_at.desc())
 
-    if alert_filter.limit:
-        query = query.limit(alert_filter.limit)
+def frontend_alert(alert: Alert, report: Report) -> FrontendAlertResponse:
+    """An alert in the frontend format; location and source fall back to its first report"""
+    return FrontendAlertResponse(
+        id=alert.id,
+        alert_type=alert.disaster_type,
+        summary=alert.summary,
+        location=alert.location_name,
+        lat=alert.lat if alert.lat is not None else report.lat,
+        lon=alert.lon if alert.lon is not None else report.lon,
+        severity=alert.severity_score,
+        timestamp=alert.created_at.isoformat(),
+        source=report.source,
+        report_count=alert.report_count
+    )
 
-    results = session.exec(query).all()
+
+def get_filtered_alerts_with_reports(session: Session, alert_filter: AlertFilter):
+    """
+    Get alerts joined with report data for frontend compatibility
+    """
+    results = _filtered_alert_rows(session, alert_filter)
 
     # Transform to frontend format
-    frontend_alerts = []
-    for alert, report in results:
-        frontend_alert = FrontendAlertResponse(
-            id=alert.id,
-            alert_type=alert.disaster_type,
-            summary=alert.summary,
-            location=alert.location_name,
-            lat=report.lat,
-            lon=report.lon,
-            severity=alert.severity_score,
-            timestamp=alert.created_at.isoformat(),
-            source=report.source
-        )
-        frontend_alerts.append(frontend_alert)
-
-    return frontend_alerts
\ No newline at end of file
+    with timed_phase("serialize"):
+        return [frontend_alert(alert, report) for alert, report in results]
+
+
+def get_filtered_alerts_json(session: Session, alert_filter: AlertFilter) -> bytes:
+    """The get_filtered_alerts_with_reports listing as a JSON array, encoding only alerts not already cached"""
+    results = _filtered_alert_rows(session, alert_filter)
+
+    fragments = []
+    with timed_phase("serialize"):
+        for alert, report in results:
+            fragment = alert_json_cache.get(alert.id, alert.updated_at)
+            if fragment is None:
+                fragment = encode_alert(frontend_alert(alert, report))
+                alert_json_cache.put(alert.id, alert.updated_at, fragment)
+            fragments.append(fragment)
+        return json_array(fragments)
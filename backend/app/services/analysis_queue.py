@@ -0,0 +1,282 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import re
+import time
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.core.metrics import analysis_backlog
+from app.db.models import Report
+from app.integrations.extractive_summarizer import URGENCY_TERMS
+from app.integrations.keyword_classifier import get_keyword_classifier
+from app.services.analyzer import DEFAULT_BASE_SCORE, TYPE_BASE_SCORES
+from app.services.clustering import grid_cell_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOURCE_WEIGHT = 10.0
+REGION_CELL_KM = 25.0
+
+_WORD = re.compile(r"\w+")
+
+
+def parse_source_weights(spec: str) -> Dict[str, float]:
+    """Parse "emergency_services=40,twitter=5" into weights per source"""
+    weights = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        source, weight = item.split("=", 1)
+        weights[source.strip()] = float(weight)
+    return weights
+
+
+@lru_cache(maxsize=8)
+def _source_weights(spec: str) -> Dict[str, float]:
+    """PRIORITY_SOURCE_WEIGHTS parsed once per distinct value instead of on every report"""
+    return parse_source_weights(spec)
+
+
+@lru_cache(maxsize=4096)
+def _type_score(text: str) -> float:
+    """Prescore points for the likely disaster type; reposted and retried texts are classified once"""
+    classification = get_keyword_classifier().classify(text)
+    if classification["disaster_type"] == "other":
+        return 0.0
+    base = TYPE_BASE_SCORES.get(classification["disaster_type"], DEFAULT_BASE_SCORE)
+    return 35 * (base / 100) * classification["confidence"]
+
+
+class RegionRateTracker:
+    """Sliding-window count of recent reports per ~25 km region"""
+
+    def __init__(self, window_seconds: Optional[float] = None):
+        self.window_seconds = window_seconds or settings.PRIORITY_RATE_WINDOW_SECONDS
+        self._events: Dict[str, Deque[float]] = {}
+
+    def record(self, lat: float, lon: float, now: Optional[float] = None) -> int:
+        """Count a report and return how many the region saw within the window, this one included"""
+        now = time.monotonic() if now is None else now
+        events = self._events.setdefault(grid_cell_key(lat, lon, REGION_CELL_KM), deque())
+        events.append(now)
+        while events and events[0] < now - self.window_seconds:
+            events.popleft()
+        if len(self._events) > 10_000:
+            self._prune(now)
+        return len(events)
+
+    def _prune(self, now: float):
+        for key in [key for key, events in self._events.items() if not events or events[-1] < now - self.window_seconds]:
+            del self._events[key]
+
+
+def prescore_report(text: str, source: str, region_count: int = 1) -> int:
+    """
+    Cheap 0-100 ingest priority from source, keyword hits and regional report rate.
+
+    Source weight up to ~40, likely disaster type and urgency words up to 45,
+    bursts of reports from the same region up to 15.
+    """
+    score = _source_weights(settings.PRIORITY_SOURCE_WEIGHTS).get(source, DEFAULT_SOURCE_WEIGHT)
+    score += _type_score(text)
+
+    words = set(_WORD.findall(text.casefold()))
+    score += min(10.0, sum(URGENCY_TERMS.get(word, 0.0) for word in words))
+
+    score += min(15.0, 5 * math.log2(max(region_count, 1)))
+    return int(min(100, round(score)))
+
+
+class AnalysisQueue:
+    """
+    Priority queue feeding a fixed pool of analysis workers.
+
+    Items are ordered by priority + aging rate * time waited. Since every
+    item ages at the same rate, that equals ordering by
+    priority - rate * enqueue time, which is fixed at push time and fits a heap.
+
+    When the queue runs dry, refill is called in a thread to release reports
+    deferred by admission control: only while some may be waiting (see
+    note_deferred), from one worker at a time and at most once per refill_interval.
+    """
+
+    def __init__(self, handler: Optional[Callable[[int], Awaitable[object]]] = None,
+                 workers: Optional[int] = None, aging_per_minute: Optional[float] = None,
+                 refill: Optional[Callable[[], List[Tuple[int, float, datetime]]]] = None,
+                 refill_interval: Optional[float] = None):
+        self._handler = handler
+        self._refill = refill  # Returns (report id, priority, created_at) of reports to queue
+        self.refill_interval = (settings.ANALYSIS_REFILL_INTERVAL_SECONDS if refill_interval is None
+                                else refill_interval)
+        # Deferrals noted since the last empty refill; starts at 1 as a previous run may have left some
+        self._deferred = 1
+        self._refilling = False
+        self._next_refill_at = 0.0
+        self.worker_count = workers or settings.ANALYSIS_WORKERS
+        self.aging_per_second = (settings.PRIORITY_AGING_PER_MINUTE if aging_per_minute is None
+                                 else aging_per_minute) / 60.0
+        self._heap: List[Tuple[float, int, int]] = []
+        self._queued: Set[int] = set()
+        self._sequence = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+
+    def push(self, report_id: int, priority: float, enqueued_at: Optional[float] = None):
+        if report_id in self._queued:
+            return
+        enqueued_at = time.monotonic() if enqueued_at is None else enqueued_at
+        key = -(priority - self.aging_per_second * enqueued_at)
+        heapq.heappush(self._heap, (key, next(self._sequence), report_id))
+        self._queued.add(report_id)
+        analysis_backlog.add(report_id)
+        self._ensure_workers()
+        self._wakeup.set()
+
+    def push_waited(self, reports: Iterable[Tuple[int, float, datetime]]):
+        """Queue stored reports, given as (id, priority, created_at), crediting the time they already waited"""
+        now_wall = datetime.utcnow()
+        now = time.monotonic()
+        for report_id, priority, created_at in reports:
+            waited = max(0.0, (now_wall - created_at).total_seconds())
+            self.push(report_id, priority, enqueued_at=now - waited)
+
+    def note_deferred(self):
+        """A report was stored with analysis deferred; the next idle refill looks for it"""
+        self._deferred += 1
+
+    def pop(self) -> Optional[int]:
+        if not self._heap:
+            return None
+        _, _, report_id = heapq.heappop(self._heap)
+        self._queued.discard(report_id)
+        return report_id
+
+    def depth(self) -> int:
+        return len(self._heap)
+
+    def _ensure_workers(self):
+        """Start workers on the running loop; a new loop (e.g. after a restart in tests) gets new ones"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and all(not worker.done() for worker in self._workers):
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._workers = [loop.create_task(self._work()) for _ in range(self.worker_count)]
+
+    async def _work(self):
+        handler = self._handler
+        if handler is None:
+            from app.services.alerts import run_analysis_and_create_alert
+            handler = run_analysis_and_create_alert
+
+        while True:
+            report_id = self.pop()
+            if report_id is None:
+                self._wakeup.clear()
+                if await self._refill_idle():
+                    continue
+                await self._wait_for_work()
+                continue
+            try:
+                await handler(report_id)
+            except Exception as e:
+                logger.error("Analysis worker failed on report %s: %s", report_id, e)
+
+    async def _refill_idle(self) -> bool:
+        if (self._refill is None or self._deferred <= 0 or self._refilling
+                or time.monotonic() < self._next_refill_at):
+            return False
+        self._refilling = True
+        noted = self._deferred
+        try:
+            # The release runs a query and a commit; keep them off the event loop
+            released = await asyncio.to_thread(self._refill)
+        except Exception as e:
+            logger.error("Refilling the analysis queue failed: %s", e)
+            released = []
+        finally:
+            self._refilling = False
+            self._next_refill_at = time.monotonic() + self.refill_interval
+        # Keep looking while releases find work; deferrals noted meanwhile are looked for next time
+        self._deferred = max(1, self._deferred - len(released)) if released else self._deferred - noted
+        self.push_waited(released)
+        return bool(released)
+
+    async def _wait_for_work(self):
+        if self._refill is None or self._deferred <= 0 or self._refilling:
+            await self._wakeup.wait()
+            return
+        # Deferred reports may be waiting for the refill interval to pass
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, self._next_refill_at - time.monotonic()))
+        except asyncio.TimeoutError:
+            pass
+
+    async def stop(self):
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+def release_deferred(limit: Optional[int] = None) -> List[Tuple[int, float, datetime]]:
+    """
+    Clear the deferred flag on the most urgent reports deferred by admission control.
+
+    Returns (id, priority, created_at) of the released reports for the caller to queue.
+    Runs only database work, so it can be called from a thread.
+    """
+    from app.db.session import engine
+
+    limit = limit or max(1, settings.ADMISSION_SOFT_DEPTH // 2)
+    with Session(engine) as session:
+        reports = session.exec(
+            select(Report)
+            .where(Report.analysis_deferred == True)
+            .where(Report.is_analyzed == False)
+            .order_by(Report.priority.desc(), Report.id)
+            .limit(limit)
+        ).all()
+        released = [(report.id, report.priority, report.created_at) for report in reports]
+        for report in reports:
+            report.analysis_deferred = False
+            session.add(report)
+        session.commit()
+    if released:
+        logger.info("Released %s deferred reports for analysis", len(released))
+    return released
+
+
+analysis_queue = AnalysisQueue(refill=lambda: release_deferred())
+region_rates = RegionRateTracker()
+
+
+def submit_report(report: Report):
+    """Queue a stored report for analysis at its ingest priority"""
+    if settings.ANALYSIS_MODE == "worker":
+        # The stored row is the queue and an analysis process claims it (app/services/analysis_worker.py)
+        return
+    if report.analysis_deferred:
+        # Waits for release_deferred once the queue runs dry
+        analysis_queue.note_deferred()
+        return
+    analysis_queue.push(report.id, report.priority)
+
+
+def requeue_pending(session: Session) -> int:
+    """Queue reports left unanalyzed by a previous run; deferred ones stay deferred"""
+    pending = session.exec(
+        select(Report)
+        .where(Report.is_analyzed == False)
+        .where(Report.analysis_deferred == False)
+        .order_by(Report.id)
+    ).all()
+    analysis_queue.push_waited((report.id, report.priority, report.created_at) for report in pending)
+    return len(pending)
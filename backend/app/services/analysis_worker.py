@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+from sqlalchemy import Float, cast, func, or_, select, update
+from app.core.config import settings
+from app.db.models import Report
+from app.services.leases import process_identity
+
+logger = logging.getLogger(__name__)
+
+_report = Report.__table__
+
+
+def _epoch_seconds(engine, column):
+    if engine.dialect.name == "postgresql":
+        return func.extract("epoch", column)
+    return cast(func.strftime("%s", column), Float)
+
+
+def claim_reports(engine, worker_id: str, limit: int, now: Optional[datetime] = None) -> List[int]:
+    """
+    Atomically claim up to limit unanalyzed reports, most urgent first.
+
+    Urgency matches the in-process queue: priority plus aging for the time
+    waited, with reports deferred by admission control after all others.
+    Claims not renewed for ANALYSIS_CLAIM_TIMEOUT_SECONDS belong to a dead
+    worker and can be taken over.
+    """
+    now = now or datetime.utcnow()
+    stale = now - timedelta(seconds=settings.ANALYSIS_CLAIM_TIMEOUT_SECONDS)
+    claimable = or_(_report.c.claimed_by == None, _report.c.claimed_at < stale)
+    aging_per_second = settings.PRIORITY_AGING_PER_MINUTE / 60.0
+    urgency = _report.c.priority - aging_per_second * _epoch_seconds(engine, _report.c.created_at)
+
+    candidates = (
+        select(_report.c.id)
+        .where(_report.c.is_analyzed == False)
+        .where(claimable)
+        .order_by(_report.c.analysis_deferred, urgency.desc(), _report.c.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    with engine.begin() as conn:
+        # Repeating the claimable condition in the UPDATE keeps two workers from taking the same row
+        conn.execute(
+            update(_report)
+            .where(_report.c.id.in_(candidates))
+            .where(claimable)
+            .values(claimed_by=worker_id, claimed_at=now)
+        )
+        return list(conn.execute(
+            select(_report.c.id)
+            .where(_report.c.claimed_by == worker_id)
+            .where(_report.c.claimed_at == now)
+            .where(_report.c.is_analyzed == False)
+            .order_by(_report.c.analysis_deferred, urgency.desc(), _report.c.id)
+        ).scalars())
+
+
+def renew_claims(engine, worker_id: str, report_ids: Iterable[int], now: Optional[datetime] = None) -> int:
+    """Refresh this worker's claims on reports still in flight so they are not taken over; returns rows renewed"""
+    report_ids = list(report_ids)
+    if not report_ids:
+        return 0
+    with engine.begin() as conn:
+        return conn.execute(
+            update(_report)
+            .where(_report.c.id.in_(report_ids))
+            .where(_report.c.claimed_by == worker_id)
+            .where(_report.c.is_analyzed == False)
+            .values(claimed_at=now or datetime.utcnow())
+        ).rowcount
+
+
+async def run_worker(engine, worker_id: Optional[str] = None, concurrency: Optional[int] = None,
+                     poll_seconds: Optional[float] = None, stop: Optional[asyncio.Event] = None,
+                     handler: Optional[Callable[[int], Awaitable[object]]] = None) -> int:
+    """
+    Claim and analyze reports until stopped, keeping up to concurrency in flight; returns reports handled.
+
+    Claims on reports still in flight are renewed every third of the claim
+    timeout, so a slow analysis is not handed to a second worker.
+    """
+    if handler is None:
+        from app.services.alerts import run_analysis_and_create_alert
+        handler = run_analysis_and_create_alert
+    worker_id = worker_id or process_identity()
+    concurrency = concurrency or settings.ANALYSIS_WORKERS
+    poll_seconds = settings.ANALYSIS_POLL_SECONDS if poll_seconds is None else poll_seconds
+    stop = stop or asyncio.Event()
+    renew_seconds = settings.ANALYSIS_CLAIM_TIMEOUT_SECONDS / 3
+    loop = asyncio.get_running_loop()
+
+    in_flight: Dict[asyncio.Task, int] = {}
+    handled = 0
+    renewed_at = loop.time()
+    logger.info("Analysis worker %s started with %s slots", worker_id, concurrency)
+    try:
+        while not stop.is_set():
+            if in_flight and loop.time() - renewed_at >= renew_seconds:
+                try:
+                    renew_claims(engine, worker_id, in_flight.values())
+                    renewed_at = loop.time()
+                except Exception as e:
+                    logger.warning("Renewing claims failed: %s", e)
+
+            claimed = []
+            free = concurrency - len(in_flight)
+            if free:
+                try:
+                    claimed = claim_reports(engine, worker_id, free)
+                except Exception as e:
+                    # e.g. SQLite busy while another worker claims; retried on the next poll
+                    logger.warning("Claiming reports failed: %s", e)
+            for report_id in claimed:
+                task = asyncio.create_task(handler(report_id))
+                in_flight[task] = report_id
+                task.add_done_callback(lambda done: in_flight.pop(done, None))
+            handled += len(claimed)
+
+            if claimed and len(claimed) == free:
+                # Slots are full; wait for one to free up, waking in time to renew the claims
+                await asyncio.wait(list(in_flight), timeout=renew_seconds, return_when=asyncio.FIRST_COMPLETED)
+            elif not claimed:
+                waiters = [asyncio.ensure_future(stop.wait()), *in_flight]
+                await asyncio.wait(waiters, timeout=min(poll_seconds, renew_seconds),
+                                   return_when=asyncio.FIRST_COMPLETED)
+                waiters[0].cancel()
+    finally:
+        await asyncio.gather(*list(in_flight), return_exceptions=True)
+    logger.info("Analysis worker %s stopped after %s reports", worker_id, handled)
+    return handled
@@ -1,25 +1,73 @@
+import asyncio
 import logging
 import random
-from typing import Dict, Any
-from app.integrations import SummarizerAdapter, ClassifierAdapter, WeatherAdapter, GeoAdapter
+from typing import Dict, Any, Optional
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Base severity by disaster type - ADDED volcano with high severity.
+# app/services/rescoring.py applies the same rules vectorized; keep them in sync.
+TYPE_BASE_SCORES = {
+    "volcano": 85,  # ADDED: Volcano has high base severity
+    "earthquake": 70,
+    "fire": 65,
+    "flood": 60,
+    "storm": 55,
+    "other": 40
+}
+DEFAULT_BASE_SCORE = 40
+
+
+def calculate_base_severity(disaster_type: str, confidence: float) -> int:
+    """Base severity from disaster type adjusted by classifier confidence"""
+    base_score = TYPE_BASE_SCORES.get(disaster_type, DEFAULT_BASE_SCORE)
+
+    # Adjust by confidence
+    confidence_adjustment = int((confidence - 0.5) * 40)  # -20 to +20
+
+    # Ensure within bounds
+    return max(0, min(100, base_score + confidence_adjustment))
+
+
+def weather_adjustment(disaster_type: str, conditions: str, wind_speed: float) -> int:
+    """Severity adjustment for weather conditions relevant to the disaster type"""
+    conditions = (conditions or "").lower()
+    wind_speed = wind_speed or 0
+
+    if disaster_type == "flood" and any(cond in conditions for cond in ["rain", "storm"]):
+        return 15
+    elif disaster_type == "storm" and wind_speed > 15:
+        return 10
+    elif disaster_type == "fire" and "rain" in conditions:
+        return -10
+    # ADDED: Volcano severity adjustments
+    elif disaster_type == "volcano" and wind_speed > 10:
+        return 5  # Higher winds spread ash further
+    return 0
+
 
 class ReportAnalyzer:
     """Orchestrates AI adapters to analyze disaster reports"""
 
     def __init__(self):
+        from app.integrations import SummarizerAdapter, ClassifierAdapter, WeatherAdapter, GeoAdapter
         self.summarizer = SummarizerAdapter()
         self.classifier = ClassifierAdapter()
         self.weather = WeatherAdapter()
         self.geo = GeoAdapter()
 
-    async def analyze_report(self, text: str, lat: float, lon: float) -> Dict[str, Any]:
+    async def analyze_report(self, text: str, lat: float, lon: float,
+                             evidence: Optional[Dict[str, Dict[str, Any]]] = None,
+                             severity_variation: Optional[int] = None) -> Dict[str, Any]:
         """
         Analyze a disaster report using all AI adapters
 
+        Stage results passed in evidence are reused instead of calling their
+        adapter. Severity gets the random variation passed in, e.g. the one the
+        first analysis stored, so re-analysis reproduces the original score;
+        re-analysis without one adds none.
+
         Returns:
             Dict with analysis results including:
             - summary: str
@@ -28,14 +76,23 @@ class ReportAnalyzer:
             - location_name: str
             - evidence: Dict with raw adapter results
         """
-        logger.info(f"Starting analysis for report at ({lat}, {lon})")
+        logger.info("Starting analysis for report at (%s, %s)", lat, lon)
+        reanalysis = evidence is not None
+        evidence = dict(evidence or {})
 
         try:
-            # Run all adapters concurrently
-            summary_result = await self.summarizer.analyze(text)
-            classification_result = await self.classifier.analyze(text)
-            weather_result = await self.weather.analyze(lat, lon)
-            geo_result = await self.geo.analyze(lat, lon)
+            # Run the independent adapters that have no usable evidence concurrently
+            stages = {
+                "classifier": lambda: self.classifier.analyze(text),
+                "weather": lambda: self.weather.analyze(lat, lon),
+                "geo": lambda: self.geo.analyze(lat, lon),
+            }
+            missing = [stage for stage in stages if stage not in evidence]
+            results = await asyncio.gather(*(stages[stage]() for stage in missing))
+            evidence.update(zip(missing, results))
+            classification_result, weather_result, geo_result = (
+                evidence["classifier"], evidence["weather"], evidence["geo"]
+            )
 
             # Calculate severity score based on classification confidence and disaster type
             base_severity = self._calculate_severity(
@@ -43,17 +100,27 @@ class ReportAnalyzer:
                 classification_result["confidence"]
             )
 
-            # Adjust severity based on weather conditions if relevant
+            # Adjust severity based on weather conditions if relevant; the random variation
+            # is kept with the scoring inputs so rescoring reproduces the score
+            if severity_variation is None:
+                severity_variation = 0 if reanalysis else random.randint(-5, 5)
             adjusted_severity = self._adjust_severity_by_weather(
                 base_severity,
                 classification_result["disaster_type"],
-                weather_result
+                weather_result,
+                variation=severity_variation
             )
 
+            # Summarize last so the routing policy can use severity
+            summary_result = evidence.get("summarizer")
+            if summary_result is None:
+                summary_result = await self.summarizer.analyze(text, severity=adjusted_severity)
+
             result = {
                 "summary": summary_result["summary"],
                 "disaster_type": classification_result["disaster_type"],
                 "severity_score": adjusted_severity,
+                "severity_variation": severity_variation,
                 "location_name": geo_result["location_name"],
                 "evidence": {
                     "summarizer": summary_result,
@@ -63,59 +130,30 @@ class ReportAnalyzer:
                 }
             }
 
-            logger.info(f"Analysis completed: {classification_result['disaster_type']} "
-                        f"with severity {adjusted_severity}")
+            logger.info("Analysis completed: %s with severity %s",
+                        classification_result["disaster_type"], adjusted_severity)
 
             return result
 
         except Exception as e:
-            logger.error(f"Report analysis failed: {str(e)}")
+            logger.error("Report analysis failed: %s", e)
             # Return fallback result
             return self._get_fallback_result(text, lat, lon)
 
     def _calculate_severity(self, disaster_type: str, confidence: float) -> int:
         """Calculate base severity score"""
-        # Base severity by disaster type - ADDED volcano with high severity
-        type_base_scores = {
-            "volcano": 85,  # ADDED: Volcano has high base severity
-            "earthquake": 70,
-            "fire": 65,
-            "flood": 60,
-            "storm": 55,
-            "other": 40
-        }
-
-        base_score = type_base_scores.get(disaster_type, 40)
-
-        # Adjust by confidence
-        confidence_adjustment = int((confidence - 0.5) * 40)  # -20 to +20
-
-        severity = base_score + confidence_adjustment
-
-        # Ensure within bounds
-        return max(0, min(100, severity))
+        return calculate_base_severity(disaster_type, confidence)
 
     def _adjust_severity_by_weather(self, base_severity: int, disaster_type: str,
-                                    weather_data: Dict[str, Any]) -> int:
-        """Adjust severity based on weather conditions"""
-        adjustment = 0
-        conditions = weather_data.get("conditions", "").lower()
-        wind_speed = weather_data.get("wind_speed", 0)
-
-        if disaster_type == "flood" and any(cond in conditions for cond in ["rain", "storm"]):
-            adjustment += 15
-        elif disaster_type == "storm" and wind_speed > 15:
-            adjustment += 10
-        elif disaster_type == "fire" and "rain" in conditions:
-            adjustment -= 10
-        # ADDED: Volcano severity adjustments
-        elif disaster_type == "volcano" and wind_speed > 10:
-            adjustment += 5  # Higher winds spread ash further
-
-        # Add some random variation (±5) to make mock results more realistic
-        random_variation = random.randint(-5, 5)
-
-        final_severity = base_severity + adjustment + random_variation
+                                    weather_data: Dict[str, Any], variation: int = 0) -> int:
+        """Adjust severity based on weather conditions, plus the mock random variation (±5)"""
+        adjustment = weather_adjustment(
+            disaster_type,
+            weather_data.get("conditions", ""),
+            weather_data.get("wind_speed", 0)
+        )
+
+        final_severity = base_severity + adjustment + variation
         return max(0, min(100, final_severity))
 
     def _get_fallback_result(self, text: str, lat: float, lon: float) -> Dict[str, Any]:
@@ -134,10 +172,26 @@ class ReportAnalyzer:
         }
 
 
-# Global analyzer instance
-analyzer = ReportAnalyzer()
+# Global analyzer instance, built on first use so importing this module stays cheap
+_analyzer: Optional[ReportAnalyzer] = None
+
+
+def get_analyzer() -> ReportAnalyzer:
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = ReportAnalyzer()
+    return _analyzer
+
+
+def __getattr__(name):
+    # Keeps `from app.services.analyzer import analyzer` working
+    if name == "analyzer":
+        return get_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-async def analyze_report(text: str, lat: float, lon: float) -> Dict[str, Any]:
+async def analyze_report(text: str, lat: float, lon: float,
+                         evidence: Optional[Dict[str, Dict[str, Any]]] = None,
+                         severity_variation: Optional[int] = None) -> Dict[str, Any]:
     """Convenience function to analyze a report"""
-    return await analyzer.analyze_report(text, lat, lon)
\ No newline at end of file
+    return await get_analyzer().analyze_report(text, lat, lon, evidence, severity_variation)
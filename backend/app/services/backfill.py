@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import func
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.db.models import BackfillCheckpoint, Report
+from app.services.alerts import analysis_failed, apply_reanalysis
+from app.services.evidence import fresh_stages
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_INTERVAL_SECONDS = 10.0
+
+Outcome = Tuple[int, Optional[Dict[str, Any]]]
+
+
+def load_checkpoint(session: Session, name: str, start_id: int = 1, end_id: Optional[int] = None,
+                    restart: bool = False) -> BackfillCheckpoint:
+    """Checkpoint of a named run, created on first use; restart discards previous progress"""
+    checkpoint = session.get(BackfillCheckpoint, name)
+    if checkpoint is None:
+        checkpoint = BackfillCheckpoint(name=name)
+    elif not restart:
+        return checkpoint
+
+    checkpoint.last_id = max(start_id - 1, 0)
+    checkpoint.end_id = end_id
+    checkpoint.processed = checkpoint.failed = 0
+    checkpoint.started_at = checkpoint.updated_at = datetime.utcnow()
+    checkpoint.finished_at = None
+    session.add(checkpoint)
+    session.commit()
+    session.refresh(checkpoint)
+    return checkpoint
+
+
+def _in_range(query, last_id: int, end_id: Optional[int]):
+    # Unanalyzed reports belong to the live queue or an analysis worker; analyzing them here
+    # too would cluster them twice and open duplicate incidents
+    query = query.where(Report.id > last_id).where(Report.is_analyzed == True)
+    return query if end_id is None else query.where(Report.id <= end_id)
+
+
+def _pages(engine, last_id: int, end_id: Optional[int], page_size: int) -> Iterator[Sequence]:
+    """Keyset pagination over reports after last_id, one short-lived session per page"""
+    while True:
+        with Session(engine) as session:
+            rows = session.exec(
+                _in_range(select(Report.id, Report.text, Report.lat, Report.lon, Report.evidence,
+                                 Report.evidence_version, Report.severity_variation), last_id, end_id)
+                .order_by(Report.id)
+                .limit(page_size)
+            ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def _write_batch(engine, name: str, batch: List[Outcome]) -> int:
+    """Apply one batch of analyses and advance the checkpoint in the same transaction; returns failures"""
+    failed = 0
+    with Session(engine) as session:
+        ids = [report_id for report_id, _ in batch]
+        reports = {report.id: report for report in session.exec(select(Report).where(Report.id.in_(ids)))}
+        for report_id, analysis_result in batch:
+            report = reports.get(report_id)
+            if report is None or analysis_result is None or analysis_failed(analysis_result):
+                # Left as they were; stored evidence makes a later run over them cheap
+                failed += 1
+                continue
+            apply_reanalysis(session, report, analysis_result)
+
+        checkpoint = session.get(BackfillCheckpoint, name)
+        checkpoint.last_id = ids[-1]
+        checkpoint.processed += len(batch)
+        checkpoint.failed += failed
+        checkpoint.updated_at = datetime.utcnow()
+        session.add(checkpoint)
+        session.commit()
+    return failed
+
+
+async def run_backfill(engine, name: str = "default", start_id: int = 1, end_id: Optional[int] = None,
+                       concurrency: Optional[int] = None, batch_size: Optional[int] = None,
+                       force: bool = False, restart: bool = False) -> Dict[str, int]:
+    """
+    Re-run analysis over analyzed reports in id order, resuming from the named checkpoint.
+
+    Up to concurrency analyses are in flight at once; the adapters' adaptive
+    limits then hold each upstream at the rate it sustains. Results are
+    committed in id order, batch_size at a time, together with the
+    checkpoint, so a crash redoes at most the uncommitted tail. Stages with
+    fresh stored evidence are reused unless force is set.
+    """
+    from app.services.analyzer import analyze_report
+
+    concurrency = concurrency or settings.BACKFILL_CONCURRENCY
+    batch_size = batch_size or settings.BACKFILL_BATCH_SIZE
+
+    with Session(engine) as session:
+        checkpoint = load_checkpoint(session, name, start_id, end_id, restart)
+        last_id, end_id = checkpoint.last_id, checkpoint.end_id
+        if checkpoint.finished_at is not None:
+            logger.info("Backfill %s already finished at %s", name, checkpoint.finished_at)
+            return {"processed": 0, "failed": 0, "last_id": last_id}
+        remaining = session.exec(_in_range(select(func.count(Report.id)), last_id, end_id)).one()
+    logger.info("Backfill %s: %s reports after id %s", name, remaining, last_id)
+
+    stats = {"processed": 0, "failed": 0, "last_id": last_id}
+    slots = asyncio.Semaphore(concurrency)
+    dispatched: Deque[int] = deque()
+    completed: Dict[int, Optional[Dict[str, Any]]] = {}
+    ready: List[Outcome] = []
+    tasks: Set[asyncio.Task] = set()
+    started = last_logged = time.perf_counter()
+
+    async def analyze(report_id: int, text: str, lat: float, lon: float, evidence: Dict[str, Any],
+                      severity_variation: Optional[int]):
+        try:
+            completed[report_id] = await analyze_report(text, lat, lon, evidence=evidence,
+                                                        severity_variation=severity_variation)
+        except Exception as e:
+            logger.error("Backfill analysis of report %s failed: %s", report_id, e)
+            completed[report_id] = None
+        finally:
+            slots.release()
+
+    def flush(final: bool = False):
+        nonlocal last_logged
+        # Only the contiguous prefix of finished reports is committed, so the checkpoint never skips one
+        while dispatched and dispatched[0] in completed:
+            report_id = dispatched.popleft()
+            ready.append((report_id, completed.pop(report_id)))
+        while len(ready) >= batch_size or (final and ready):
+            batch = ready[:batch_size]
+            del ready[:batch_size]
+            stats["failed"] += _write_batch(engine, name, batch)
+            stats["processed"] += len(batch)
+            stats["last_id"] = batch[-1][0]
+
+        now = time.perf_counter()
+        if final or now - last_logged >= PROGRESS_INTERVAL_SECONDS:
+            last_logged = now
+            rate = stats["processed"] / max(now - started, 1e-9)
+            left = remaining - stats["processed"]
+            logger.info("Backfill %s: %s/%s reports (%s failed), %.1f reports/s, up to id %s, ~%.0fs left",
+                        name, stats["processed"], remaining, stats["failed"], rate, stats["last_id"],
+                        left / rate if rate else 0.0)
+
+    try:
+        for page in _pages(engine, last_id, end_id, batch_size):
+            for report_id, text, lat, lon, evidence, evidence_version, severity_variation in page:
+                await slots.acquire()
+                reused = {} if force else fresh_stages(evidence, evidence_version)
+                dispatched.append(report_id)
+                task = asyncio.create_task(analyze(report_id, text, lat, lon, reused, severity_variation))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                flush()
+
+        await asyncio.gather(*tasks)
+        flush(final=True)
+    finally:
+        # Analyses past the last committed batch are redone on resume
+        for task in list(tasks):
+            task.cancel()
+
+    with Session(engine) as session:
+        checkpoint = session.get(BackfillCheckpoint, name)
+        checkpoint.finished_at = datetime.utcnow()
+        session.add(checkpoint)
+        session.commit()
+    return stats
@@ -0,0 +1,182 @@
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import case, func, update
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.db.models import Alert, Report
+from app.services.alert_events import alert_changed, snapshot_alert
+
+logger = logging.getLogger(__name__)
+
+KM_PER_DEGREE = 111.32
+EARTH_RADIUS_KM = 6371.0
+
+
+def grid_cell(lat: float, lon: float, cell_km: float) -> Tuple[int, int]:
+    """Equirectangular grid cell of roughly cell_km x cell_km containing the point"""
+    y = lat * KM_PER_DEGREE
+    x = lon * KM_PER_DEGREE * math.cos(math.radians(lat))
+    return int(math.floor(x / cell_km)), int(math.floor(y / cell_km))
+
+
+def grid_cell_key(lat: float, lon: float, cell_km: Optional[float] = None) -> str:
+    x, y = grid_cell(lat, lon, cell_km or settings.CLUSTER_RADIUS_KM)
+    return f"{x}:{y}"
+
+
+def neighbour_cell_keys(lat: float, lon: float, cell_km: Optional[float] = None) -> List[str]:
+    """The point's cell and its 8 neighbours; with cell size = radius this covers the search circle"""
+    x, y = grid_cell(lat, lon, cell_km or settings.CLUSTER_RADIUS_KM)
+    return [f"{x + dx}:{y + dy}" for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def is_compatible(incident_type: str, report_type: str) -> bool:
+    """Same type, or one side is unclassified ("other")"""
+    return incident_type == report_type or "other" in (incident_type, report_type)
+
+
+def place_alert(alert: Alert, lat: float, lon: float, reported_at: datetime):
+    """Set an incident's centroid, grid cell and last report time"""
+    alert.lat = lat
+    alert.lon = lon
+    alert.grid_cell = grid_cell_key(lat, lon)
+    alert.last_report_at = reported_at
+
+
+def find_incident(session: Session, report: Report, disaster_type: str) -> Optional[Alert]:
+    """Nearest active, compatible incident within the clustering radius and time window"""
+    window = timedelta(minutes=settings.CLUSTER_WINDOW_MINUTES)
+    query = (
+        select(Alert)
+        .where(Alert.grid_cell.in_(neighbour_cell_keys(report.lat, report.lon)))
+        .where(Alert.is_active == True)
+        .where(Alert.last_report_at >= report.created_at - window)
+        .where(Alert.created_at <= report.created_at + window)
+    )
+
+    best, best_distance = None, None
+    for candidate in session.exec(query):
+        if not is_compatible(candidate.disaster_type, disaster_type):
+            continue
+        distance = haversine_km(candidate.lat, candidate.lon, report.lat, report.lon)
+        if distance <= settings.CLUSTER_RADIUS_KM and (best_distance is None or distance < best_distance):
+            best, best_distance = candidate, distance
+    return best
+
+
+def set_scoring_inputs(alert: Alert, analysis_result: Dict[str, Any]):
+    """Persist the inputs severity was derived from (see app/services/rescoring.py)"""
+    evidence = analysis_result.get("evidence", {})
+    classifier = evidence.get("classifier", {})
+    weather = evidence.get("weather", {})
+    alert.classifier_confidence = classifier.get("confidence")
+    alert.wind_speed = weather.get("wind_speed")
+    alert.weather_conditions = weather.get("conditions")
+    alert.severity_variation = analysis_result.get("severity_variation")
+
+
+def attach_report(session: Session, alert: Alert, report: Report, analysis_result: Dict[str, Any]):
+    """
+    O(1) incremental update of an incident with one more report.
+
+    The count and centroid are updated in one UPDATE against the stored row, so
+    concurrent attaches from several workers do not overwrite each other.
+    """
+    disaster_type = analysis_result["disaster_type"]
+    severity_score = analysis_result["severity_score"]
+
+    columns = Alert.__table__.c
+    count = func.coalesce(columns.report_count, 1)
+    report_count, lat, lon, last_report_at = session.execute(
+        update(Alert.__table__)
+        .where(columns.id == alert.id)
+        .values(
+            report_count=count + 1,
+            lat=(columns.lat * count + report.lat) / (count + 1),
+            lon=(columns.lon * count + report.lon) / (count + 1),
+            last_report_at=case((columns.last_report_at < report.created_at, report.created_at),
+                                else_=columns.last_report_at),
+        )
+        .returning(columns.report_count, columns.lat, columns.lon, columns.last_report_at)
+    ).one()
+    for name, value in (("report_count", report_count), ("lat", lat), ("lon", lon),
+                        ("last_report_at", last_report_at)):
+        set_committed_value(alert, name, value)
+    alert.grid_cell = grid_cell_key(lat, lon)
+
+    if severity_score >= alert.severity_score:
+        # The incident is scored by its most severe report
+        alert.severity_score = severity_score
+        set_scoring_inputs(alert, analysis_result)
+    if alert.disaster_type == "other" and disaster_type != "other":
+        alert.disaster_type = disaster_type
+        # Stored inputs were scored as "other"; rescoring needs the report that set the type
+        set_scoring_inputs(alert, analysis_result)
+    alert.updated_at = datetime.utcnow()
+
+
+def rescore_alert(alert: Alert, report: Report, analysis_result: Dict[str, Any]):
+    """Apply a re-analysed report to its incident; a multi-report incident keeps its most severe score"""
+    if alert.report_count <= 1 and alert.report_id == report.id:
+        alert.disaster_type = analysis_result["disaster_type"]
+        alert.severity_score = analysis_result["severity_score"]
+        alert.summary = analysis_result["summary"]
+        alert.location_name = analysis_result["location_name"]
+        set_scoring_inputs(alert, analysis_result)
+    else:
+        if analysis_result["severity_score"] >= alert.severity_score:
+            alert.severity_score = analysis_result["severity_score"]
+            set_scoring_inputs(alert, analysis_result)
+        if alert.disaster_type == "other" and analysis_result["disaster_type"] != "other":
+            alert.disaster_type = analysis_result["disaster_type"]
+            set_scoring_inputs(alert, analysis_result)
+    alert.updated_at = datetime.utcnow()
+
+
+def cluster_report(session: Session, report: Report, analysis_result: Dict[str, Any]) -> Tuple[Alert, bool]:
+    """
+    Attach an analyzed report to a matching incident or open a new one.
+
+    Returns the incident alert and whether it was newly created. The caller commits.
+    """
+    disaster_type = analysis_result["disaster_type"]
+
+    alert = find_incident(session, report, disaster_type) if settings.CLUSTERING_ENABLED else None
+    if alert is not None:
+        # Re-read under a row lock (Postgres) so the snapshot is not stale when other workers attach too
+        alert = session.exec(
+            select(Alert).where(Alert.id == alert.id).with_for_update().execution_options(populate_existing=True)
+        ).one()
+        before = snapshot_alert(alert)
+        attach_report(session, alert, report, analysis_result)
+        created = False
+    else:
+        alert = Alert(
+            report_id=report.id,
+            disaster_type=disaster_type,
+            severity_score=analysis_result["severity_score"],
+            summary=analysis_result["summary"],
+            location_name=analysis_result["location_name"],
+            source=report.source,
+        )
+        place_alert(alert, report.lat, report.lon, report.created_at)
+        set_scoring_inputs(alert, analysis_result)
+        before = None
+        created = True
+
+    session.add(alert)
+    session.flush()
+    report.alert_id = alert.id
+    alert_changed(session, before, snapshot_alert(alert))
+    return alert, created
@@ -0,0 +1,62 @@
+import json
+import zlib
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.db.models import Report
+
+# Layout of the stored blob; bump when the envelope itself changes
+EVIDENCE_FORMAT_VERSION = 1
+
+# Bump a stage's version when its adapter output or logic changes, so stored results are recomputed
+STAGE_VERSIONS = {
+    "summarizer": 1,
+    "classifier": 1,
+    "weather": 1,
+    "geo": 1,
+}
+
+
+def encode_evidence(evidence: Dict[str, Dict[str, Any]]) -> bytes:
+    """Compact, zlib-compressed JSON with the stage versions that produced each result; failed stages are dropped"""
+    evidence = {stage: result for stage, result in evidence.items() if result and "error" not in result}
+    payload = {
+        "versions": {stage: STAGE_VERSIONS.get(stage, 0) for stage in evidence},
+        "stages": evidence,
+    }
+    return zlib.compress(json.dumps(payload, separators=(",", ":"), default=str).encode(), 6)
+
+
+def decode_evidence(blob: Optional[bytes], format_version: Optional[int] = EVIDENCE_FORMAT_VERSION) -> Dict[str, Any]:
+    """Stored payload, or an empty one for missing or unreadable blobs"""
+    if not blob or format_version != EVIDENCE_FORMAT_VERSION:
+        return {"versions": {}, "stages": {}}
+    try:
+        return json.loads(zlib.decompress(blob))
+    except (zlib.error, ValueError):
+        return {"versions": {}, "stages": {}}
+
+
+def is_stale(stage: str, result: Optional[Dict[str, Any]], version: Optional[int]) -> bool:
+    """Missing, failed, produced by an older stage version, or a mock standing in for a real call"""
+    if not result or "error" in result:
+        return True
+    if version != STAGE_VERSIONS.get(stage):
+        return True
+    return result.get("source") == "mock" and not settings.USE_MOCK_AI
+
+
+def fresh_stages(blob: Optional[bytes], format_version: Optional[int] = EVIDENCE_FORMAT_VERSION) -> Dict[str, Dict[str, Any]]:
+    """Stage results that can be reused as-is"""
+    payload = decode_evidence(blob, format_version)
+    return {
+        stage: result
+        for stage, result in payload["stages"].items()
+        if not is_stale(stage, result, payload["versions"].get(stage))
+    }
+
+
+def store_evidence(report: Report, analysis_result: Dict[str, Any]):
+    """Persist analysis evidence, and the severity variation applied, on the report. The caller commits."""
+    report.evidence = encode_evidence(analysis_result["evidence"])
+    report.evidence_version = EVIDENCE_FORMAT_VERSION
+    report.severity_variation = analysis_result.get("severity_variation")
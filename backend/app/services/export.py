@@ -0,0 +1,127 @@
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.db.models import Report
+from app.schemas.alert import AlertFilter
+from app.services.alerts import alert_model, apply_alert_filter
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "geojson": "application/geo+json",
+}
+
+ALERT_COLUMNS = (
+    "id", "report_id", "disaster_type", "severity_score", "summary", "location_name", "lat", "lon",
+    "report_count", "source", "created_at", "is_active",
+)
+REPORT_COLUMNS = ("id", "text", "lat", "lon", "source", "created_at", "is_analyzed", "alert_id")
+
+
+def alert_export_query(alert_filter: AlertFilter):
+    model = alert_model(alert_filter)
+    query = (
+        select(
+            model.id, model.report_id, model.disaster_type, model.severity_score, model.summary,
+            model.location_name, func.coalesce(model.lat, Report.lat), func.coalesce(model.lon, Report.lon),
+            model.report_count, func.coalesce(model.source, Report.source), model.created_at, model.is_active,
+        )
+        .outerjoin(Report, model.report_id == Report.id)
+        .order_by(model.id)
+    )
+    query = apply_alert_filter(query, alert_filter)
+    if alert_filter.limit:
+        query = query.limit(alert_filter.limit)
+    return query
+
+
+def report_export_query(alert_filter: AlertFilter):
+    """Reports, filtered by the incident they were clustered into when any alert filter is set"""
+    query = select(
+        Report.id, Report.text, Report.lat, Report.lon, Report.source, Report.created_at,
+        Report.is_analyzed, Report.alert_id,
+    ).order_by(Report.id)
+    if alert_filter.active_only or alert_filter.type or alert_filter.min_severity is not None:
+        model = alert_model(alert_filter)
+        query = apply_alert_filter(query.join(model, Report.alert_id == model.id), alert_filter)
+    if alert_filter.limit:
+        query = query.limit(alert_filter.limit)
+    return query
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return getattr(value, "value", value)
+
+
+def _ndjson_chunk(columns: Sequence[str], rows: List[Sequence[Any]]) -> bytes:
+    lines = [json.dumps({column: _plain(value) for column, value in zip(columns, row)}) for row in rows]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _csv_writer() -> Callable[[List[Sequence[Any]]], bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def write(rows: List[Sequence[Any]]) -> bytes:
+        writer.writerows([[_plain(value) for value in row] for row in rows])
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk.encode()
+
+    return write
+
+
+def _feature(columns: Sequence[str], row: Sequence[Any]) -> str:
+    properties = {column: _plain(value) for column, value in zip(columns, row) if column not in ("lat", "lon")}
+    values = dict(zip(columns, row))
+    geometry = None
+    if values.get("lat") is not None and values.get("lon") is not None:
+        geometry = {"type": "Point", "coordinates": [values["lon"], values["lat"]]}
+    return json.dumps({"type": "Feature", "geometry": geometry, "properties": properties})
+
+
+def stream_export(query, columns: Sequence[str], export_format: str,
+                  chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Yield an export as byte chunks, one per batch fetched from a server-side cursor.
+
+    Uses its own connection so the request session is not held open, and never
+    materializes more than one batch.
+    """
+    from app.db.session import engine
+
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    write_csv = _csv_writer() if export_format == "csv" else None
+
+    # Headers go out before the query runs so the client sees bytes immediately
+    if export_format == "csv":
+        yield write_csv([columns])
+    elif export_format == "geojson":
+        yield b'{"type": "FeatureCollection", "features": ['
+
+    rows_written = 0
+    with engine.connect() as connection:
+        result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+        for rows in result.partitions(chunk_size):
+            if export_format == "csv":
+                yield write_csv(rows)
+            elif export_format == "geojson":
+                features = ",".join(_feature(columns, row) for row in rows)
+                yield (("," if rows_written else "") + features).encode()
+            else:
+                yield _ndjson_chunk(columns, rows)
+            rows_written += len(rows)
+
+    if export_format == "geojson":
+        yield b"]}"
+    logger.info("Exported %s rows as %s", rows_written, export_format)
@@ -0,0 +1,222 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import Integer, and_, cast, delete, func, literal, or_, select, update
+from sqlmodel import Session
+from app.core.config import settings
+from app.db.models import Alert, AlertGridCell
+from app.services.rollups import upsert_aggregate
+
+logger = logging.getLogger(__name__)
+
+# Precomputed resolutions; a level-L cell is 360 / 2**L degrees wide (level 12 is ~10 km)
+GRID_LEVELS = (2, 4, 6, 8, 10, 12)
+# Level picked for a map zoom is zoom + ZOOM_OFFSET, i.e. roughly 4 cells across a 256px tile
+ZOOM_OFFSET = 2
+
+_grid = AlertGridCell.__table__
+_KEY_COLUMNS = ("level", "cell_x", "cell_y", "is_active")
+
+
+def cell_size(level: int) -> float:
+    return 360.0 / (2 ** level)
+
+
+def cell_index(lat: float, lon: float, level: int) -> Tuple[int, int]:
+    size = cell_size(level)
+    return int((lon + 180.0) / size), int((lat + 90.0) / size)
+
+
+def level_for_zoom(zoom: int) -> int:
+    """Finest precomputed level not finer than the zoom calls for"""
+    wanted = zoom + ZOOM_OFFSET
+    candidates = [level for level in GRID_LEVELS if level <= wanted]
+    return candidates[-1] if candidates else GRID_LEVELS[0]
+
+
+def _keys(snapshot) -> List[Dict[str, Any]]:
+    if snapshot is None or snapshot.lat is None or snapshot.lon is None:
+        return []
+    keys = []
+    for level in GRID_LEVELS:
+        cell_x, cell_y = cell_index(snapshot.lat, snapshot.lon, level)
+        keys.append({"level": level, "cell_x": cell_x, "cell_y": cell_y, "is_active": snapshot.is_active})
+    return keys
+
+
+def _key_clause(key: Dict[str, Any]):
+    return and_(*[_grid.c[column] == key[column] for column in _KEY_COLUMNS])
+
+
+def _recompute_max(session: Session, key: Dict[str, Any], removed_severity: int):
+    """Recompute a cell's max from its alerts, only when the removed value may have been the max"""
+    size = cell_size(key["level"])
+    west = key["cell_x"] * size - 180.0
+    south = key["cell_y"] * size - 90.0
+    live_max = (
+        select(func.coalesce(func.max(Alert.severity_score), 0))
+        .where(Alert.lat >= south).where(Alert.lat < south + size)
+        .where(Alert.lon >= west).where(Alert.lon < west + size)
+        .where(Alert.is_active == key["is_active"])
+        .scalar_subquery()
+    )
+    session.execute(
+        update(_grid).where(_key_clause(key)).where(_grid.c.severity_max <= removed_severity)
+        .values(severity_max=live_max)
+    )
+
+
+def _record(session: Session, snapshot, key: Dict[str, Any]):
+    values = dict(key, alert_count=1, severity_sum=snapshot.severity_score, severity_max=snapshot.severity_score,
+                  lat_sum=snapshot.lat, lon_sum=snapshot.lon)
+    upsert_aggregate(session, _grid, _KEY_COLUMNS, values,
+                     summed=["alert_count", "severity_sum", "lat_sum", "lon_sum"], maxed=["severity_max"])
+
+
+def _retract(session: Session, snapshot, key: Dict[str, Any]):
+    session.execute(
+        update(_grid).where(_key_clause(key)).values(
+            alert_count=_grid.c.alert_count - 1,
+            severity_sum=_grid.c.severity_sum - snapshot.severity_score,
+            lat_sum=_grid.c.lat_sum - snapshot.lat,
+            lon_sum=_grid.c.lon_sum - snapshot.lon,
+        )
+    )
+    session.execute(delete(_grid).where(_key_clause(key)).where(_grid.c.alert_count <= 0))
+    _recompute_max(session, key, snapshot.severity_score)
+
+
+def apply_change(session: Session, before, after):
+    """Move an alert's contribution between grid cells at every level"""
+    before_keys = _keys(before)
+    after_keys = _keys(after)
+
+    for level_index in range(len(GRID_LEVELS)):
+        old = before_keys[level_index] if before_keys else None
+        new = after_keys[level_index] if after_keys else None
+
+        if old is not None and old == new:
+            # Same cell (e.g. centroid nudged by another report): adjust sums in place
+            session.execute(
+                update(_grid).where(_key_clause(new)).values(
+                    severity_sum=_grid.c.severity_sum + (after.severity_score - before.severity_score),
+                    lat_sum=_grid.c.lat_sum + (after.lat - before.lat),
+                    lon_sum=_grid.c.lon_sum + (after.lon - before.lon),
+                )
+            )
+            if after.severity_score < before.severity_score:
+                _recompute_max(session, new, before.severity_score)
+            elif after.severity_score > before.severity_score:
+                session.execute(
+                    update(_grid).where(_key_clause(new)).where(_grid.c.severity_max < after.severity_score)
+                    .values(severity_max=after.severity_score)
+                )
+            continue
+
+        if old is not None:
+            _retract(session, before, old)
+        if new is not None:
+            _record(session, after, new)
+
+
+def _cell_expression(session: Session, column, offset: float, size: float):
+    scaled = (column + offset) / size
+    if session.get_bind().dialect.name == "postgresql":
+        scaled = func.floor(scaled)
+    # Coordinates are offset to be non-negative, so truncation is floor
+    return cast(scaled, Integer)
+
+
+def rebuild_grid(session: Session):
+    """Recompute all grid cells from the alert table"""
+    session.execute(delete(_grid))
+    for level in GRID_LEVELS:
+        size = cell_size(level)
+        cell_x = _cell_expression(session, Alert.lon, 180.0, size)
+        cell_y = _cell_expression(session, Alert.lat, 90.0, size)
+        grouped = (
+            select(
+                literal(level), cell_x, cell_y, Alert.is_active,
+                func.count(), func.sum(Alert.severity_score), func.max(Alert.severity_score),
+                func.sum(Alert.lat), func.sum(Alert.lon),
+            )
+            .where(Alert.lat.is_not(None)).where(Alert.lon.is_not(None))
+            .group_by(cell_x, cell_y, Alert.is_active)
+        )
+        session.execute(_grid.insert().from_select(
+            list(_KEY_COLUMNS) + ["alert_count", "severity_sum", "severity_max", "lat_sum", "lon_sum"], grouped
+        ))
+    session.commit()
+    logger.info("Rebuilt alert grid cells")
+
+
+def ensure_grid(session: Session):
+    """Build grid cells once for databases that have placed alerts but no cells yet"""
+    has_cells = session.execute(select(_grid.c.id).limit(1)).first() is not None
+    has_alerts = session.execute(select(Alert.id).where(Alert.lat.is_not(None)).limit(1)).first() is not None
+    if has_alerts and not has_cells:
+        rebuild_grid(session)
+
+
+def _x_ranges(west: float, east: float, level: int) -> List[Tuple[int, int]]:
+    """Cell column ranges covering a longitude span, split when it crosses the antimeridian"""
+    last = 2 ** level - 1
+    if west > east:
+        return [(cell_index(0.0, west, level)[0], last), (0, cell_index(0.0, east, level)[0])]
+    return [(cell_index(0.0, west, level)[0], min(cell_index(0.0, east, level)[0], last))]
+
+
+def _cell_estimate(bbox: Tuple[float, float, float, float], level: int) -> int:
+    south, west, north, east = bbox
+    rows = cell_index(north, 0.0, level)[1] - cell_index(south, 0.0, level)[1] + 1
+    columns = sum(high - low + 1 for low, high in _x_ranges(west, east, level))
+    return rows * columns
+
+
+def get_grid_cells(session: Session, bbox: Tuple[float, float, float, float], zoom: int,
+                   active_only: bool = True, max_cells: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Alert counts per grid cell inside bbox (south, west, north, east).
+
+    The level follows the zoom and is coarsened until the bbox spans at most
+    max_cells cells, so the response size is bounded whatever the alert count.
+    """
+    max_cells = max_cells or settings.GRID_MAX_CELLS
+    level = level_for_zoom(zoom)
+    while level != GRID_LEVELS[0] and _cell_estimate(bbox, level) > max_cells:
+        level = GRID_LEVELS[GRID_LEVELS.index(level) - 1]
+
+    south, west, north, east = bbox
+    y_low, y_high = cell_index(south, 0.0, level)[1], cell_index(north, 0.0, level)[1]
+    x_clause = or_(*[_grid.c.cell_x.between(low, high) for low, high in _x_ranges(west, east, level)])
+
+    query = (
+        select(
+            _grid.c.cell_x, _grid.c.cell_y,
+            func.sum(_grid.c.alert_count), func.sum(_grid.c.severity_sum), func.max(_grid.c.severity_max),
+            func.sum(_grid.c.lat_sum), func.sum(_grid.c.lon_sum),
+        )
+        .where(_grid.c.level == level)
+        .where(_grid.c.cell_y.between(y_low, y_high))
+        .where(x_clause)
+        .group_by(_grid.c.cell_x, _grid.c.cell_y)
+        .having(func.sum(_grid.c.alert_count) > 0)
+        .limit(max_cells)
+    )
+    if active_only:
+        query = query.where(_grid.c.is_active == True)
+
+    size = cell_size(level)
+    cells = []
+    for cell_x, cell_y, count, severity_sum, severity_max, lat_sum, lon_sum in session.execute(query):
+        cell_south = cell_y * size - 90.0
+        cell_west = cell_x * size - 180.0
+        cells.append({
+            "lat": round(lat_sum / count, 5),
+            "lon": round(lon_sum / count, 5),
+            "bounds": [cell_south, cell_west, cell_south + size, cell_west + size],
+            "count": count,
+            "max_severity": severity_max,
+            "avg_severity": round(severity_sum / count, 1),
+        })
+
+    return {"level": level, "cell_size_deg": size, "cells": cells}
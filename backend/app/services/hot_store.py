@@ -0,0 +1,322 @@
+import asyncio
+import heapq
+import logging
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import event
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+from app.db.models import Alert, DisasterType, Report
+from app.schemas.alert import AlertFilter
+from app.services.alert_json import encode_alert
+
+logger = logging.getLogger(__name__)
+
+# Rows updated this long before the newest change already seen are read again on each sync,
+# so transactions that committed late are not missed
+SYNC_OVERLAP = timedelta(seconds=60)
+
+_sync_task: Optional[asyncio.Task] = None
+
+
+class HotAlert:
+    """One active alert in feed form; the fields of FrontendAlertResponse"""
+    FIELDS = ("id", "alert_type", "summary", "location", "lat", "lon", "severity",
+              "timestamp", "source", "report_count", "created_at", "updated_at")
+    __slots__ = FIELDS + ("_json",)
+
+    def __init__(self, alert: Alert, report: Report):
+        self.id = alert.id
+        self.alert_type = getattr(alert.disaster_type, "value", alert.disaster_type)
+        self.summary = alert.summary
+        self.location = alert.location_name
+        self.lat = alert.lat if alert.lat is not None else report.lat
+        self.lon = alert.lon if alert.lon is not None else report.lon
+        self.severity = alert.severity_score
+        self.timestamp = alert.created_at.isoformat()
+        self.source = report.source
+        self.report_count = alert.report_count
+        self.created_at = alert.created_at
+        self.updated_at = alert.updated_at
+        self._json: Optional[bytes] = None
+
+    @property
+    def json(self) -> bytes:
+        """Encoded on first read; a changed alert replaces its HotAlert, and the encoding with it"""
+        if self._json is None:
+            self._json = encode_alert(self)
+        return self._json
+
+    def same_as(self, other: "HotAlert") -> bool:
+        return all(getattr(self, name) == getattr(other, name) for name in self.FIELDS)
+
+    @property
+    def recency(self) -> Tuple[datetime, int]:
+        return self.created_at, self.id
+
+    @property
+    def rank(self) -> Tuple[int, datetime, int]:
+        return self.severity, self.created_at, self.id
+
+
+def _alert_type(value: str) -> Optional[str]:
+    """The disaster type value for a filter given by value or name, as the database accepts both"""
+    if value in DisasterType._value2member_map_:
+        return value
+    member = DisasterType.__members__.get(value)
+    return member.value if member is not None else None
+
+
+class HotAlertStore:
+    """
+    The newest active alerts, held in memory to answer the default feed without a query.
+
+    Alerts are kept in recency order, overall and per type, and in severity order
+    for selective min_severity filters. Every active alert not held is older than
+    all held ones, so a filtered feed is answered here whenever it finds limit
+    matches, or always while the store holds every active alert.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engine = None
+        self._capacity = 0
+        self._complete = False
+        self._watermark: Optional[datetime] = None
+        self._version = 0
+        self._dirty: Set[int] = set()
+        self._clear()
+
+    def _clear(self):
+        self._version += 1
+        self._alerts: Dict[int, HotAlert] = {}
+        self._recent: List[Tuple[datetime, int]] = []
+        self._recent_by_type: Dict[str, List[Tuple[datetime, int]]] = {}
+        self._ranked: List[Tuple[int, datetime, int]] = []
+        self._ranked_by_type: Dict[str, List[Tuple[int, datetime, int]]] = {}
+
+    @property
+    def engine(self):
+        """The engine the store was loaded from, or None while unloaded"""
+        return self._engine
+
+    @property
+    def version(self) -> int:
+        """Changes whenever the store does; read it before a query to key payloads built from the result"""
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def load(self, engine, capacity: Optional[int] = None):
+        """Fill the store with the newest active alerts and follow commits made through engine"""
+        capacity = capacity or settings.HOT_STORE_SIZE
+        with Session(engine) as session:
+            rows = session.exec(
+                select(Alert, Report)
+                .join(Report, Alert.report_id == Report.id)
+                .where(Alert.is_active == True)
+                .order_by(Alert.created_at.desc(), Alert.id.desc())
+                .limit(capacity + 1)
+            ).all()
+            watermark = session.exec(select(Alert.updated_at).order_by(Alert.updated_at.desc()).limit(1)).first()
+        with self._lock:
+            self._clear()
+            self._engine = engine
+            self._capacity = capacity
+            self._complete = len(rows) <= capacity
+            self._watermark = watermark
+            for alert, report in rows[:capacity]:
+                self._insert(HotAlert(alert, report))
+        logger.info("Hot alert store loaded %s active alerts%s", len(rows[:capacity]),
+                    "" if self._complete else " (newest only)")
+
+    def unload(self):
+        with self._lock:
+            self._engine = None
+            self._dirty = set()
+            self._clear()
+
+    def _insert(self, hot: HotAlert):
+        self._version += 1
+        self._alerts[hot.id] = hot
+        insort(self._recent, hot.recency)
+        insort(self._recent_by_type.setdefault(hot.alert_type, []), hot.recency)
+        insort(self._ranked, hot.rank)
+        insort(self._ranked_by_type.setdefault(hot.alert_type, []), hot.rank)
+
+    def _delete(self, alert_id: int):
+        hot = self._alerts.pop(alert_id, None)
+        if hot is None:
+            return
+        self._version += 1
+        for index, key in ((self._recent, hot.recency), (self._recent_by_type[hot.alert_type], hot.recency),
+                           (self._ranked, hot.rank), (self._ranked_by_type[hot.alert_type], hot.rank)):
+            del index[bisect_left(index, key)]
+
+    def _apply(self, alert: Alert, report: Report):
+        if not alert.is_active:
+            self._delete(alert.id)
+            return
+        hot = HotAlert(alert, report)
+        held = self._alerts.get(alert.id)
+        if held is not None and held.same_as(hot):
+            # Re-read by an overlapping sync; keep its encoding and the store version
+            return
+        self._delete(alert.id)
+        if not self._complete and self._recent and hot.recency < self._recent[0]:
+            # Older than everything held: newer alerts missing from the store would be skipped over
+            return
+        self._insert(hot)
+        if len(self._alerts) > self._capacity:
+            self._delete(self._recent[0][1])
+            self._complete = False
+
+    def mark_dirty(self, alert_ids: Iterable[int]):
+        """Note alerts changed by a local commit; the next sync re-reads them"""
+        with self._lock:
+            self._dirty.update(alert_ids)
+
+    def refresh(self, alert_ids: Iterable[int]):
+        """Re-read alerts after a commit: active ones are (re)placed, inactive or deleted ones dropped"""
+        alert_ids = set(alert_ids)
+        engine = self._engine
+        if engine is None or not alert_ids:
+            return
+        with Session(engine) as session:
+            rows = session.exec(
+                select(Alert, Report)
+                .join(Report, Alert.report_id == Report.id)
+                .where(Alert.id.in_(alert_ids))
+            ).all()
+        with self._lock:
+            for alert, report in rows:
+                self._apply(alert, report)
+            for alert_id in alert_ids - {alert.id for alert, _ in rows}:
+                self._delete(alert_id)
+
+    def sync(self):
+        """Apply alerts changed since the last sync, by local commits and by other processes"""
+        engine = self._engine
+        if engine is None:
+            return
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        if not self._complete and len(self._alerts) < self._capacity // 2:
+            # Deactivations have thinned out a partial store; refill it
+            self.load(engine, self._capacity)
+            return
+        # Covers alerts the delta below misses: deleted ones, or changes that left updated_at alone
+        self.refresh(dirty)
+        with Session(engine) as session:
+            query = select(Alert, Report).join(Report, Alert.report_id == Report.id)
+            if self._watermark is not None:
+                query = query.where(Alert.updated_at >= self._watermark - SYNC_OVERLAP)
+            rows = session.exec(query.order_by(Alert.updated_at)).all()
+        if not rows:
+            return
+        with self._lock:
+            for alert, report in rows:
+                self._apply(alert, report)
+            self._watermark = max(filter(None, (self._watermark, rows[-1][0].updated_at)))
+
+    def query(self, alert_filter: AlertFilter) -> Optional[List[HotAlert]]:
+        """The feed for this filter newest first, or None if it must come from the database"""
+        if self._engine is None or not alert_filter.active_only or alert_filter.archived:
+            return None
+        with self._lock:
+            result = self._query(alert_filter)
+        record_cache_lookup("hot_alerts", result is not None)
+        return result
+
+    def _query(self, alert_filter: AlertFilter) -> Optional[List[HotAlert]]:
+        if alert_filter.type:
+            alert_type = _alert_type(alert_filter.type)
+            if alert_type is None:
+                return []
+            recent = self._recent_by_type.get(alert_type, [])
+            ranked = self._ranked_by_type.get(alert_type, [])
+        else:
+            recent, ranked = self._recent, self._ranked
+
+        limit = alert_filter.limit or len(recent)
+        min_severity = alert_filter.min_severity
+        if min_severity is None:
+            keys = recent[:-limit - 1:-1] if limit else []
+        else:
+            start = bisect_left(ranked, (min_severity,))
+            matching = len(ranked) - start
+            # Scanning by recency reads about limit * len / matching alerts before it has limit matches
+            if matching * matching < limit * len(recent):
+                keys = heapq.nlargest(limit, ((created_at, alert_id)
+                                              for _, created_at, alert_id in ranked[start:]))
+            else:
+                keys = []
+                for key in reversed(recent):
+                    if self._alerts[key[1]].severity >= min_severity:
+                        keys.append(key)
+                        if len(keys) == limit:
+                            break
+
+        if not self._complete and (alert_filter.limit is None or len(keys) < alert_filter.limit):
+            # Older active alerts outside the store may match
+            return None
+        return [self._alerts[alert_id] for _, alert_id in keys]
+
+
+hot_alerts = HotAlertStore()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_alert_changes(session, flush_context):
+    if hot_alerts.engine is not None and session.bind is hot_alerts.engine:
+        changed = session.info.setdefault("hot_alert_ids", set())
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            if isinstance(instance, Alert):
+                changed.add(instance.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_alert_changes(session):
+    # Only recorded here: a re-read would add a query to every write, on the committing thread
+    changed = session.info.pop("hot_alert_ids", None)
+    if changed:
+        hot_alerts.mark_dirty(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_alert_changes(session):
+    session.info.pop("hot_alert_ids", None)
+
+
+async def _sync_loop(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(hot_alerts.sync)
+        except Exception as e:
+            logger.error("Hot alert store sync failed: %s", e)
+
+
+def start_hot_store(engine):
+    """Load the store and keep it in step with alerts written by other processes"""
+    global _sync_task
+    hot_alerts.load(engine)
+    if _sync_task is None or _sync_task.done():
+        _sync_task = asyncio.get_running_loop().create_task(_sync_loop(settings.HOT_STORE_SYNC_SECONDS))
+
+
+async def stop_hot_store():
+    global _sync_task
+    task, _sync_task = _sync_task, None
+    hot_alerts.unload()
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
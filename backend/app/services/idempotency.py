@@ -0,0 +1,71 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.db.models import IdempotencyKey, Report
+from app.schemas.report import ReportCreate
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used for a different report"""
+
+
+def request_fingerprint(report_data: ReportCreate) -> str:
+    body = json.dumps([report_data.text, report_data.lat, report_data.lon, report_data.source])
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def find_replay(session: Session, source: str, key: str, fingerprint: str,
+                now: Optional[datetime] = None) -> Optional[IdempotencyKey]:
+    """The entry holding the response first returned for this key, if it is still remembered"""
+    now = now or datetime.utcnow()
+    entry = session.exec(
+        select(IdempotencyKey)
+        .where(IdempotencyKey.source == source)
+        .where(IdempotencyKey.key == key)
+    ).first()
+    if entry is None:
+        return None
+    if entry.expires_at <= now:
+        # Not swept yet; free the key for this request
+        session.delete(entry)
+        session.flush()
+        return None
+    if entry.request_hash != fingerprint:
+        raise IdempotencyConflict(key)
+    return entry
+
+
+def remember_key(session: Session, source: str, key: str, fingerprint: str, report: Report, status: str,
+                 response_body: str, response_status: int = 200):
+    """
+    Record the key with the report it created and the response returned for it.
+
+    The caller commits; a concurrent duplicate fails the unique index.
+    """
+    now = datetime.utcnow()
+    session.add(IdempotencyKey(
+        source=source, key=key, request_hash=fingerprint, report_id=report.id, status=status,
+        response_body=response_body, response_status=response_status, created_at=now, expires_at=now + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS),
+    ))
+
+
+def sweep_idempotency_keys(session: Session, now: Optional[datetime] = None,
+                           batch_size: Optional[int] = None) -> int:
+    """Delete expired keys, one committed batch at a time"""
+    now = now or datetime.utcnow()
+    batch_size = batch_size or settings.EXPIRY_BATCH_SIZE
+    table = IdempotencyKey.__table__
+    swept = 0
+    while True:
+        ids = session.exec(
+            select(IdempotencyKey.id).where(IdempotencyKey.expires_at <= now).limit(batch_size)
+        ).all()
+        if not ids:
+            return swept
+        session.execute(delete(table).where(table.c.id.in_(ids)))
+        session.commit()
+        swept += len(ids)
@@ -0,0 +1,84 @@
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from sqlalchemy import delete, insert, inspect, or_, select, update
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+from app.db.models import Lease
+
+logger = logging.getLogger(__name__)
+
+LEASE_POLL_SECONDS = 0.5
+
+_lease = Lease.__table__
+
+
+def process_identity() -> str:
+    """host:pid, unique among processes sharing the database"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def ensure_lease_table(engine):
+    """Create the lease table, tolerating another process creating it at the same moment"""
+    try:
+        _lease.create(engine, checkfirst=True)
+    except (OperationalError, ProgrammingError):
+        if not inspect(engine).has_table(_lease.name):
+            raise
+
+
+def acquire_lease(engine, name: str, ttl_seconds: float, holder: Optional[str] = None) -> bool:
+    """Take or renew a lease; succeeds if it is free, expired or already ours"""
+    holder = holder or process_identity()
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    with engine.begin() as conn:
+        renewed = conn.execute(
+            update(_lease)
+            .where(_lease.c.name == name)
+            .where(or_(_lease.c.holder == holder, _lease.c.expires_at < now))
+            .values(holder=holder, acquired_at=now, expires_at=expires_at)
+        ).rowcount
+    if renewed:
+        return True
+    try:
+        with engine.begin() as conn:
+            conn.execute(insert(_lease).values(name=name, holder=holder, acquired_at=now, expires_at=expires_at))
+        return True
+    except IntegrityError:
+        return False
+
+
+def release_lease(engine, name: str, holder: Optional[str] = None):
+    holder = holder or process_identity()
+    with engine.begin() as conn:
+        conn.execute(delete(_lease).where(_lease.c.name == name).where(_lease.c.holder == holder))
+
+
+def _lease_exists(engine, name: str) -> bool:
+    with engine.connect() as conn:
+        return conn.execute(select(_lease.c.name).where(_lease.c.name == name)).first() is not None
+
+
+def run_once(engine, name: str, work: Callable[[], None], ttl_seconds: float) -> bool:
+    """
+    Run work in exactly one of the processes starting together; returns whether this one ran it.
+
+    The others block until the leader releases the lease, so they never serve
+    before the schema exists. If the leader dies, its lease expires and a
+    waiting process takes the work over.
+    """
+    ensure_lease_table(engine)
+    while True:
+        if acquire_lease(engine, name, ttl_seconds):
+            try:
+                work()
+            finally:
+                release_lease(engine, name)
+            return True
+        logger.info("Waiting for another process to finish %s", name)
+        time.sleep(LEASE_POLL_SECONDS)
+        if not _lease_exists(engine, name):
+            return False
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import delete, insert, literal
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.db.models import Alert, AlertArchive, DisasterType
+from app.services.alert_events import alert_changed, snapshot_alert
+from app.services.alerts import deactivate_alert
+from app.services.idempotency import sweep_idempotency_keys
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_HOURS = 24.0
+
+_scheduler_task: Optional[asyncio.Task] = None
+
+
+def parse_ttl_hours(spec: str) -> Dict[str, float]:
+    """Parse "storm=24,earthquake=72" into hours per disaster type"""
+    ttls = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        disaster_type, hours = item.split("=", 1)
+        ttls[disaster_type.strip()] = float(hours)
+    return ttls
+
+
+def expire_alerts(session: Session, now: Optional[datetime] = None, batch_size: Optional[int] = None) -> int:
+    """Deactivate alerts with no new reports within their type's TTL, one committed batch at a time"""
+    now = now or datetime.utcnow()
+    batch_size = batch_size or settings.EXPIRY_BATCH_SIZE
+    ttls = parse_ttl_hours(settings.ALERT_TTL_HOURS)
+    expired = 0
+
+    for disaster_type in DisasterType:
+        cutoff = now - timedelta(hours=ttls.get(disaster_type.value, DEFAULT_TTL_HOURS))
+        query = (
+            select(Alert)
+            .where(Alert.is_active == True)
+            .where(Alert.disaster_type == disaster_type)
+            .where(Alert.last_report_at < cutoff)
+            .order_by(Alert.id)
+            .limit(batch_size)
+        )
+        while True:
+            alerts = session.exec(query).all()
+            if not alerts:
+                break
+            for alert in alerts:
+                deactivate_alert(session, alert)
+            session.commit()
+            expired += len(alerts)
+
+    return expired
+
+
+def archive_alerts(session: Session, now: Optional[datetime] = None, batch_size: Optional[int] = None) -> int:
+    """Move inactive alerts untouched for ARCHIVE_AFTER_HOURS into the archive table in batches"""
+    now = now or datetime.utcnow()
+    batch_size = batch_size or settings.EXPIRY_BATCH_SIZE
+    cutoff = now - timedelta(hours=settings.ARCHIVE_AFTER_HOURS)
+    alert_table = Alert.__table__
+    columns = [column.name for column in alert_table.columns]
+    archived = 0
+
+    query = (
+        select(Alert)
+        .where(Alert.is_active == False)
+        .where(Alert.updated_at < cutoff)
+        .order_by(Alert.id)
+        .limit(batch_size)
+    )
+    while True:
+        alerts = session.exec(query).all()
+        if not alerts:
+            break
+        ids = [alert.id for alert in alerts]
+        snapshots = [snapshot_alert(alert) for alert in alerts]
+        for alert in alerts:
+            session.expunge(alert)
+
+        session.execute(insert(AlertArchive.__table__).from_select(
+            columns + ["archived_at"],
+            select(*[alert_table.c[name] for name in columns], literal(now)).where(alert_table.c.id.in_(ids)),
+        ))
+        session.execute(delete(alert_table).where(alert_table.c.id.in_(ids)))
+
+        # Aggregates cover the hot table only
+        for snapshot in snapshots:
+            alert_changed(session, snapshot, None)
+        session.commit()
+        archived += len(ids)
+
+    return archived
+
+
+def run_maintenance() -> Dict[str, int]:
+    """One expiry, archival and key sweep pass, skipped while another process holds the lease"""
+    from app.db.session import engine
+    from app.services.leases import acquire_lease
+
+    # The holder renews every interval; another process takes over once it stops
+    if not acquire_lease(engine, "maintenance", 2 * settings.EXPIRY_INTERVAL_SECONDS):
+        return {"expired": 0, "archived": 0, "keys_swept": 0}
+
+    with Session(engine) as session:
+        expired = expire_alerts(session)
+        archived = archive_alerts(session)
+        keys_swept = sweep_idempotency_keys(session)
+    if expired or archived or keys_swept:
+        logger.info("Maintenance expired %s alerts, archived %s and swept %s idempotency keys",
+                    expired, archived, keys_swept)
+    return {"expired": expired, "archived": archived, "keys_swept": keys_swept}
+
+
+async def _maintenance_loop(interval: float):
+    while True:
+        try:
+            # Runs in a worker thread so batches never block request handling
+            await asyncio.to_thread(run_maintenance)
+        except Exception as e:
+            logger.error("Maintenance pass failed: %s", e)
+        await asyncio.sleep(interval)
+
+
+def start_scheduler():
+    """Start the periodic maintenance task on the running event loop"""
+    global _scheduler_task
+    if _scheduler_task is not None and not _scheduler_task.done():
+        return
+    _scheduler_task = asyncio.get_running_loop().create_task(_maintenance_loop(settings.EXPIRY_INTERVAL_SECONDS))
+
+
+async def stop_scheduler():
+    global _scheduler_task
+    task, _scheduler_task = _scheduler_task, None
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
@@ -0,0 +1,127 @@
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+import numpy as np
+from sqlalchemy import bindparam, update
+from sqlmodel import Session, select
+from app.db.models import Alert
+from app.services.alert_events import rebuild_aggregates
+from app.services.analyzer import (
+    TYPE_BASE_SCORES, DEFAULT_BASE_SCORE, calculate_base_severity, weather_adjustment
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def _per_unique(values: Sequence, func) -> np.ndarray:
+    """Evaluate func once per distinct value and broadcast back to all rows"""
+    uniques, inverse = np.unique(np.asarray(values, dtype=object).astype(str), return_inverse=True)
+    return np.array([func(value) for value in uniques])[inverse] if len(uniques) else np.zeros(0)
+
+
+def score_severity_vectorized(disaster_types: Sequence[str], confidences: np.ndarray,
+                              conditions: Sequence[str], wind_speeds: np.ndarray,
+                              variations: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Vectorized equivalent of calculate_base_severity + weather_adjustment
+    plus the stored random variation the analyzer applied
+    """
+    confidences = np.asarray(confidences, dtype=np.float64)
+    wind_speeds = np.nan_to_num(np.asarray(wind_speeds, dtype=np.float64), nan=0.0)
+
+    types = np.asarray(disaster_types, dtype=object).astype(str)
+    base = _per_unique(types, lambda t: TYPE_BASE_SCORES.get(t, DEFAULT_BASE_SCORE)).astype(np.int64)
+    # int() truncates toward zero, as in calculate_base_severity
+    base = np.clip(base + np.trunc((confidences - 0.5) * 40).astype(np.int64), 0, 100)
+
+    lowered = np.char.lower(np.asarray(conditions, dtype=object).astype(str))
+    has_rain = _per_unique(lowered, lambda c: "rain" in c).astype(bool)
+    has_storm = _per_unique(lowered, lambda c: "storm" in c).astype(bool)
+
+    adjustment = np.select(
+        [
+            (types == "flood") & (has_rain | has_storm),
+            (types == "storm") & (wind_speeds > 15),
+            (types == "fire") & has_rain,
+            (types == "volcano") & (wind_speeds > 10),
+        ],
+        [15, 10, -10, 5],
+        default=0,
+    )
+    if variations is not None:
+        adjustment = adjustment + np.asarray(variations, dtype=np.int64)
+    return np.clip(base + adjustment, 0, 100)
+
+
+def score_severity(disaster_type: str, confidence: float, conditions: str, wind_speed: float,
+                   variation: int = 0) -> int:
+    """Scalar reference used by tests and callers that score a single alert"""
+    severity = calculate_base_severity(disaster_type, confidence) + weather_adjustment(
+        disaster_type, conditions, wind_speed
+    ) + variation
+    return max(0, min(100, severity))
+
+
+def rescore_alerts(session: Session, chunk_size: int = DEFAULT_CHUNK_SIZE, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Recompute severity for every alert with stored scoring inputs.
+
+    Alerts are read column-wise in id-ordered chunks, scored with NumPy and
+    changed scores are written back with one executemany UPDATE per chunk.
+    Archived alerts keep the severity they expired with and are not rescored.
+    """
+    stats = {"scanned": 0, "changed": 0}
+    last_id = 0
+    started = time.perf_counter()
+
+    update_stmt = (
+        update(Alert.__table__)
+        .where(Alert.__table__.c.id == bindparam("b_id"))
+        .values(severity_score=bindparam("b_score"), updated_at=bindparam("b_updated_at"))
+    )
+
+    while True:
+        rows = session.exec(
+            select(Alert.id, Alert.disaster_type, Alert.classifier_confidence,
+                   Alert.weather_conditions, Alert.wind_speed, Alert.severity_variation, Alert.severity_score)
+            .where(Alert.id > last_id)
+            .where(Alert.classifier_confidence != None)
+            .order_by(Alert.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+
+        ids, types, confidences, conditions, wind_speeds, variations, current = zip(*rows)
+        types = [t.value if hasattr(t, "value") else t for t in types]
+        conditions = [c or "" for c in conditions]
+        wind_speeds = [w if w is not None else np.nan for w in wind_speeds]
+        variations = [v or 0 for v in variations]
+
+        new_scores = score_severity_vectorized(types, np.array(confidences), conditions, np.array(wind_speeds),
+                                               np.array(variations))
+        ids = np.asarray(ids, dtype=np.int64)
+        changed = new_scores != np.asarray(current, dtype=np.int64)
+
+        if changed.any() and not dry_run:
+            now = datetime.utcnow()
+            session.execute(update_stmt, [
+                {"b_id": int(alert_id), "b_score": int(score), "b_updated_at": now}
+                for alert_id, score in zip(ids[changed], new_scores[changed])
+            ])
+            session.commit()
+
+        stats["scanned"] += len(rows)
+        stats["changed"] += int(changed.sum())
+        last_id = int(ids[-1])
+        logger.info("Rescored %s alerts (%s changed) in %.1fs",
+                    stats["scanned"], stats["changed"], time.perf_counter() - started)
+
+    if stats["changed"] and not dry_run:
+        # Severity moved; aggregates are cheaper to rebuild than to patch per alert
+        rebuild_aggregates(session)
+
+    return stats
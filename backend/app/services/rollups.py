@@ -0,0 +1,273 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import and_, case, delete, func, literal_column, select, update
+from sqlmodel import Session
+from app.db.models import Alert, AlertRollup
+from app.schemas.alert import AlertFilter
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_BUCKET_WIDTH = 10
+GROUP_BY_DIMENSIONS = ("disaster_type", "severity_bucket", "source", "hour")
+
+_rollup = AlertRollup.__table__
+_KEY_COLUMNS = ("bucket_start", "disaster_type", "severity_bucket", "source", "is_active")
+
+
+def severity_bucket(score: int) -> int:
+    """Lower bound of the 10-point band; 100 falls in the 90 band"""
+    return min(score // SEVERITY_BUCKET_WIDTH, 9) * SEVERITY_BUCKET_WIDTH
+
+
+def hour_bucket(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _key(snapshot) -> Dict[str, Any]:
+    return {
+        "bucket_start": hour_bucket(snapshot.created_at),
+        "disaster_type": snapshot.disaster_type,
+        "severity_bucket": severity_bucket(snapshot.severity_score),
+        "source": snapshot.source,
+        "is_active": snapshot.is_active,
+    }
+
+
+def _key_clause(key: Dict[str, Any]):
+    return and_(*[_rollup.c[column] == key[column] for column in _KEY_COLUMNS])
+
+
+def _dialect(session: Session) -> str:
+    return session.get_bind().dialect.name
+
+
+def upsert_aggregate(session: Session, table, key_columns, values: Dict[str, Any],
+                     summed: List[str], maxed: List[str]):
+    """Insert an aggregate row or fold values into the existing one in a single atomic statement"""
+    dialect = _dialect(session)
+
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+            greatest = func.max
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+            greatest = func.greatest
+        stmt = insert(table).values(**values)
+        updates = {column: table.c[column] + stmt.excluded[column] for column in summed}
+        updates.update({column: greatest(table.c[column], stmt.excluded[column]) for column in maxed})
+        session.execute(stmt.on_conflict_do_update(index_elements=list(key_columns), set_=updates))
+        return
+
+    # Generic fallback for other databases
+    key_clause = and_(*[table.c[column] == values[column] for column in key_columns])
+    existing = session.execute(select(table.c.id).where(key_clause)).first()
+    if existing is None:
+        session.execute(table.insert().values(**values))
+        return
+    updates = {column: table.c[column] + values[column] for column in summed}
+    updates.update({
+        column: case((table.c[column] < values[column], values[column]), else_=table.c[column])
+        for column in maxed
+    })
+    session.execute(update(table).where(table.c.id == existing.id).values(**updates))
+
+
+def _record(session: Session, snapshot):
+    values = dict(_key(snapshot), alert_count=1, report_count=snapshot.report_count,
+                  severity_sum=snapshot.severity_score, severity_max=snapshot.severity_score)
+    upsert_aggregate(session, _rollup, _KEY_COLUMNS, values,
+                     summed=["alert_count", "report_count", "severity_sum"], maxed=["severity_max"])
+
+
+def _recompute_max(session: Session, key: Dict[str, Any], removed_severity: int):
+    """Max cannot be decremented; recompute it from the bucket's alerts when the removed value may have been it"""
+    low = key["severity_bucket"]
+    high = low + SEVERITY_BUCKET_WIDTH if low < 90 else 101
+    live_max = (
+        select(func.coalesce(func.max(Alert.severity_score), 0))
+        .where(Alert.created_at >= key["bucket_start"])
+        .where(Alert.created_at < key["bucket_start"] + timedelta(hours=1))
+        .where(Alert.disaster_type == key["disaster_type"])
+        .where(Alert.severity_score >= low)
+        .where(Alert.severity_score < high)
+        .where(func.coalesce(Alert.source, "unknown") == key["source"])
+        .where(Alert.is_active == key["is_active"])
+        .scalar_subquery()
+    )
+    session.execute(
+        update(_rollup).where(_key_clause(key)).where(_rollup.c.severity_max <= removed_severity)
+        .values(severity_max=live_max)
+    )
+
+
+def _retract(session: Session, snapshot):
+    key = _key(snapshot)
+    session.execute(
+        update(_rollup).where(_key_clause(key)).values(
+            alert_count=_rollup.c.alert_count - 1,
+            report_count=_rollup.c.report_count - snapshot.report_count,
+            severity_sum=_rollup.c.severity_sum - snapshot.severity_score,
+        )
+    )
+    session.execute(delete(_rollup).where(_key_clause(key)).where(_rollup.c.alert_count <= 0))
+    _recompute_max(session, key, snapshot.severity_score)
+
+
+def apply_change(session: Session, before, after):
+    """Move an alert's contribution from its old rollup key to its new one"""
+    if before is not None and after is not None and _key(before) == _key(after):
+        # Same bucket (e.g. another report attached): adjust sums in place
+        key = _key(after)
+        session.execute(
+            update(_rollup).where(_key_clause(key)).values(
+                report_count=_rollup.c.report_count + (after.report_count - before.report_count),
+                severity_sum=_rollup.c.severity_sum + (after.severity_score - before.severity_score),
+            )
+        )
+        if after.severity_score < before.severity_score:
+            _recompute_max(session, key, before.severity_score)
+        elif after.severity_score > before.severity_score:
+            session.execute(
+                update(_rollup).where(_key_clause(key)).where(_rollup.c.severity_max < after.severity_score)
+                .values(severity_max=after.severity_score)
+            )
+        return
+
+    if before is not None:
+        _retract(session, before)
+    if after is not None:
+        _record(session, after)
+
+
+def _hour_expression(session: Session, column):
+    if _dialect(session) == "postgresql":
+        return func.date_trunc("hour", column)
+    return func.strftime("%Y-%m-%d %H:00:00.000000", column)
+
+
+def _severity_bucket_expression(column):
+    return case((column >= 90, 90), else_=(column // SEVERITY_BUCKET_WIDTH) * SEVERITY_BUCKET_WIDTH)
+
+
+def rebuild_rollups(session: Session):
+    """Recompute all rollups from the alert table (after seeding, rescoring or schema upgrades)"""
+    source = func.coalesce(Alert.source, "unknown")
+    bucket = _severity_bucket_expression(Alert.severity_score)
+    hour = _hour_expression(session, Alert.created_at)
+    grouped = (
+        select(
+            hour, Alert.disaster_type, bucket, source, Alert.is_active,
+            func.count(), func.sum(func.coalesce(Alert.report_count, 1)),
+            func.sum(Alert.severity_score), func.max(Alert.severity_score),
+        )
+        .group_by(hour, Alert.disaster_type, bucket, source, Alert.is_active)
+    )
+    session.execute(delete(_rollup))
+    session.execute(_rollup.insert().from_select(
+        list(_KEY_COLUMNS) + ["alert_count", "report_count", "severity_sum", "severity_max"], grouped
+    ))
+    session.commit()
+    logger.info("Rebuilt alert rollups")
+
+
+def ensure_rollups(session: Session):
+    """Build rollups once for databases that have alerts but no rollups yet"""
+    has_rollups = session.execute(select(_rollup.c.id).limit(1)).first() is not None
+    has_alerts = session.execute(select(Alert.id).limit(1)).first() is not None
+    if has_alerts and not has_rollups:
+        rebuild_rollups(session)
+
+
+def _parse_hour(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def get_alert_stats(session: Session, alert_filter: AlertFilter, group_by: List[str],
+                    since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Alert counts and severity per group.
+
+    Served from rollups when the filters line up with rollup buckets (min_severity
+    on a 10-point boundary up to 90, since/until on the hour); otherwise aggregated live.
+    """
+    min_severity = alert_filter.min_severity
+    aligned = (
+        # The 90 band also holds 100, so thresholds above 90 split a bucket
+        (min_severity is None or (min_severity % SEVERITY_BUCKET_WIDTH == 0 and min_severity <= severity_bucket(100)))
+        and all(value is None or value == hour_bucket(value) for value in (since, until))
+    )
+
+    if aligned:
+        dimensions = {
+            "disaster_type": _rollup.c.disaster_type,
+            "severity_bucket": _rollup.c.severity_bucket,
+            "source": _rollup.c.source,
+            "hour": _rollup.c.bucket_start,
+        }
+        measures = [
+            func.sum(_rollup.c.alert_count), func.sum(_rollup.c.report_count),
+            func.sum(_rollup.c.severity_sum), func.max(_rollup.c.severity_max),
+        ]
+        conditions = []
+        if alert_filter.active_only:
+            conditions.append(_rollup.c.is_active == True)
+        if alert_filter.type:
+            conditions.append(_rollup.c.disaster_type == alert_filter.type)
+        if alert_filter.min_severity is not None:
+            conditions.append(_rollup.c.severity_bucket >= alert_filter.min_severity)
+        if since is not None:
+            conditions.append(_rollup.c.bucket_start >= since)
+        if until is not None:
+            conditions.append(_rollup.c.bucket_start < until)
+    else:
+        dimensions = {
+            "disaster_type": Alert.disaster_type,
+            "severity_bucket": _severity_bucket_expression(Alert.severity_score),
+            "source": func.coalesce(Alert.source, "unknown"),
+            "hour": _hour_expression(session, Alert.created_at),
+        }
+        measures = [
+            func.count(), func.sum(func.coalesce(Alert.report_count, 1)),
+            func.sum(Alert.severity_score), func.max(Alert.severity_score),
+        ]
+        conditions = []
+        if alert_filter.active_only:
+            conditions.append(Alert.is_active == True)
+        if alert_filter.type:
+            conditions.append(Alert.disaster_type == alert_filter.type)
+        if alert_filter.min_severity is not None:
+            conditions.append(Alert.severity_score >= alert_filter.min_severity)
+        if since is not None:
+            conditions.append(Alert.created_at >= since)
+        if until is not None:
+            conditions.append(Alert.created_at < until)
+
+    group_columns = [dimensions[name].label(name) for name in group_by]
+    alert_count = measures[0].label("alert_count")
+    query = select(*group_columns, alert_count, *measures[1:]).where(*conditions)
+    if group_columns:
+        query = query.group_by(*[dimensions[name] for name in group_by])
+    query = query.having(measures[0] > 0).order_by(literal_column("alert_count").desc())
+    if alert_filter.limit:
+        query = query.limit(alert_filter.limit)
+
+    buckets = []
+    for row in session.execute(query):
+        values = dict(zip(group_by, row[:len(group_by)]))
+        count, reports, severity_sum, severity_max = row[len(group_by):]
+        if "disaster_type" in values:
+            values["disaster_type"] = getattr(values["disaster_type"], "value", values["disaster_type"])
+        if "hour" in values:
+            values["hour"] = _parse_hour(values["hour"])
+        values.update(
+            alert_count=count,
+            report_count=reports or 0,
+            avg_severity=round(severity_sum / count, 1),
+            max_severity=severity_max,
+        )
+        buckets.append(values)
+    return buckets
@@ -0,0 +1,201 @@
+import logging
+import re
+from typing import Any, Dict, List, Optional
+from sqlalchemy import and_, column, func, inspect, literal_column, or_, select, table
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session
+from app.core.config import settings
+from app.db.models import Alert, Report
+from app.schemas.alert import AlertFilter
+from app.services.alerts import alert_filter_clauses
+
+logger = logging.getLogger(__name__)
+
+SNIPPET_OPEN = "<mark>"
+SNIPPET_CLOSE = "</mark>"
+SNIPPET_TOKENS = 12
+
+# SQLite: external-content FTS5 tables over the source columns, kept in sync by triggers.
+# Postgres: GIN expression indexes over the same to_tsvector() the queries use.
+# (fts table, source table, indexed column)
+FTS_INDEXES = (
+    ("report_fts", "report", "text"),
+    ("alert_fts", "alert", "summary"),
+)
+
+_SQLITE_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} BEGIN
+        INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column});
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} BEGIN
+        INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column});
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column} ON {source} BEGIN
+        INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column});
+        INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column});
+    END""",
+)
+
+_TS_CONFIG = literal_column("'english'::regconfig")
+
+# A quoted phrase, or a word with an optional trailing * for prefix search
+_TERM = re.compile(r'"([^"]*)"|(\w+)(\*?)')
+
+
+class SearchUnavailable(Exception):
+    """The database has no full-text index (e.g. SQLite built without FTS5)"""
+
+
+def ensure_search_index(bind) -> bool:
+    """Create the full-text index and its sync triggers, building it from existing rows the first time"""
+    dialect = bind.dialect.name
+    try:
+        with bind.begin() as conn:
+            inspector = inspect(conn)
+            for fts, source, column_name in FTS_INDEXES:
+                if dialect == "postgresql":
+                    conn.exec_driver_sql(
+                        f"CREATE INDEX IF NOT EXISTS ix_{fts} ON {source} "
+                        f"USING gin (to_tsvector('english'::regconfig, {column_name}))"
+                    )
+                    continue
+                if dialect != "sqlite":
+                    logger.warning("Full-text search is not supported on %s", dialect)
+                    return False
+                if not inspector.has_table(fts):
+                    conn.exec_driver_sql(
+                        f"CREATE VIRTUAL TABLE {fts} USING fts5({column_name}, content='{source}', "
+                        f"content_rowid='id', tokenize='porter unicode61')"
+                    )
+                    conn.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+                    logger.info("Built full-text index %s", fts)
+                for trigger in _SQLITE_TRIGGERS:
+                    conn.exec_driver_sql(trigger.format(fts=fts, source=source, column=column_name))
+            # The B-tree on report text cannot answer word queries; the full-text index replaces it
+            conn.exec_driver_sql("DROP INDEX IF EXISTS ix_report_text")
+    except OperationalError as e:
+        logger.warning("Full-text search unavailable: %s", e)
+        return False
+    return True
+
+
+def fts_query(text: str) -> Optional[str]:
+    """
+    FTS5 query matching every term of free-form user input.
+
+    Words and "quoted phrases" are quoted so FTS5 operators and column
+    filters in the input are taken literally; a trailing * keeps prefix search.
+    """
+    terms = []
+    for phrase, word, star in _TERM.findall(text):
+        if phrase.strip():
+            terms.append('"' + phrase.replace('"', "") + '"')
+        elif word:
+            terms.append(f'"{word}"{star}')
+    return " ".join(terms) or None
+
+
+def _sqlite_match(fts: str, column_name: str, query: str):
+    fts_table = table(fts, column("rowid"), column(column_name))
+    snippet = func.snippet(literal_column(fts), 0, SNIPPET_OPEN, SNIPPET_CLOSE, "…", SNIPPET_TOKENS)
+    # bm25() is lower for better matches
+    score = -func.bm25(literal_column(fts))
+    return fts_table, fts_table.c[column_name].match(query), fts_table.c.rowid, snippet, score
+
+
+def _postgres_match(source_column, query: str):
+    document = func.to_tsvector(_TS_CONFIG, source_column)
+    tsquery = func.websearch_to_tsquery(_TS_CONFIG, query)
+    snippet = func.ts_headline(
+        _TS_CONFIG, source_column, tsquery,
+        f"StartSel={SNIPPET_OPEN}, StopSel={SNIPPET_CLOSE}, MaxWords={SNIPPET_TOKENS}, MinWords=3",
+    )
+    return document.op("@@")(tsquery), snippet, func.ts_rank_cd(document, tsquery)
+
+
+def _newest_candidates(row_id, match):
+    """
+    Only the newest SEARCH_MAX_CANDIDATES matches are ranked.
+
+    Ranking scores every match, so a common word over millions of reports
+    would take seconds; finding the cutoff id only walks the index.
+    """
+    cutoff = (select(row_id).where(match).order_by(row_id.desc())
+              .offset(settings.SEARCH_MAX_CANDIDATES - 1).limit(1).correlate(None).scalar_subquery())
+    return row_id >= func.coalesce(cutoff, 0)
+
+
+def _hits(session: Session, query, limit: int) -> List[Dict[str, Any]]:
+    try:
+        rows = session.execute(query.order_by(literal_column("score").desc()).limit(limit)).all()
+    except OperationalError as e:
+        if "no such table" in str(e) or "no such module" in str(e):
+            raise SearchUnavailable(str(e))
+        raise
+    return [{
+        "id": row.id,
+        "alert_id": row.alert_id,
+        "snippet": row.snippet,
+        "score": round(float(row.score), 6),
+        "alert_type": row.disaster_type.value if row.disaster_type is not None else None,
+        "severity": row.severity_score,
+        "location": row.location_name,
+        "timestamp": row.created_at.isoformat(),
+    } for row in rows]
+
+
+def search(session: Session, text: str, alert_filter: AlertFilter, limit: int = 20) -> Dict[str, List]:
+    """
+    Alerts whose summary and reports whose text match every term, best BM25 match first.
+
+    The two lists are ranked separately, since scores from different indexes
+    are not comparable, each over its newest SEARCH_MAX_CANDIDATES matches. Reports are filtered through the alert they were
+    clustered into; reports not yet clustered are included unless a type or
+    severity filter is given.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        query = fts_query(text)
+    else:
+        query = text.strip() or None
+    if query is None:
+        return {"alerts": [], "reports": []}
+
+    clauses = alert_filter_clauses(alert_filter)
+    if alert_filter.type or alert_filter.min_severity is not None:
+        report_clause = and_(*clauses)
+    else:
+        report_clause = or_(Report.alert_id == None, and_(*clauses)) if clauses else None
+
+    alert_columns = (Alert.id, Alert.id.label("alert_id"), Alert.disaster_type, Alert.severity_score,
+                     Alert.location_name, Alert.created_at)
+    report_columns = (Report.id, Report.alert_id, Alert.disaster_type, Alert.severity_score,
+                      Alert.location_name, Report.created_at)
+
+    if dialect == "sqlite":
+        fts, match, rowid, snippet, score = _sqlite_match("alert_fts", "summary", query)
+        alert_query = (select(*alert_columns, snippet.label("snippet"), score.label("score"))
+                       .select_from(fts).join(Alert, Alert.id == rowid)
+                       .where(match, _newest_candidates(rowid, match)))
+        fts, match, rowid, snippet, score = _sqlite_match("report_fts", "text", query)
+        report_query = (select(*report_columns, snippet.label("snippet"), score.label("score"))
+                        .select_from(fts).join(Report, Report.id == rowid)
+                        .outerjoin(Alert, Alert.id == Report.alert_id)
+                        .where(match, _newest_candidates(rowid, match)))
+    else:
+        match, snippet, score = _postgres_match(Alert.summary, query)
+        alert_query = (select(*alert_columns, snippet.label("snippet"), score.label("score"))
+                       .where(match, _newest_candidates(Alert.id, match)))
+        match, snippet, score = _postgres_match(Report.text, query)
+        report_query = (select(*report_columns, snippet.label("snippet"), score.label("score"))
+                        .select_from(Report).outerjoin(Alert, Alert.id == Report.alert_id)
+                        .where(match, _newest_candidates(Report.id, match)))
+
+    alert_query = alert_query.where(*clauses)
+    if report_clause is not None:
+        report_query = report_query.where(report_clause)
+
+    return {
+        "alerts": _hits(session, alert_query, limit),
+        "reports": _hits(session, report_query, limit),
+    }
@@ -0,0 +1,318 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import BigInteger, Integer, and_, case, cast, delete, func, literal, select, union_all, update
+from sqlmodel import Session
+from app.core.config import settings
+from app.db.models import Alert, AlertArchive, AlertHistogram, Report, ReportVolume
+from app.services.rollups import upsert_aggregate
+
+logger = logging.getLogger(__name__)
+
+# Coarsening ladder: a request is served at its interval or the next coarser one that fits the point cap
+INTERVALS = {
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "6h": 6 * 3600,
+    "1d": 86400,
+    "7d": 7 * 86400,
+}
+# Precomputed resolutions; intervals of at least an hour read the coarsest one that divides them,
+# so a response reads at most TIMESERIES_MAX_POINTS * 7 buckets of each type and severity
+RESOLUTIONS = (3600, 86400)
+# Severity percentiles reported per bucket (nearest-rank)
+PERCENTILES = (50, 90, 99)
+# Span covered when since is not given, in requested intervals
+DEFAULT_POINTS = 100
+
+_histogram = AlertHistogram.__table__
+_volume = ReportVolume.__table__
+_KEY_COLUMNS = ("resolution", "bucket_start", "disaster_type", "severity_score")
+_VOLUME_KEY_COLUMNS = ("resolution", "bucket_start")
+
+
+def _truncate(value: datetime, resolution: int) -> datetime:
+    return datetime.utcfromtimestamp(_bucket_start(value, resolution))
+
+
+def _as_datetime(bucket) -> datetime:
+    """Buckets come back as stored datetimes or as epoch seconds"""
+    if isinstance(bucket, datetime):
+        return bucket
+    if isinstance(bucket, str):
+        return datetime.fromisoformat(bucket)
+    return datetime.utcfromtimestamp(int(bucket))
+
+
+def _keys(snapshot) -> List[Dict[str, Any]]:
+    return [{
+        "resolution": resolution,
+        "bucket_start": _truncate(snapshot.created_at, resolution),
+        "disaster_type": snapshot.disaster_type,
+        "severity_score": snapshot.severity_score,
+    } for resolution in RESOLUTIONS]
+
+
+def _key_clause(key: Dict[str, Any]):
+    return and_(*[_histogram.c[column] == key[column] for column in _KEY_COLUMNS])
+
+
+def apply_change(session: Session, before, after):
+    """
+    Move an alert's count from its old histogram keys to its new ones.
+
+    Archival (after is None) keeps the count: the histogram is history, and
+    activity is not part of its key.
+    """
+    if after is None:
+        return
+    if before is not None:
+        if _keys(before) == _keys(after) and before.report_count == after.report_count:
+            return
+        for key in _keys(before):
+            session.execute(
+                update(_histogram).where(_key_clause(key)).values(
+                    alert_count=_histogram.c.alert_count - 1,
+                    report_count=_histogram.c.report_count - before.report_count,
+                )
+            )
+            session.execute(delete(_histogram).where(_key_clause(key)).where(_histogram.c.alert_count <= 0))
+    for key in _keys(after):
+        upsert_aggregate(session, _histogram, _KEY_COLUMNS, dict(key, alert_count=1, report_count=after.report_count),
+                         summed=["alert_count", "report_count"], maxed=[])
+
+
+def report_received(session: Session, report: Report):
+    """Count a new report; runs in the caller's transaction"""
+    for resolution in RESOLUTIONS:
+        values = {"resolution": resolution, "bucket_start": _truncate(report.created_at, resolution),
+                  "report_count": 1}
+        upsert_aggregate(session, _volume, _VOLUME_KEY_COLUMNS, values, summed=["report_count"], maxed=[])
+
+
+def _epoch_expression(session: Session, column):
+    if session.get_bind().dialect.name == "postgresql":
+        return cast(func.floor(func.extract("epoch", column)), BigInteger)
+    return cast(func.strftime("%s", column), Integer)
+
+
+def _truncate_expression(session: Session, column, resolution: int):
+    """column truncated to its bucket, as stored in bucket_start"""
+    if session.get_bind().dialect.name == "postgresql":
+        return func.date_trunc("hour" if resolution == 3600 else "day", column)
+    return func.strftime("%Y-%m-%d %H:00:00.000000" if resolution == 3600 else "%Y-%m-%d 00:00:00.000000", column)
+
+
+def rebuild_timeseries(session: Session):
+    """Recompute the alert histogram from live and archived alerts, and report volumes from reports"""
+    alerts = union_all(*[
+        select(model.created_at, model.disaster_type, model.severity_score,
+               func.coalesce(model.report_count, 1).label("report_count"))
+        for model in (Alert, AlertArchive)
+    ]).subquery("alerts")
+    session.execute(delete(_histogram))
+    session.execute(delete(_volume))
+    for resolution in RESOLUTIONS:
+        bucket = _truncate_expression(session, alerts.c.created_at, resolution)
+        grouped = (
+            select(literal(resolution), bucket, alerts.c.disaster_type, alerts.c.severity_score,
+                   func.count(), func.sum(alerts.c.report_count))
+            .group_by(bucket, alerts.c.disaster_type, alerts.c.severity_score)
+        )
+        session.execute(_histogram.insert().from_select(
+            list(_KEY_COLUMNS) + ["alert_count", "report_count"], grouped
+        ))
+        bucket = _truncate_expression(session, Report.created_at, resolution)
+        session.execute(_volume.insert().from_select(
+            list(_VOLUME_KEY_COLUMNS) + ["report_count"],
+            select(literal(resolution), bucket, func.count()).select_from(Report).group_by(bucket),
+        ))
+    session.commit()
+    logger.info("Rebuilt alert histogram and report volumes")
+
+
+def ensure_timeseries(session: Session):
+    """Build the histogram and volumes once for databases that have reports but none yet"""
+    has_volume = session.execute(select(_volume.c.id).limit(1)).first() is not None
+    has_reports = session.execute(select(Report.id).limit(1)).first() is not None
+    if has_reports and not has_volume:
+        rebuild_timeseries(session)
+
+
+def _bucket_start(value: datetime, seconds: int) -> int:
+    epoch = int((value - datetime(1970, 1, 1)).total_seconds())
+    return epoch - epoch % seconds
+
+
+def bucket_count(seconds: int, since: datetime, until: datetime) -> int:
+    """Buckets of the given width overlapping [since, until)"""
+    if until <= since:
+        return 0
+    last = _bucket_start(until - timedelta(microseconds=1), seconds)
+    return (last - _bucket_start(since, seconds)) // seconds + 1
+
+
+def plan_interval(interval: str, since: datetime, until: datetime,
+                  max_points: Optional[int] = None) -> Tuple[str, datetime, datetime]:
+    """
+    Interval to serve, and the range widened to whole buckets, so there are at most max_points buckets.
+
+    Steps up the ladder from the requested interval; a span too long even for
+    the coarsest interval keeps its most recent max_points buckets.
+    """
+    max_points = max_points or settings.TIMESERIES_MAX_POINTS
+    ladder = list(INTERVALS)
+    for name in ladder[ladder.index(interval):]:
+        if bucket_count(INTERVALS[name], since, until) <= max_points:
+            break
+    seconds = INTERVALS[name]
+    last = _bucket_start(until - timedelta(microseconds=1), seconds)
+    first = max(_bucket_start(since, seconds), last - seconds * (max_points - 1))
+    return name, datetime.utcfromtimestamp(first), datetime.utcfromtimestamp(last + seconds)
+
+
+def _resolution(seconds: int) -> Optional[int]:
+    """Coarsest precomputed resolution that buckets of this width are made of, if any"""
+    fitting = [resolution for resolution in RESOLUTIONS if seconds % resolution == 0]
+    return fitting[-1] if fitting else None
+
+
+def _alert_counts(session: Session, seconds: int, since: datetime, until: datetime,
+                  disaster_type: Optional[str]):
+    """Alerts and their reports per bucket, type and severity"""
+    resolution = _resolution(seconds)
+    if resolution is not None:
+        conditions = [
+            _histogram.c.resolution == resolution,
+            _histogram.c.bucket_start >= since,
+            _histogram.c.bucket_start < until,
+        ]
+        if disaster_type:
+            conditions.append(_histogram.c.disaster_type == disaster_type)
+        if seconds == resolution:
+            # Stored buckets as they are, in index order
+            return select(
+                _histogram.c.bucket_start.label("bucket"), _histogram.c.disaster_type, _histogram.c.severity_score,
+                _histogram.c.alert_count.label("alerts"), _histogram.c.report_count.label("reports"),
+            ).where(*conditions).subquery("counts")
+        bucket = (_epoch_expression(session, _histogram.c.bucket_start) // seconds) * seconds
+        return (
+            select(bucket.label("bucket"), _histogram.c.disaster_type, _histogram.c.severity_score,
+                   func.sum(_histogram.c.alert_count).label("alerts"),
+                   func.sum(_histogram.c.report_count).label("reports"))
+            .where(*conditions)
+            .group_by(bucket, _histogram.c.disaster_type, _histogram.c.severity_score)
+            .subquery("counts")
+        )
+
+    # Sub-hour buckets: the coarsening keeps the span short, so reading alert rows stays cheap.
+    # Archived alerts are still part of the history.
+    selects = []
+    for model in (Alert, AlertArchive):
+        query = (
+            select(model.created_at, model.disaster_type, model.severity_score,
+                   func.coalesce(model.report_count, 1).label("report_count"))
+            .where(model.created_at >= since)
+            .where(model.created_at < until)
+        )
+        if disaster_type:
+            query = query.where(model.disaster_type == disaster_type)
+        selects.append(query)
+    alerts = union_all(*selects).subquery("alerts")
+    bucket = (_epoch_expression(session, alerts.c.created_at) // seconds) * seconds
+    return (
+        select(bucket.label("bucket"), alerts.c.disaster_type, alerts.c.severity_score,
+               func.count().label("alerts"), func.sum(alerts.c.report_count).label("reports"))
+        .group_by(bucket, alerts.c.disaster_type, alerts.c.severity_score)
+        .subquery("counts")
+    )
+
+
+def _alert_points(session: Session, seconds: int, since: datetime, until: datetime,
+                  disaster_type: Optional[str]):
+    """Per bucket and type: alert and report counts, severity sum and max, and severity percentiles"""
+    counts = _alert_counts(session, seconds, since, until, disaster_type)
+    partition = [counts.c.bucket, counts.c.disaster_type]
+    cumulative = select(
+        counts,
+        func.sum(counts.c.alerts).over(partition_by=partition, order_by=counts.c.severity_score).label("running"),
+        func.sum(counts.c.alerts).over(partition_by=partition).label("size"),
+    ).subquery("cumulative")
+
+    # Nearest rank: the smallest severity with at least p% of the bucket's alerts at or below it
+    percentiles = [
+        func.min(case((cumulative.c.running * 100 >= cumulative.c.size * p, cumulative.c.severity_score)))
+        for p in PERCENTILES
+    ]
+    return session.execute(
+        select(
+            cumulative.c.bucket, cumulative.c.disaster_type,
+            func.sum(cumulative.c.alerts), func.sum(cumulative.c.reports),
+            func.sum(cumulative.c.severity_score * cumulative.c.alerts), func.max(cumulative.c.severity_score),
+            *percentiles,
+        )
+        .group_by(cumulative.c.bucket, cumulative.c.disaster_type)
+        .order_by(cumulative.c.bucket, cumulative.c.disaster_type)
+    ).all()
+
+
+def _report_volume(session: Session, seconds: int, since: datetime, until: datetime):
+    """Reports received per bucket"""
+    resolution = _resolution(seconds)
+    if resolution is not None:
+        bucket = _volume.c.bucket_start
+        if seconds != resolution:
+            bucket = (_epoch_expression(session, bucket) // seconds) * seconds
+        query = (
+            select(bucket, func.sum(_volume.c.report_count))
+            .where(_volume.c.resolution == resolution)
+            .where(_volume.c.bucket_start >= since)
+            .where(_volume.c.bucket_start < until)
+        )
+    else:
+        bucket = (_epoch_expression(session, Report.created_at) // seconds) * seconds
+        query = select(bucket, func.count()).where(Report.created_at >= since).where(Report.created_at < until)
+    return session.execute(query.group_by(bucket).order_by(bucket)).all()
+
+
+def get_timeseries(session: Session, interval: str, since: Optional[datetime] = None,
+                   until: Optional[datetime] = None, disaster_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Alert volume and severity per time bucket and disaster type, and report volume per bucket.
+
+    Alerts are bucketed by creation time and reports by receipt, on UTC-aligned
+    buckets; buckets without any are omitted. Hourly and coarser intervals read
+    precomputed buckets, so their cost is bounded by the point limit, not the
+    number of alerts and reports in the range.
+    """
+    until = until or datetime.utcnow()
+    since = since or until - timedelta(seconds=INTERVALS[interval] * DEFAULT_POINTS)
+    served, since, until = plan_interval(interval, since, until)
+    seconds = INTERVALS[served]
+
+    points = []
+    for bucket, alert_type, count, reports, severity_sum, severity_max, *percentiles in _alert_points(
+            session, seconds, since, until, disaster_type):
+        point = {
+            "bucket_start": _as_datetime(bucket),
+            "disaster_type": getattr(alert_type, "value", alert_type),
+            "alert_count": count,
+            "report_count": reports,
+            "avg_severity": round(severity_sum / count, 1),
+            "max_severity": severity_max,
+        }
+        point.update({f"p{p}_severity": value for p, value in zip(PERCENTILES, percentiles)})
+        points.append(point)
+
+    reports = [{"bucket_start": _as_datetime(bucket), "report_count": count}
+               for bucket, count in _report_volume(session, seconds, since, until)]
+
+    return {
+        "interval": served,
+        "interval_seconds": seconds,
+        "since": since,
+        "until": until,
+        "points": points,
+        "reports": reports,
+    }
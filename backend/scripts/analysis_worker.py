@@ -0,0 +1,51 @@
+import argparse
+import asyncio
+import logging
+import multiprocessing
+from app.core.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_process(concurrency: int):
+    """Entry point of one analysis process; imports happen here so each process has its own engine and adapters"""
+    from app.db.session import engine
+    from app.services.analysis_worker import run_worker
+
+    setup_logging()
+    try:
+        asyncio.run(run_worker(engine, concurrency=concurrency))
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    """Run analysis outside the API processes (ANALYSIS_MODE=worker)"""
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description="Analysis worker pool claiming reports from the database")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes to start")
+    parser.add_argument("--concurrency", type=int, default=settings.ANALYSIS_WORKERS,
+                        help="Analyses in flight per process")
+    args = parser.parse_args()
+
+    setup_logging()
+    if settings.ANALYSIS_MODE != "worker":
+        logger.warning("ANALYSIS_MODE is %s; API processes will analyze reports as well", settings.ANALYSIS_MODE)
+
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_worker_process, args=(args.concurrency,), name=f"analysis-{i}")
+                 for i in range(args.processes)]
+    for process in processes:
+        process.start()
+    logger.info("Started %s analysis processes", len(processes))
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import argparse
+import asyncio
+import logging
+from app.core.logging_config import setup_logging
+from app.db.session import create_db_and_tables, engine
+from app.services.backfill import run_backfill
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Re-run analysis over historical reports, e.g. after switching from mock to real AI or changing models"""
+    parser = argparse.ArgumentParser(description="Parallel, resumable analysis backfill")
+    parser.add_argument("--name", default="default", help="Checkpoint name; rerunning a name resumes it")
+    parser.add_argument("--start-id", type=int, default=1, help="First report id (new runs only)")
+    parser.add_argument("--end-id", type=int, default=None, help="Last report id (new runs only)")
+    parser.add_argument("--concurrency", type=int, default=None, help="Analyses in flight")
+    parser.add_argument("--batch-size", type=int, default=None, help="Reports per committed batch")
+    parser.add_argument("--force", action="store_true", help="Call every adapter, ignoring stored evidence")
+    parser.add_argument("--restart", action="store_true", help="Discard the checkpoint and start over")
+    args = parser.parse_args()
+
+    setup_logging()
+    create_db_and_tables()
+    stats = asyncio.run(run_backfill(
+        engine, name=args.name, start_id=args.start_id, end_id=args.end_id, concurrency=args.concurrency,
+        batch_size=args.batch_size, force=args.force, restart=args.restart,
+    ))
+    logger.info("Backfill finished: %s processed, %s failed, last id %s",
+                stats["processed"], stats["failed"], stats["last_id"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every module a fresh interpreter imports to load module"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main():
+    """Show where the import time of the API process goes, slowest first"""
+    parser = argparse.ArgumentParser(description="Import-time profile of the API process")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=25, help="Modules to list by cumulative time")
+    args = parser.parse_args()
+
+    rows = import_times(args.module)
+    total = next(cumulative for name, _, cumulative in rows if name == args.module)
+
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"import {args.module}: {total / 1000:.1f} ms, {len(rows)} modules\n")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: -row[2])[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    print(f"\n{'self ms':>9}  top-level package")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{self_us / 1000:>9.1f}  {package}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import argparse
+import logging
+from sqlmodel import Session
+from app.core.logging_config import setup_logging
+from app.db.session import engine
+from app.services.rescoring import rescore_alerts, DEFAULT_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Recompute severity scores of stored alerts after severity rules change"""
+    parser = argparse.ArgumentParser(description="Bulk rescore historical alerts")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing them")
+    args = parser.parse_args()
+
+    setup_logging()
+    with Session(engine) as session:
+        stats = rescore_alerts(session, chunk_size=args.chunk_size, dry_run=args.dry_run)
+    logger.info("Rescore finished: %s scanned, %s changed", stats["scanned"], stats["changed"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Optional
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+from app.db.models import Alert, Report
+from app.services.clustering import cluster_report
+
+
+@pytest.fixture
+def engine():
+    """In-memory database with all tables, one connection shared across threads and sessions"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _analysis(disaster_type: str, severity: int = 50):
+    """Analysis result as the analyzer returns it, without evidence"""
+    return {
+        "disaster_type": disaster_type,
+        "severity_score": severity,
+        "summary": f"{disaster_type} reported",
+        "location_name": "Test",
+    }
+
+
+@pytest.fixture
+def cluster():
+    """File a report and cluster it into an incident; returns the alert it opened or joined"""
+    def report_incident(session: Session, lat: float, lon: float, disaster_type: str, severity: int = 50,
+                        created_at: Optional[datetime] = None, source: str = "test") -> Alert:
+        report = Report(text="test", lat=lat, lon=lon, source=source, created_at=created_at or datetime.utcnow())
+        session.add(report)
+        session.flush()
+        alert, _ = cluster_report(session, report, _analysis(disaster_type, severity))
+        return alert
+    return report_incident
@@ -0,0 +1,134 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from app.db.models import Report
+from app.db.session import get_session
+from app.main import app
+from app.services import admission, analysis_queue
+from app.services.admission import admit_report
+
+REPORT = {"text": "Flooding on main street", "lat": 19.07, "lon": 72.87, "source": "twitter"}
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    for name, value in {"ADMISSION_SOFT_DEPTH": 10, "ADMISSION_HARD_DEPTH": 100,
+                        "ADMISSION_SOFT_AGE_SECONDS": 60, "ADMISSION_HARD_AGE_SECONDS": 600,
+                        "ADMISSION_RETRY_AFTER_SECONDS": 30}.items():
+        monkeypatch.setattr(f"app.core.config.settings.{name}", value)
+
+    def set_backlog(depth, age):
+        monkeypatch.setattr(admission, "backlog_status", lambda: (depth, age))
+    return set_backlog
+
+
+def test_decisions_follow_backlog_depth_and_age(limits):
+    limits(5, 1.0)
+    assert admit_report("twitter").decision == "accept"
+    limits(10, 1.0)
+    assert admit_report("twitter").decision == "defer"
+    limits(5, 120.0)
+    assert admit_report("twitter").decision == "defer"
+
+    limits(500, 1.0)
+    rejected = admit_report("twitter")
+    assert rejected.decision == "reject"
+    assert 30 <= rejected.retry_after <= 45
+    # Trusted sources are never shed
+    assert admit_report("emergency_services").decision == "accept"
+
+
+def test_report_endpoint_defers_and_sheds(engine, limits, monkeypatch):
+    submitted = []
+    monkeypatch.setattr("app.api.routes_reports.submit_report", lambda report: submitted.append(report.id)
+                        if not report.analysis_deferred else None)
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = session_override
+    try:
+        client = TestClient(app)
+        limits(20, 1.0)
+        response = client.post("/api/v1/report", json=REPORT)
+        assert response.status_code == 200
+        assert response.json()["status"] == "deferred"
+
+        limits(1000, 1.0)
+        response = client.post("/api/v1/report", json=REPORT)
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 30
+
+        response = client.post("/api/v1/report", json={**REPORT, "source": "emergency_services"})
+        assert response.json()["status"] == "received"
+    finally:
+        app.dependency_overrides.clear()
+
+    with Session(engine) as session:
+        reports = session.exec(select(Report).order_by(Report.id)).all()
+    assert [report.analysis_deferred for report in reports] == [True, False]
+    assert submitted == [reports[1].id]
+
+
+@pytest.mark.asyncio
+async def test_deferred_reports_are_released_when_queue_runs_dry(engine, monkeypatch):
+    monkeypatch.setattr("app.db.session.engine", engine)
+    with Session(engine) as session:
+        session.add(Report(text="deferred low", lat=0, lon=0, source="t", priority=5, analysis_deferred=True))
+        session.add(Report(text="deferred high", lat=0, lon=0, source="t", priority=50, analysis_deferred=True))
+        session.add(Report(text="done", lat=0, lon=0, source="t", is_analyzed=True, analysis_deferred=True))
+        session.commit()
+
+    handled = []
+
+    async def handler(report_id):
+        handled.append(report_id)
+
+    queue = analysis_queue.AnalysisQueue(handler=handler, workers=1, aging_per_minute=0, refill_interval=0,
+                                         refill=lambda: analysis_queue.release_deferred(limit=1))
+    monkeypatch.setattr(analysis_queue, "analysis_queue", queue)
+    queue.push(99, priority=10)
+    for _ in range(200):
+        if len(handled) == 3:
+            break
+        await asyncio.sleep(0.01)
+    await queue.stop()
+
+    # Queued work first, then deferred reports one release at a time, most urgent first
+    assert handled == [99, 2, 1]
+    with Session(engine) as session:
+        assert not any(report.analysis_deferred for report in session.exec(select(Report)) if not report.is_analyzed)
+
+
+@pytest.mark.asyncio
+async def test_idle_workers_refill_only_when_reports_were_deferred():
+    refills = []
+
+    def refill():
+        refills.append(1)
+        return []
+
+    async def handler(report_id):
+        await asyncio.sleep(0)
+
+    queue = analysis_queue.AnalysisQueue(handler=handler, workers=8, aging_per_minute=0,
+                                         refill=refill, refill_interval=60)
+    for report_id in range(20):
+        queue.push(report_id, priority=10)
+        await asyncio.sleep(0.001)
+    # One check at startup for reports deferred by a previous run, none per push
+    assert len(refills) == 1
+
+    # A deferral is looked for once the interval since the last check has passed
+    queue.note_deferred()
+    queue.push(100, priority=10)
+    await asyncio.sleep(0.01)
+    assert len(refills) == 1
+    queue.refill_interval = 0
+    queue._next_refill_at = 0.0
+    queue.push(101, priority=10)
+    await asyncio.sleep(0.05)
+    await queue.stop()
+    assert len(refills) == 2
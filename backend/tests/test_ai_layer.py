@@ -63,4 +63,57 @@ async def test_analyze_report_consistency():
         # Evidence structure check
         evidence_keys = ["summarizer", "classifier", "weather", "geo"]
         for key in evidence_keys:
-            assert key in result["evidence"], f"Missing evidence key {key}"
\ No newline at end of file
+            assert key in result["evidence"], f"Missing evidence key {key}"
+
+def test_extractive_summarizer_prefers_urgent_sentences():
+    """Test local extractive summaries and their batch API"""
+    from app.integrations.extractive_summarizer import ExtractiveSummarizer
+
+    summarizer = ExtractiveSummarizer(max_chars=120)
+    text = ("Heavy rain since morning. The weather was nice yesterday. "
+            "Two people are trapped on a rooftop and need rescue. We are waiting for help.")
+    summary = summarizer.summarize(text)
+    assert "trapped" in summary
+    assert "nice yesterday" not in summary
+    assert len(summary) <= 120
+    assert summarizer.summarize_batch([text, "", "Fire!"]) == [summary, "", "Fire!"]
+
+
+def test_summary_routing_policy():
+    """Test short/low-severity reports stay local and long/severe ones use the LLM"""
+    from app.integrations.summarizer import SummarizerAdapter
+
+    assert not SummarizerAdapter.should_use_llm("Flooding on Main St.", severity=95)
+    assert not SummarizerAdapter.should_use_llm("x" * 400, severity=40)
+    assert SummarizerAdapter.should_use_llm("x" * 400, severity=90)
+    assert SummarizerAdapter.should_use_llm("x" * 2000, severity=10)
+
+
+@pytest.mark.asyncio
+async def test_summaries_route_through_the_instrumented_call(monkeypatch):
+    """Test local summaries are timed, and a failed LLM call falls back to the extractive tier"""
+    from app.integrations import base
+    from app.integrations.extractive_summarizer import get_extractive_summarizer
+    from app.integrations.summarizer import SummarizerAdapter
+
+    timings = []
+    monkeypatch.setattr(base, "record_timing", lambda name, elapsed: timings.append(name))
+    adapter = SummarizerAdapter()
+    adapter.use_mock = False
+
+    short = "Flooding on Main St. Cars are stuck."
+    result = await adapter.analyze(short, severity=40)
+    assert result["source"] == "extractive"
+    assert result["summary"] == get_extractive_summarizer().summarize(short)
+    assert timings == ["adapter_summarizer"]
+
+    async def failing_llm(text):
+        raise RuntimeError("upstream down")
+
+    adapter.openai_key = "key"
+    monkeypatch.setattr(adapter, "_openai_summarize", failing_llm)
+    severe = "Two people are trapped on a rooftop and need rescue. " * 10
+    result = await adapter.analyze(severe, severity=95)
+    assert result["source"] == "mock"
+    assert result["summary"] == get_extractive_summarizer().summarize(severe)
+    assert len(timings) == 2
@@ -0,0 +1,96 @@
+import json
+from datetime import datetime
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from app.db.models import Alert, Report
+from app.db.session import get_session
+from app.main import app
+from app.schemas.alert import AlertFilter
+from app.services import alerts as alert_service
+from app.services.alert_json import AlertJSONCache, alert_json_cache
+from app.services.alerts import deactivate_alert, get_filtered_alerts_with_reports
+from app.services.hot_store import hot_alerts
+
+
+@pytest.fixture
+def client(engine, monkeypatch):
+    with Session(engine) as session:
+        for i in range(5):
+            report = Report(text="test", lat=10.0 + i, lon=20.0, source="sms")
+            session.add(report)
+            session.flush()
+            session.add(Alert(report_id=report.id, disaster_type="fire", severity_score=40 + i,
+                              summary=f"Fire {i} – ünïcode", location_name="Test"))
+        session.commit()
+
+    encoded = []
+    encode_alert = alert_service.encode_alert
+    monkeypatch.setattr(alert_service, "encode_alert", lambda alert: encoded.append(alert.id) or encode_alert(alert))
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    alert_json_cache.clear()
+    app.dependency_overrides[get_session] = session_override
+    try:
+        yield TestClient(app), engine, encoded
+    finally:
+        app.dependency_overrides.clear()
+        alert_json_cache.clear()
+        hot_alerts.unload()
+
+
+def _expected(engine, alert_filter):
+    with Session(engine) as session:
+        return [alert.model_dump() for alert in get_filtered_alerts_with_reports(session, alert_filter)]
+
+
+def test_listings_reuse_encoded_alerts_until_they_change(client):
+    http, engine, encoded = client
+    params = {"active_only": "false"}
+
+    response = http.get("/api/v1/alerts", params=params)
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == _expected(engine, AlertFilter(active_only=False))
+    assert sorted(encoded) == [1, 2, 3, 4, 5]
+
+    # Reads after the first are assembled from cached fragments
+    encoded.clear()
+    assert http.get("/api/v1/alerts", params=params).json() == _expected(engine, AlertFilter(active_only=False))
+    assert encoded == []
+
+    # Only the alerts that changed are encoded again
+    with Session(engine) as session:
+        alert = session.get(Alert, 2)
+        alert.report_count = 3
+        alert.updated_at = datetime.utcnow()
+        session.add(alert)
+        deactivate_alert(session, session.get(Alert, 4))
+        session.commit()
+    assert http.get("/api/v1/alerts", params=params).json() == _expected(engine, AlertFilter(active_only=False))
+    assert sorted(encoded) == [2, 4]
+
+
+def test_hot_store_feed_is_byte_compatible(client):
+    http, engine, encoded = client
+    from_database = http.get("/api/v1/alerts").content
+
+    hot_alerts.load(engine, capacity=100)
+    from_store = http.get("/api/v1/alerts").content
+    assert from_store == from_database
+    assert json.loads(from_store)[0]["summary"] == "Fire 4 – ünïcode"
+
+
+def test_cache_evicts_least_recently_used():
+    cache = AlertJSONCache(capacity=2)
+    now = datetime.utcnow()
+    cache.put(1, now, b"1")
+    cache.put(2, now, b"2")
+    assert cache.get(1, now) == b"1"
+    cache.put(3, now, b"3")
+    assert cache.get(2, now) is None
+    assert cache.get(1, now) == b"1"
+    # A fragment encoded before the alert changed is not reused
+    assert cache.get(3, datetime.utcnow()) is None
@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from app.services import analysis_queue
+from app.services.analysis_queue import AnalysisQueue, RegionRateTracker, prescore_report
+
+
+def test_prescore_ranks_urgent_reports_first():
+    tweet = prescore_report("lovely weather at the beach today", "twitter")
+    eruption = prescore_report("Volcano eruption, lava flow moving toward the village, evacuate now", "twitter")
+    responders = prescore_report("Building collapsed, people trapped", "emergency_services")
+    assert eruption > tweet
+    assert responders > tweet
+    assert 0 <= tweet <= 100 and 0 <= eruption <= 100
+    # Bursts of reports from one region raise the score
+    assert prescore_report("flooding on main street", "sms", region_count=16) > prescore_report("flooding on main street", "sms")
+
+
+def test_prescore_parses_weights_and_classifies_repeated_text_once(monkeypatch):
+    parsed, classified = [], []
+    monkeypatch.setattr(analysis_queue, "parse_source_weights",
+                        lambda spec: parsed.append(spec) or {"sms": 15.0})
+    classifier = analysis_queue.get_keyword_classifier()
+    monkeypatch.setattr(classifier, "classify", lambda text: classified.append(text) or {
+        "disaster_type": "flood", "confidence": 0.9})
+    monkeypatch.setattr("app.core.config.settings.PRIORITY_SOURCE_WEIGHTS", "sms=15")
+    analysis_queue._source_weights.cache_clear()
+    analysis_queue._type_score.cache_clear()
+    try:
+        scores = {prescore_report("river over its banks", "sms") for _ in range(3)}
+        assert len(scores) == 1
+        assert parsed == ["sms=15"]
+        assert classified == ["river over its banks"]
+    finally:
+        analysis_queue._source_weights.cache_clear()
+        analysis_queue._type_score.cache_clear()
+
+
+def test_region_rate_window():
+    tracker = RegionRateTracker(window_seconds=60)
+    assert tracker.record(19.07, 72.87, now=0) == 1
+    assert tracker.record(19.08, 72.88, now=10) == 2
+    assert tracker.record(28.61, 77.20, now=10) == 1
+    assert tracker.record(19.07, 72.87, now=100) == 1
+
+
+def test_pop_order_with_aging():
+    queue = AnalysisQueue(aging_per_minute=10)
+    queue._ensure_workers = lambda: None
+    queue._wakeup = asyncio.Event()
+
+    queue.push(1, priority=10, enqueued_at=0)
+    queue.push(2, priority=80, enqueued_at=60)
+    queue.push(3, priority=50, enqueued_at=60)
+    queue.push(3, priority=50, enqueued_at=60)  # duplicates are ignored
+    assert [queue.pop(), queue.pop(), queue.pop(), queue.pop()] == [2, 3, 1, None]
+
+    # A low-priority report that waited long enough overtakes fresh high-priority ones
+    queue.push(4, priority=10, enqueued_at=0)
+    queue.push(5, priority=50, enqueued_at=300)
+    assert queue.pop() == 4
+
+
+@pytest.mark.asyncio
+async def test_workers_drain_highest_priority_first():
+    handled = []
+
+    async def handler(report_id):
+        handled.append(report_id)
+        await asyncio.sleep(0)
+
+    queue = AnalysisQueue(handler=handler, workers=1, aging_per_minute=0)
+    queue.push(1, priority=5)
+    queue.push(2, priority=5)
+    queue.push(3, priority=90)
+    queue.push(4, priority=40)
+    for _ in range(50):
+        await asyncio.sleep(0)
+    await queue.stop()
+
+    # Workers start after the first push, so everything queued before the first await is ordered
+    assert handled == [3, 4, 1, 2]
@@ -0,0 +1,127 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import inspect, text
+from sqlmodel import Session
+from app.db.models import Report
+from app.db.session import add_missing_columns
+from app.services.analysis_worker import claim_reports, renew_claims, run_worker
+from app.services.leases import acquire_lease, release_lease, run_once
+
+
+def test_lease_has_one_holder_until_released_or_expired(engine):
+    assert acquire_lease(engine, "startup", 60, holder="a")
+    assert not acquire_lease(engine, "startup", 60, holder="b")
+    assert acquire_lease(engine, "startup", 60, holder="a")  # renewal
+
+    release_lease(engine, "startup", holder="a")
+    assert acquire_lease(engine, "startup", -1, holder="b")
+    # b's lease already expired, so a can take over
+    assert acquire_lease(engine, "startup", 60, holder="a")
+
+
+def test_run_once_skips_work_done_by_another_process(engine, monkeypatch):
+    ran = []
+    assert run_once(engine, "startup", lambda: ran.append("first"), 60)
+    assert ran == ["first"]
+
+    # While another process holds the lease we wait for it, then skip the work
+    acquire_lease(engine, "startup", 60, holder="other")
+    monkeypatch.setattr("app.services.leases.time.sleep",
+                        lambda _: release_lease(engine, "startup", holder="other"))
+    assert not run_once(engine, "startup", lambda: ran.append("second"), 60)
+    assert ran == ["first"]
+
+
+def test_add_missing_columns_upgrades_old_tables(engine):
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE report"))
+        conn.execute(text("CREATE TABLE report (id INTEGER PRIMARY KEY, text VARCHAR NOT NULL, lat FLOAT NOT NULL, "
+                          "lon FLOAT NOT NULL, source VARCHAR NOT NULL, created_at DATETIME NOT NULL, "
+                          "updated_at DATETIME NOT NULL, is_analyzed BOOLEAN NOT NULL)"))
+        conn.execute(text("INSERT INTO report VALUES (1, 'x', 0, 0, 's', '2024-01-01', '2024-01-01', 0)"))
+
+    add_missing_columns(engine)
+    columns = {column["name"] for column in inspect(engine).get_columns("report")}
+    assert {"priority", "evidence", "claimed_by", "claimed_at"} <= columns
+    with Session(engine) as session:
+        report = session.get(Report, 1)
+        assert report.priority == 0 and report.claimed_by is None
+
+
+def test_claims_are_exclusive_and_ordered_by_urgency(engine):
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        session.add(Report(id=1, text="low", lat=0, lon=0, source="t", priority=10, created_at=now))
+        session.add(Report(id=2, text="high", lat=0, lon=0, source="t", priority=90, created_at=now))
+        session.add(Report(id=3, text="done", lat=0, lon=0, source="t", priority=99, is_analyzed=True))
+        # Waited an hour, so aging lifts it above fresh high-priority reports
+        session.add(Report(id=4, text="old", lat=0, lon=0, source="t", priority=10,
+                           created_at=now - timedelta(hours=1)))
+        session.commit()
+
+    assert claim_reports(engine, "a", 2, now=now) == [4, 2]
+    assert claim_reports(engine, "b", 5, now=now) == [1]
+    assert claim_reports(engine, "c", 5, now=now) == []
+    # Claims of a worker that went quiet are taken over
+    assert claim_reports(engine, "c", 5, now=now + timedelta(hours=1)) == [4, 2, 1]
+
+
+def test_renewed_claims_are_not_taken_over(engine, monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.ANALYSIS_CLAIM_TIMEOUT_SECONDS", 300)
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        session.add(Report(id=1, text="slow", lat=0, lon=0, source="t", created_at=now))
+        session.commit()
+
+    assert claim_reports(engine, "a", 1, now=now) == [1]
+    # Only the holder can renew
+    assert renew_claims(engine, "b", [1], now=now + timedelta(seconds=200)) == 0
+    assert renew_claims(engine, "a", [1], now=now + timedelta(seconds=200)) == 1
+    assert claim_reports(engine, "b", 1, now=now + timedelta(seconds=400)) == []
+    assert claim_reports(engine, "b", 1, now=now + timedelta(seconds=600)) == [1]
+
+
+@pytest.mark.asyncio
+async def test_worker_renews_claims_of_slow_analyses(engine, monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.ANALYSIS_CLAIM_TIMEOUT_SECONDS", 0.3)
+    with Session(engine) as session:
+        session.add(Report(text="slow", lat=0, lon=0, source="t"))
+        session.commit()
+
+    stop = asyncio.Event()
+    taken_over = []
+
+    async def handler(report_id):
+        # Runs past the claim timeout several times over while another worker polls
+        for _ in range(8):
+            await asyncio.sleep(0.1)
+            taken_over.extend(claim_reports(engine, "other", 1))
+        stop.set()
+
+    assert await run_worker(engine, worker_id="w", concurrency=1, poll_seconds=0.01, stop=stop, handler=handler) == 1
+    assert taken_over == []
+
+
+@pytest.mark.asyncio
+async def test_worker_analyzes_claimed_reports(engine):
+    with Session(engine) as session:
+        for i in range(5):
+            session.add(Report(text=f"report {i}", lat=0, lon=0, source="t"))
+        session.commit()
+
+    handled = []
+    stop = asyncio.Event()
+
+    async def handler(report_id):
+        with Session(engine) as session:
+            report = session.get(Report, report_id)
+            report.is_analyzed = True
+            session.add(report)
+            session.commit()
+        handled.append(report_id)
+        if len(handled) == 5:
+            stop.set()
+
+    assert await run_worker(engine, worker_id="w", concurrency=2, poll_seconds=0.01, stop=stop, handler=handler) == 5
+    assert sorted(handled) == [1, 2, 3, 4, 5]
@@ -0,0 +1,101 @@
+import asyncio
+import random
+import pytest
+from sqlmodel import Session, select
+from app.db.models import Alert, BackfillCheckpoint, Report
+from app.services import backfill
+
+
+@pytest.fixture
+def engine(engine):
+    with Session(engine) as session:
+        for i in range(25):
+            # Spread out so every report opens its own incident
+            session.add(Report(text=f"flood {i}", lat=i, lon=i, source="test", is_analyzed=True))
+        session.commit()
+    return engine
+
+
+def _fake_analyzer(monkeypatch, analyzed):
+    rng = random.Random(3)
+
+    async def analyze_report(text, lat, lon, evidence=None, severity_variation=None):
+        analyzed.append(text)
+        # Finish out of order so the checkpoint has to wait for stragglers
+        await asyncio.sleep(rng.uniform(0, 0.01))
+        return {
+            "summary": text, "disaster_type": "flood", "severity_score": 60, "location_name": "Test",
+            "evidence": {
+                "summarizer": {"summary": text, "source": "extractive"},
+                "classifier": {"disaster_type": "flood", "confidence": 0.8, "source": "keyword"},
+                "weather": {"conditions": "rain", "wind_speed": 3.0, "source": "mock"},
+                "geo": {"location_name": "Test", "source": "mock"},
+            },
+        }
+
+    monkeypatch.setattr("app.services.analyzer.analyze_report", analyze_report)
+
+
+@pytest.mark.asyncio
+async def test_backfill_analyzes_every_report_and_checkpoints(engine, monkeypatch):
+    analyzed = []
+    _fake_analyzer(monkeypatch, analyzed)
+
+    stats = await backfill.run_backfill(engine, concurrency=4, batch_size=7)
+    assert stats == {"processed": 25, "failed": 0, "last_id": 25}
+    assert len(analyzed) == 25
+
+    with Session(engine) as session:
+        assert all(report.is_analyzed and report.evidence for report in session.exec(select(Report)))
+        assert len(session.exec(select(Alert)).all()) == 25
+        checkpoint = session.get(BackfillCheckpoint, "default")
+        assert checkpoint.last_id == 25 and checkpoint.processed == 25 and checkpoint.finished_at
+
+    # A finished run is not repeated
+    assert (await backfill.run_backfill(engine))["processed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_backfill_resumes_after_crash(engine, monkeypatch):
+    analyzed = []
+    _fake_analyzer(monkeypatch, analyzed)
+
+    write_batch = backfill._write_batch
+    writes = []
+
+    def crashing_write(engine, name, batch):
+        if len(writes) == 2:
+            raise RuntimeError("killed")
+        writes.append(batch)
+        return write_batch(engine, name, batch)
+
+    monkeypatch.setattr(backfill, "_write_batch", crashing_write)
+    with pytest.raises(RuntimeError):
+        await backfill.run_backfill(engine, name="switch-to-real-ai", concurrency=3, batch_size=5)
+
+    with Session(engine) as session:
+        assert session.get(BackfillCheckpoint, "switch-to-real-ai").last_id == 10
+
+    monkeypatch.setattr(backfill, "_write_batch", write_batch)
+    analyzed.clear()
+    stats = await backfill.run_backfill(engine, name="switch-to-real-ai", concurrency=3, batch_size=5)
+    assert stats["processed"] == 15
+    assert sorted(analyzed) == sorted(f"flood {i}" for i in range(10, 25))
+
+
+@pytest.mark.asyncio
+async def test_backfill_leaves_unanalyzed_reports_to_the_live_queue(engine, monkeypatch):
+    analyzed = []
+    _fake_analyzer(monkeypatch, analyzed)
+    with Session(engine) as session:
+        pending = Report(text="flood pending", lat=50, lon=50, source="test")
+        session.add(pending)
+        session.commit()
+        pending_id = pending.id
+
+    stats = await backfill.run_backfill(engine, concurrency=4, batch_size=7)
+    assert stats["processed"] == 25
+    assert "flood pending" not in analyzed
+    with Session(engine) as session:
+        pending = session.get(Report, pending_id)
+        assert not pending.is_analyzed and pending.alert_id is None
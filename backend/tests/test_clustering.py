@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from sqlmodel import SQLModel, Session, create_engine
+from app.db.models import Alert, Report
+from app.services.clustering import attach_report, haversine_km
+
+
+def test_burst_of_reports_becomes_one_incident(engine, cluster):
+    """Test nearby, recent, compatible reports attach to the same alert"""
+    now = datetime.utcnow()
+
+    with Session(engine) as session:
+        first = cluster(session, 19.0760, 72.8777, "flood", 60, now)
+        assert first.report_count == 1
+
+        second = cluster(session, 19.0860, 72.8877, "flood", 80, now + timedelta(minutes=10))
+        assert second.id == first.id
+        assert second.report_count == 2
+        assert second.severity_score == 80
+        assert abs(second.lat - 19.081) < 1e-6
+
+        # Unclassified report nearby still joins the incident
+        third = cluster(session, 19.08, 72.88, "other", 40, now)
+        assert third.id == first.id and third.report_count == 3
+
+        # Different type, far away, or outside the time window opens new incidents
+        assert cluster(session, 19.08, 72.88, "fire", 70, now).report_count == 1
+        assert cluster(session, 28.61, 77.20, "flood", 70, now).report_count == 1
+        assert cluster(session, 19.08, 72.88, "flood", 70, now + timedelta(days=2)).report_count == 1
+
+
+def test_haversine_distance():
+    """Test great-circle distance helper"""
+    assert abs(haversine_km(19.0760, 72.8777, 28.6139, 77.2090) - 1153) < 5
+
+
+def test_attaches_from_stale_sessions_do_not_lose_updates(tmp_path, cluster):
+    """Test concurrent attaches to one incident both count, even from a session holding an old copy"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'alerts.db'}")
+    SQLModel.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        alert_id = cluster(session, 19.0, 72.0, "other", 40, now).id
+        session.commit()
+
+    with Session(engine) as stale, Session(engine) as other:
+        held = stale.get(Alert, alert_id)
+        assert held.report_count == 1
+
+        cluster(other, 19.01, 72.0, "other", 40, now)
+        other.commit()
+
+        report = Report(text="test", lat=19.02, lon=72.0, source="test", created_at=now)
+        stale.add(report)
+        stale.flush()
+        attach_report(stale, held, report, {"disaster_type": "flood", "severity_score": 30,
+                                            "evidence": {"classifier": {"confidence": 0.8}}})
+        stale.commit()
+
+    with Session(engine) as session:
+        alert = session.get(Alert, alert_id)
+        assert alert.report_count == 3
+        assert abs(alert.lat - 19.01) < 1e-9
+        # Upgraded from "other": scoring inputs now come from the report that set the type
+        assert alert.disaster_type == "flood" and alert.classifier_confidence == 0.8
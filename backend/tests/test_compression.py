@@ -0,0 +1,129 @@
+import gzip
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from app.core import compression
+from app.core.compression import CompressedPayloadCache, CompressionMiddleware, negotiate_encoding
+from app.db.models import Alert, Report
+from app.db.session import get_session
+from app.main import app
+from app.services.hot_store import hot_alerts
+
+ROWS = [{"id": i, "summary": "Flooding reported near the river bank"} for i in range(200)]
+
+
+@pytest.fixture(autouse=True)
+def gzip_only(monkeypatch):
+    # brotli is optional; pin negotiation to gzip whether or not it is installed
+    monkeypatch.setattr(compression, "brotli", None)
+
+
+@pytest.fixture
+def compress_calls(monkeypatch):
+    calls = []
+    compress = compression.compress
+
+    def counting_compress(body, encoding, **kwargs):
+        calls.append(encoding)
+        return compress(body, encoding, **kwargs)
+
+    monkeypatch.setattr(compression, "compress", counting_compress)
+    return calls
+
+
+@pytest.fixture
+def http():
+    demo = FastAPI()
+    demo.add_middleware(CompressionMiddleware)
+
+    @demo.get("/big")
+    def big():
+        return JSONResponse(ROWS)
+
+    @demo.get("/small")
+    def small():
+        return JSONResponse({"ok": True})
+
+    @demo.get("/stream")
+    def stream():
+        return StreamingResponse((f"{i}\n".encode() * 100 for i in range(20)), media_type="application/x-ndjson")
+
+    return TestClient(demo)
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("deflate") == "identity"
+    assert negotiate_encoding("gzip;q=0") == "identity"
+    assert negotiate_encoding("*") == "gzip"
+
+
+def test_negotiate_prefers_brotli_when_installed(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", object())
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("gzip, br;q=0.5") == "gzip"
+
+
+def test_large_bodies_are_compressed(http):
+    response = http.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content) / 5
+    assert response.json() == ROWS
+
+    assert "content-encoding" not in http.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in http.get("/big", headers={"Accept-Encoding": "identity"}).headers
+
+
+def test_streamed_bodies_are_compressed_per_chunk(http):
+    with http.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw) == b"".join(f"{i}\n".encode() * 100 for i in range(20))
+
+
+def test_payload_cache_compresses_once(compress_calls):
+    cache = CompressedPayloadCache(capacity=4)
+    body = b"[" + b",".join(b'{"id": %d}' % i for i in range(500)) + b"]"
+
+    for _ in range(3):
+        payload, encoding = cache.get("feed", "gzip", lambda: body)
+        assert encoding == "gzip" and gzip.decompress(payload) == body
+    assert cache.get("feed", "identity", lambda: body) == (body, "identity")
+    assert cache.get("tiny", "gzip", lambda: b"[]") == (b"[]", "identity")
+    assert compress_calls == ["gzip"]
+
+
+def test_hot_feed_is_served_precompressed(engine, compress_calls):
+    with Session(engine) as session:
+        for i in range(50):
+            report = Report(text="test", lat=10.0, lon=20.0, source="sms")
+            session.add(report)
+            session.flush()
+            session.add(Alert(report_id=report.id, disaster_type="flood", severity_score=50,
+                              summary=f"Flooding reported near the river bank {i}", location_name="Test"))
+        session.commit()
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = session_override
+    hot_alerts.load(engine, capacity=100)
+    try:
+        client = TestClient(app)
+        first = client.get("/api/v1/alerts", headers={"Accept-Encoding": "gzip"})
+        second = client.get("/api/v1/alerts", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/api/v1/alerts", headers={"Accept-Encoding": "identity"})
+    finally:
+        app.dependency_overrides.clear()
+        hot_alerts.unload()
+
+    assert first.headers["content-encoding"] == second.headers["content-encoding"] == "gzip"
+    assert first.content == second.content == plain.content
+    assert len(first.json()) == 50
+    # Compressed once by the route's payload cache, not again by the middleware
+    assert compress_calls == ["gzip"]
@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from app.integrations.concurrency import AdaptiveLimiter, UpstreamError
+
+
+async def _call(limiter: AdaptiveLimiter, delay: float = 0.0, error: Exception = None):
+    async def call():
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return "ok"
+    return await limiter.run(call)
+
+
+@pytest.mark.asyncio
+async def test_limit_caps_in_flight_calls():
+    limiter = AdaptiveLimiter("test-cap", initial=2, max_limit=2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        peak = max(peak, limiter.inflight)
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[limiter.run(call) for _ in range(10)])
+    assert peak == 2
+    assert limiter.inflight == 0
+
+
+@pytest.mark.asyncio
+async def test_additive_increase_when_saturated():
+    # A fixed 10ms call keeps the latency baseline well above scheduler or GC pauses
+    limiter = AdaptiveLimiter("test-increase", initial=2, max_limit=50, tolerance=100)
+    for _ in range(20):
+        await asyncio.gather(*[_call(limiter, delay=0.01) for _ in range(limiter.slots)])
+    assert limiter.limit > 5
+
+    # Calls that never fill the limit do not grow it
+    idle = AdaptiveLimiter("test-idle", initial=4, tolerance=100)
+    for _ in range(20):
+        await _call(idle, delay=0.01)
+    assert idle.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_multiplicative_decrease_on_overload():
+    limiter = AdaptiveLimiter("test-decrease", initial=10, backoff=0.5)
+
+    with pytest.raises(UpstreamError):
+        await _call(limiter, error=UpstreamError("throttled", 429))
+    assert limiter.limit == 5
+
+    # Client errors are not an overload signal
+    with pytest.raises(UpstreamError):
+        await _call(limiter, error=UpstreamError("bad request", 400))
+    assert limiter.limit == 5
+
+    # A burst of concurrent failures started before the decrease only halves once
+    results = await asyncio.gather(
+        *[_call(limiter, delay=0.01, error=UpstreamError("down", 503)) for _ in range(5)],
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, UpstreamError) for result in results)
+    assert limiter.limit == 2.5
+
+    with pytest.raises(UpstreamError):
+        await _call(limiter, error=UpstreamError("timeout", timed_out=True))
+    assert limiter.limit == 1.25
+
+
+@pytest.mark.asyncio
+async def test_latency_gradient_backs_off():
+    limiter = AdaptiveLimiter("test-latency", initial=8, tolerance=2.0, backoff=0.5)
+    for _ in range(3):
+        await _call(limiter, delay=0.01)
+    assert limiter.limit == 8
+    await _call(limiter, delay=0.08)
+    assert limiter.limit == 4
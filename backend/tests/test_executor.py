@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+from app.integrations.executor import STAGES, StageExecutor
+
+TEXTS = [
+    "Flash floods reported downtown, water levels rising rapidly.",
+    "Wildfire spreading through the national park, evacuations ordered.",
+    "Earthquake felt across the valley. Buildings shaking, aftershocks expected.",
+    "Volcano eruption with ash cloud drifting over the village.",
+    "Severe storm with high winds and heavy rain. Power outages reported.",
+]
+
+
+@pytest.mark.asyncio
+async def test_inline_runs_stage_functions_directly():
+    executor = StageExecutor(mode="inline")
+    assert await executor.run("classify", TEXTS[0]) == STAGES["classify"]([TEXTS[0]])[0]
+    assert await executor.run("summarize", TEXTS[2]) == STAGES["summarize"]([TEXTS[2]])[0]
+
+
+@pytest.mark.asyncio
+async def test_process_pool_batches_concurrent_calls():
+    executor = StageExecutor(mode="process", processes=2, batch_size=4, batch_wait_ms=20)
+    batches = []
+    submit = None
+
+    try:
+        pool = executor._get_pool()
+        submit = pool.submit
+
+        def recording_submit(function, items):
+            batches.append(len(items))
+            return submit(function, items)
+
+        pool.submit = recording_submit
+        texts = TEXTS * 2
+        classified, summaries = await asyncio.gather(
+            asyncio.gather(*(executor.run("classify", text) for text in texts)),
+            asyncio.gather(*(executor.run("summarize", text) for text in texts)),
+        )
+    finally:
+        executor.shutdown()
+
+    assert list(classified) == STAGES["classify"](texts)
+    assert list(summaries) == STAGES["summarize"](texts)
+    # Ten calls per stage arrive together: two full batches of four and one partial flushed by the timer
+    assert sorted(batches) == [2, 2, 4, 4, 4, 4]
@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+from datetime import datetime
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+import app.db.session as db_session
+from app.db.models import Alert, Report
+from app.main import app
+from app.schemas.alert import AlertFilter
+from app.services.export import ALERT_COLUMNS, alert_export_query, stream_export
+
+
+@pytest.fixture
+def export_engine(engine, monkeypatch):
+    with Session(engine) as session:
+        for i in range(25):
+            report = Report(text=f"report {i}", lat=10.0 + i, lon=20.0, source="sms")
+            session.add(report)
+            session.flush()
+            session.add(Alert(report_id=report.id, disaster_type=["flood", "fire"][i % 2], severity_score=i * 4,
+                              summary=f"alert {i}", location_name="Test", lat=10.0 + i, lon=20.0,
+                              source="sms", is_active=i % 5 != 0))
+            report.alert_id = i + 1
+        session.commit()
+    monkeypatch.setattr(db_session, "engine", engine)
+    return engine
+
+
+def test_stream_yields_one_chunk_per_batch(export_engine):
+    """Test the export is produced batch by batch rather than all at once"""
+    query = alert_export_query(AlertFilter(active_only=False))
+    chunks = list(stream_export(query, ALERT_COLUMNS, "ndjson", chunk_size=10))
+    assert len(chunks) == 3
+    rows = [json.loads(line) for chunk in chunks for line in chunk.decode().splitlines()]
+    assert [row["id"] for row in rows] == list(range(1, 26))
+    assert rows[0]["disaster_type"] == "flood"
+    assert datetime.fromisoformat(rows[0]["created_at"])
+
+
+def test_export_formats_and_filters(export_engine):
+    client = TestClient(app)
+
+    response = client.get("/api/v1/export/alerts?format=csv&type=fire&min_severity=40")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert rows and all(row["disaster_type"] == "fire" and int(row["severity_score"]) >= 40 for row in rows)
+    assert all(row["is_active"] == "True" for row in rows)
+
+    response = client.get("/api/v1/export/alerts?format=geojson&active_only=false&limit=5")
+    collection = response.json()
+    assert collection["type"] == "FeatureCollection"
+    assert len(collection["features"]) == 5
+    assert collection["features"][0]["geometry"] == {"type": "Point", "coordinates": [20.0, 10.0]}
+
+    response = client.get("/api/v1/export/reports?type=flood")
+    reports = [json.loads(line) for line in response.text.splitlines()]
+    assert len(reports) == 13
+    assert "attachment" in response.headers["content-disposition"]
+
+    assert client.get("/api/v1/export/alerts?format=xml").status_code == 422
@@ -0,0 +1,68 @@
+from sqlmodel import Session, select
+from app.db.models import AlertGridCell
+from app.services.alerts import deactivate_alert
+from app.services.grid import GRID_LEVELS, cell_index, get_grid_cells, level_for_zoom, rebuild_grid
+
+
+def _cells(session: Session):
+    return sorted(
+        (cell.level, cell.cell_x, cell.cell_y, cell.is_active, cell.alert_count, cell.severity_sum,
+         cell.severity_max, round(cell.lat_sum, 6), round(cell.lon_sum, 6))
+        for cell in session.exec(select(AlertGridCell)).all()
+    )
+
+
+def test_level_for_zoom():
+    assert level_for_zoom(0) == GRID_LEVELS[0]
+    assert level_for_zoom(5) == 6
+    assert level_for_zoom(20) == GRID_LEVELS[-1]
+    assert cell_index(-90.0, -180.0, 4) == (0, 0)
+
+
+def test_incremental_cells_match_rebuild(engine, cluster):
+    """Test grid cells kept up to date on insert, attach and deactivation equal a full rebuild"""
+
+    with Session(engine) as session:
+        cluster(session, 19.07, 72.87, "flood", 60)
+        cluster(session, 19.08, 72.88, "flood", 90)  # attaches, moves the centroid
+        cluster(session, 28.61, 77.20, "fire", 70)
+        storm = cluster(session, -33.86, 151.21, "storm", 95)
+        cluster(session, -33.0, 151.0, "fire", 40)
+        session.commit()
+
+        deactivate_alert(session, storm)
+        session.commit()
+        incremental = _cells(session)
+
+        rebuild_grid(session)
+        assert _cells(session) == incremental
+
+        world = get_grid_cells(session, (-90.0, -180.0, 90.0, 180.0), zoom=0)
+        assert world["level"] == GRID_LEVELS[0]
+        assert sum(cell["count"] for cell in world["cells"]) == 3
+        assert max(cell["max_severity"] for cell in world["cells"]) == 90
+
+        # The deactivated storm no longer raises the Sydney cell's max
+        sydney = get_grid_cells(session, (-35.0, 150.0, -32.0, 152.0), zoom=8)
+        assert [cell["max_severity"] for cell in sydney["cells"]] == [40]
+        everything = get_grid_cells(session, (-35.0, 150.0, -32.0, 152.0), zoom=8, active_only=False)
+        assert max(cell["max_severity"] for cell in everything["cells"]) == 95
+
+
+def test_response_size_is_bounded(engine, cluster):
+    """Test large bboxes at high zoom are coarsened to stay within max_cells"""
+
+    with Session(engine) as session:
+        for i in range(200):
+            cluster(session, -60 + (i % 20) * 6.1, -170 + (i // 20) * 34.3, "flood", i % 100)
+        session.commit()
+
+        result = get_grid_cells(session, (-90.0, -180.0, 90.0, 180.0), zoom=12, max_cells=500)
+        assert result["level"] < GRID_LEVELS[-1]
+        assert len(result["cells"]) <= 500
+        assert sum(cell["count"] for cell in result["cells"]) == 200
+
+        # A bbox crossing the antimeridian covers both edges
+        wrapped = get_grid_cells(session, (-90.0, 170.0, 90.0, -160.0), zoom=2)
+        lons = [cell["lon"] for cell in wrapped["cells"]]
+        assert any(lon < -160 for lon in lons) and not any(-150 < lon < 160 for lon in lons)
@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlmodel import Session
+from app.db.models import Alert, DisasterType, Report
+from app.db.session import get_session
+from app.main import app
+from app.schemas.alert import AlertFilter
+from app.services.alerts import deactivate_alert, get_filtered_alerts_with_reports
+from app.services.hot_store import hot_alerts
+
+TYPES = [DisasterType.FLOOD, DisasterType.FIRE, DisasterType.STORM]
+
+
+@pytest.fixture
+def engine(engine):
+    try:
+        yield engine
+    finally:
+        hot_alerts.unload()
+
+
+def _add_alerts(engine, count: int, start: int = 0):
+    base = datetime(2024, 1, 1)
+    with Session(engine) as session:
+        for i in range(start, start + count):
+            report = Report(text="test", lat=10.0, lon=20.0 + i, source=f"source-{i % 2}")
+            session.add(report)
+            session.flush()
+            session.add(Alert(
+                report_id=report.id, disaster_type=TYPES[i % 3], severity_score=(i * 37) % 101,
+                summary=f"alert {i}", location_name="Test", created_at=base + timedelta(minutes=i),
+                # Alternate alerts fall back to the report location
+                lat=10.0 if i % 2 else None, lon=None,
+            ))
+        session.commit()
+
+
+def _feed(engine, alert_filter):
+    with Session(engine) as session:
+        return [alert.model_dump() for alert in get_filtered_alerts_with_reports(session, alert_filter)]
+
+
+def _hot_feed(alert_filter):
+    alerts = hot_alerts.query(alert_filter)
+    if alerts is None:
+        return None
+    return [{name: getattr(alert, name) for name in (
+        "id", "alert_type", "summary", "location", "lat", "lon", "severity", "timestamp", "source", "report_count"
+    )} for alert in alerts]
+
+
+FILTERS = [
+    AlertFilter(),
+    AlertFilter(limit=5),
+    AlertFilter(type="fire", limit=4),
+    AlertFilter(type="FLOOD"),
+    AlertFilter(type="bogus"),
+    AlertFilter(min_severity=90, limit=3),
+    AlertFilter(min_severity=20, limit=10),
+    AlertFilter(type="storm", min_severity=50),
+]
+
+
+def test_complete_store_matches_database_and_follows_commits(engine):
+    _add_alerts(engine, 30)
+    hot_alerts.load(engine, capacity=100)
+    assert len(hot_alerts) == 30
+
+    # Commits through the ORM only mark alerts; the next sync applies them
+    _add_alerts(engine, 5, start=30)
+    with Session(engine) as session:
+        for alert_id in (3, 31):
+            deactivate_alert(session, session.get(Alert, alert_id))
+        session.commit()
+    assert len(hot_alerts) == 30
+    hot_alerts.sync()
+    assert len(hot_alerts) == 33
+
+    for alert_filter in FILTERS:
+        assert _hot_feed(alert_filter) == _feed(engine, alert_filter)
+
+    # Inactive and archived listings are left to the database
+    assert hot_alerts.query(AlertFilter(active_only=False)) is None
+    assert hot_alerts.query(AlertFilter(archived=True)) is None
+
+
+def test_partial_store_answers_only_what_it_holds(engine):
+    _add_alerts(engine, 30)
+    hot_alerts.load(engine, capacity=10)
+    assert len(hot_alerts) == 10
+
+    # The newest 5 are all held; an unbounded feed or a rare match may reach older alerts
+    assert _hot_feed(AlertFilter(limit=5)) == _feed(engine, AlertFilter(limit=5))
+    assert hot_alerts.query(AlertFilter()) is None
+    assert hot_alerts.query(AlertFilter(type="fire", limit=5)) is None
+
+    # New alerts evict the oldest held
+    _add_alerts(engine, 3, start=30)
+    hot_alerts.sync()
+    assert len(hot_alerts) == 10
+    assert _hot_feed(AlertFilter(limit=10)) == _feed(engine, AlertFilter(limit=10))
+
+
+def test_sync_applies_changes_from_other_processes(engine):
+    _add_alerts(engine, 10)
+    hot_alerts.load(engine, capacity=100)
+
+    # Core statements bypass the session hooks, like writes from another process
+    with engine.begin() as conn:
+        conn.execute(update(Alert.__table__).where(Alert.__table__.c.id == 2)
+                     .values(is_active=False, updated_at=datetime.utcnow()))
+        conn.execute(update(Alert.__table__).where(Alert.__table__.c.id == 5)
+                     .values(severity_score=99, updated_at=datetime.utcnow()))
+    assert len(hot_alerts) == 10
+
+    version = hot_alerts.version
+    hot_alerts.sync()
+    assert len(hot_alerts) == 9
+    assert hot_alerts.version != version
+
+    # Syncs re-read recent changes; unchanged alerts keep their encoding and the store version
+    encoded = hot_alerts.query(AlertFilter(min_severity=99))[0].json
+    version = hot_alerts.version
+    hot_alerts.sync()
+    assert hot_alerts.version == version
+    assert hot_alerts.query(AlertFilter(min_severity=99))[0]._json is encoded
+    assert _hot_feed(AlertFilter(min_severity=99))[0]["id"] == 5
+    for alert_filter in FILTERS:
+        assert _hot_feed(alert_filter) == _feed(engine, alert_filter)
+
+
+def test_alerts_route_serves_the_feed_from_the_store(engine, monkeypatch):
+    _add_alerts(engine, 10)
+    hot_alerts.load(engine, capacity=100)
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    def no_query(session, alert_filter):
+        raise AssertionError("queried the database")
+
+    app.dependency_overrides[get_session] = session_override
+    try:
+        monkeypatch.setattr("app.api.routes_alerts.get_filtered_alerts_json", no_query)
+        response = TestClient(app).get("/api/v1/alerts", params={"type": "flood", "limit": 2})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200
+    assert [alert["id"] for alert in response.json()] == [10, 7]
+    assert response.json()[0]["alert_type"] == "flood"
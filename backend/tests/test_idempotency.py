@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from app.api import routes_reports
+from app.db.models import IdempotencyKey, Report
+from app.db.session import get_session
+from app.main import app
+from app.services.idempotency import sweep_idempotency_keys
+
+REPORT = {"text": "Flooding on main street", "lat": 19.07, "lon": 72.87, "source": "sms_gateway"}
+
+
+@pytest.fixture
+def client(engine, monkeypatch):
+    submitted = []
+    monkeypatch.setattr("app.api.routes_reports.submit_report", lambda report: submitted.append(report.id))
+    monkeypatch.setattr("app.services.admission.backlog_status", lambda: (0, 0.0))
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = session_override
+    try:
+        yield TestClient(app), engine, submitted
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_retries_replay_the_original_response(client):
+    http, engine, submitted = client
+    first = http.post("/api/v1/report", json=REPORT, headers={"Idempotency-Key": "msg-1"})
+    retry = http.post("/api/v1/report", json=REPORT, headers={"Idempotency-Key": "msg-1"})
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+
+    # dedup_key in the body works the same; keys are scoped per source
+    http.post("/api/v1/report", json={**REPORT, "dedup_key": "msg-2"})
+    http.post("/api/v1/report", json={**REPORT, "dedup_key": "msg-2"})
+    http.post("/api/v1/report", json={**REPORT, "source": "mobile_app"}, headers={"Idempotency-Key": "msg-1"})
+
+    with Session(engine) as session:
+        assert len(session.exec(select(Report)).all()) == 3
+    assert len(submitted) == 3
+
+
+def test_replay_returns_the_stored_response_not_the_current_report(client):
+    http, engine, _ = client
+    first = http.post("/api/v1/report", json=REPORT, headers={"Idempotency-Key": "msg-1"})
+
+    with Session(engine) as session:
+        report = session.get(Report, first.json()["report"]["id"])
+        report.is_analyzed = True
+        session.add(report)
+        session.commit()
+
+    retry = http.post("/api/v1/report", json=REPORT, headers={"Idempotency-Key": "msg-1"})
+    assert retry.status_code == first.status_code
+    assert retry.json() == first.json()
+    assert retry.json()["report"]["is_analyzed"] is False
+
+
+def test_key_reused_for_different_report_is_rejected(client):
+    http, _, _ = client
+    http.post("/api/v1/report", json=REPORT, headers={"Idempotency-Key": "msg-1"})
+    response = http.post("/api/v1/report", json={**REPORT, "text": "Something else"},
+                         headers={"Idempotency-Key": "msg-1"})
+    assert response.status_code == 422
+
+
+def test_expired_keys_are_swept_and_reusable(client):
+    http, engine, submitted = client
+    http.post("/api/v1/report", json=REPORT, headers={"Idempotency-Key": "msg-1"})
+    http.post("/api/v1/report", json=REPORT, headers={"Idempotency-Key": "msg-2"})
+
+    with Session(engine) as session:
+        for entry in session.exec(select(IdempotencyKey)):
+            entry.expires_at = datetime.utcnow() - timedelta(seconds=1)
+            session.add(entry)
+        session.commit()
+
+    # An expired key that has not been swept yet no longer replays
+    assert "Idempotent-Replayed" not in http.post(
+        "/api/v1/report", json=REPORT, headers={"Idempotency-Key": "msg-1"}).headers
+    assert len(submitted) == 3
+
+    with Session(engine) as session:
+        assert sweep_idempotency_keys(session, batch_size=1) == 1
+        assert [entry.key for entry in session.exec(select(IdempotencyKey))] == ["msg-1"]
+
+
+def test_concurrent_duplicate_loses_on_the_unique_index(client, monkeypatch):
+    http, engine, submitted = client
+    first = http.post("/api/v1/report", json=REPORT, headers={"Idempotency-Key": "msg-1"})
+
+    find_replay = routes_reports.find_replay
+    calls = []
+
+    def racing_find_replay(*args, **kwargs):
+        # The duplicate's first lookup ran before the original committed
+        calls.append(1)
+        return None if len(calls) == 1 else find_replay(*args, **kwargs)
+
+    monkeypatch.setattr(routes_reports, "find_replay", racing_find_replay)
+    retry = http.post("/api/v1/report", json=REPORT, headers={"Idempotency-Key": "msg-1"})
+    assert retry.status_code == 200
+    assert retry.json()["report"]["id"] == first.json()["report"]["id"]
+    with Session(engine) as session:
+        assert len(session.exec(select(Report)).all()) == 1
+    assert len(submitted) == 1
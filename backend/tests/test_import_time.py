@@ -0,0 +1,36 @@
+import json
+import os
+import subprocess
+import sys
+from app.core.config import settings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first analysis, never by importing the API
+LAZY_MODULES = ["numpy", "httpx", "multiprocessing", "app.integrations.summarizer",
+                "app.integrations.executor", "app.services.rescoring"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+print(json.dumps({"seconds": time.perf_counter() - start,
+                  "loaded": [name for name in %r if name in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+
+def _cold_import():
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=BACKEND_DIR,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_cold_import_of_app_main_stays_within_budget():
+    runs = [_cold_import() for _ in range(3)]
+    assert runs[0]["loaded"] == []
+    # Best of three, so a busy machine does not fail the budget
+    fastest = min(run["seconds"] for run in runs)
+    assert fastest < settings.IMPORT_TIME_BUDGET_SECONDS, (
+        f"importing app.main took {fastest:.2f}s, over the {settings.IMPORT_TIME_BUDGET_SECONDS}s budget; "
+        "see python -m scripts.profile_imports"
+    )
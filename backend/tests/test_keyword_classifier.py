@@ -0,0 +1,69 @@
+import pytest
+from app.integrations.classifier import ClassifierAdapter
+from app.integrations.keyword_classifier import KeywordClassifier
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return KeywordClassifier(min_score=2.0, min_share=0.6)
+
+
+def test_word_boundaries_avoid_substring_false_positives(classifier):
+    """Test "ash" does not match inside "crash" or "wash" """
+    result = classifier.classify("Car crash on the highway, people asked to wash hands")
+    assert result["disaster_type"] == "other"
+    assert result["ambiguous"]
+
+    result = classifier.classify("Thick ash plume over the village after the eruption")
+    assert result["disaster_type"] == "volcano"
+    assert not result["ambiguous"]
+
+
+def test_weighted_scoring_is_independent_of_branch_order(classifier):
+    """Test the strongest evidence wins even when weaker terms of other types appear"""
+    result = classifier.classify("Strong earthquake, water pipes burst and rain expected")
+    assert result["disaster_type"] == "earthquake"
+    assert result["matched_terms"][0] == "earthquake"
+
+
+def test_multilingual_lexicons_and_batch_api(classifier):
+    """Test non-English lexicons and batch classification"""
+    results = classifier.classify_batch([
+        "Inundación en el centro de la ciudad",
+        "Incendie de forêt près du village",
+        "Terremoto de magnitud 6",
+        "Huracán acercándose a la costa",
+    ])
+    assert [r["disaster_type"] for r in results] == ["flood", "fire", "earthquake", "storm"]
+
+
+@pytest.mark.asyncio
+async def test_local_tier_answers_unambiguous_texts_without_remote_call():
+    """Test real mode answers clear texts locally"""
+    adapter = ClassifierAdapter()
+    adapter.use_mock = False
+    result = await adapter.analyze("Flash flooding after heavy rain, roads submerged")
+    assert result["source"] == "local"
+    assert result["disaster_type"] == "flood"
+
+
+@pytest.mark.parametrize("text", [
+    "Someone broke the window of the shop",
+    "She hailed a taxi outside the station",
+    "Nueva exposición en la galeria del centro",
+    "A cruel prank near the school",
+    "A rainbow over the bay this morning",
+    "Staff burnout reported at the clinic",
+])
+def test_short_stems_do_not_match_unrelated_words(classifier, text):
+    """Test storm, flood and fire terms do not fire inside unrelated words"""
+    result = classifier.classify(text)
+    assert result["disaster_type"] == "other"
+    assert result["matched_terms"] == []
+
+
+def test_listed_inflections_still_match(classifier):
+    """Test the inflections that replaced wildcards keep classifying"""
+    assert classifier.classify("Strong winds and a hailstorm hit the coast")["disaster_type"] == "storm"
+    assert classifier.classify("Les crues menacent la ville")["disaster_type"] == "flood"
+    assert classifier.classify("Houses burning after the blaze spread")["disaster_type"] == "fire"
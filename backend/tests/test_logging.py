@@ -0,0 +1,61 @@
+import json
+import logging
+import queue
+from app.core.logging_config import (
+    DroppingQueueHandler, JsonFormatter, RateLimitFilter, SamplingFilter, parse_logger_map
+)
+
+
+def _record(name: str, level: int = logging.INFO, msg: str = "hello %s", args=("world",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_json_formatter_includes_extra_fields():
+    """Test structured JSON output"""
+    record = _record("app.services.alerts")
+    record.report_id = 42
+
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["message"] == "hello world"
+    assert payload["logger"] == "app.services.alerts"
+    assert payload["level"] == "INFO"
+    assert payload["report_id"] == 42
+
+
+def test_exceptions_keep_their_own_field_through_the_queue():
+    """Test tracebacks logged through the queue handler reach the JSON output as exc_info"""
+    log_queue = queue.Queue()
+    logger = logging.getLogger("test.logging.queue")
+    logger.propagate = False
+    handler = DroppingQueueHandler(log_queue)
+    logger.addHandler(handler)
+    try:
+        try:
+            raise ValueError("bad coordinates")
+        except ValueError:
+            logger.exception("Failed to analyze report %s", 7)
+    finally:
+        logger.removeHandler(handler)
+        logger.propagate = True
+
+    payload = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+    assert payload["message"] == "Failed to analyze report 7"
+    assert payload["level"] == "ERROR"
+    assert payload["exc_info"].startswith("Traceback")
+    assert "ValueError: bad coordinates" in payload["exc_info"]
+
+
+def test_sampling_and_rate_limit_apply_to_logger_hierarchy():
+    """Test per-logger sampling and rate limiting of high-volume records"""
+    assert parse_logger_map("app.services=0.5, app.api=10") == {"app.services": 0.5, "app.api": 10.0}
+
+    sampler = SamplingFilter({"app.services": 0.0})
+    assert not sampler.filter(_record("app.services.analyzer"))
+    assert sampler.filter(_record("app.api.routes_reports"))
+    # Warnings and errors are never sampled away
+    assert sampler.filter(_record("app.services.analyzer", logging.WARNING))
+
+    limiter = RateLimitFilter({"app.services.alerts": 3})
+    allowed = sum(limiter.filter(_record("app.services.alerts")) for _ in range(10))
+    assert allowed == 3
+    assert limiter.filter(_record("app.services.alerts", logging.ERROR))
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from sqlmodel import Session, select
+from app.db.models import Alert, AlertArchive, AlertRollup
+from app.db.seed_realistic import generate_alerts_from_reports, generate_realistic_reports
+from app.schemas.alert import AlertFilter
+from app.services.alerts import get_filtered_alerts_with_reports
+from app.services.maintenance import archive_alerts, expire_alerts, parse_ttl_hours
+
+
+def test_parse_ttl_hours():
+    assert parse_ttl_hours("storm=24, earthquake=72,bad") == {"storm": 24.0, "earthquake": 72.0}
+
+
+def test_expiry_follows_per_type_ttl(engine, cluster, monkeypatch):
+    """Test storms expire after 24h while earthquakes stay active until 72h"""
+    monkeypatch.setattr("app.core.config.settings.ALERT_TTL_HOURS", "storm=24,earthquake=72")
+    now = datetime.utcnow()
+
+    with Session(engine) as session:
+        storm = cluster(session, 10.0, 10.0, "storm", created_at=now - timedelta(hours=30))
+        quake = cluster(session, 20.0, 10.0, "earthquake", created_at=now - timedelta(hours=30))
+        fresh = cluster(session, 30.0, 10.0, "storm", created_at=now - timedelta(hours=1))
+        session.commit()
+
+        assert expire_alerts(session, now=now, batch_size=1) == 1
+        assert not session.get(Alert, storm.id).is_active
+        assert session.get(Alert, quake.id).is_active
+        assert session.get(Alert, fresh.id).is_active
+
+        assert expire_alerts(session, now=now + timedelta(hours=48)) == 2
+        rollups = session.exec(select(AlertRollup)).all()
+        assert {rollup.is_active for rollup in rollups} == {False}
+
+
+def test_archive_moves_expired_alerts_out_of_hot_table(engine, cluster, monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.ARCHIVE_AFTER_HOURS", 0)
+    now = datetime.utcnow()
+
+    with Session(engine) as session:
+        alerts = [cluster(session, 10.0 + i, 10.0, "flood", created_at=now - timedelta(days=10)) for i in range(5)]
+        live = cluster(session, 40.0, 10.0, "fire", created_at=now)
+        session.commit()
+        ids = [alert.id for alert in alerts]
+
+        expire_alerts(session, now=now)
+        assert archive_alerts(session, now=now + timedelta(seconds=1), batch_size=2) == 5
+
+        assert session.exec(select(Alert.id)).all() == [live.id]
+        archived = session.exec(select(AlertArchive).order_by(AlertArchive.id)).all()
+        assert [alert.id for alert in archived] == ids
+        assert all(not alert.is_active and alert.disaster_type == "flood" for alert in archived)
+        # Aggregates only describe the hot table
+        assert sum(rollup.alert_count for rollup in session.exec(select(AlertRollup)).all()) == 1
+
+        hot = get_filtered_alerts_with_reports(session, AlertFilter(active_only=False))
+        assert [alert.id for alert in hot] == [live.id]
+        cold = get_filtered_alerts_with_reports(session, AlertFilter(archived=True, type="flood"))
+        assert sorted(alert.id for alert in cold) == ids
+
+
+def test_seeded_active_alerts_survive_the_first_expiry_pass(engine):
+    """Test demo data is seeded with active incidents inside their TTL"""
+    with Session(engine) as session:
+        reports = generate_realistic_reports(40)
+        session.add_all(reports)
+        session.commit()
+        alerts = generate_alerts_from_reports(reports)
+        session.add_all(alerts)
+        session.commit()
+
+        assert expire_alerts(session) == 0
@@ -0,0 +1,67 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from app.db import session as db_session
+from app.main import app
+from app.core.metrics import Histogram, Counter, Registry, BacklogTracker
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test histogram exposition format"""
+    registry = Registry()
+    histogram = registry.register(Histogram("test_latency_seconds", "Test latency", ("stage",),
+                                            buckets=(0.1, 1.0)))
+    histogram.labels("classify").observe(0.05)
+    histogram.labels("classify").observe(0.5)
+    histogram.labels("classify").observe(5)
+
+    output = registry.render()
+    assert 'test_latency_seconds_bucket{stage="classify",le="0.1"} 1' in output
+    assert 'test_latency_seconds_bucket{stage="classify",le="1"} 2' in output
+    assert 'test_latency_seconds_bucket{stage="classify",le="+Inf"} 3' in output
+    assert 'test_latency_seconds_count{stage="classify"} 3' in output
+
+
+def test_counter_and_backlog_tracker():
+    """Test counters and backlog depth/age tracking"""
+    registry = Registry()
+    counter = registry.register(Counter("test_cache_requests", "Cache lookups", ("result",)))
+    counter.labels("hit").inc()
+    counter.labels("hit").inc()
+    assert 'test_cache_requests_total{result="hit"} 2' in registry.render()
+
+    backlog = BacklogTracker()
+    backlog.add(1)
+    backlog.add(2)
+    assert backlog.depth() == 2
+    assert backlog.oldest_age() >= 0
+    assert backlog.remove(1) is not None
+    assert backlog.remove(1) is None
+    assert backlog.depth() == 1
+
+
+def test_metrics_endpoint_exposes_route_latency():
+    """Test /metrics endpoint after a request has been served"""
+    client = TestClient(app)
+    client.get("/")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'alertrix_http_request_duration_seconds_count{method="GET",route="/",status="200"}' in response.text
+    assert "alertrix_analysis_backlog " in response.text
+
+
+def test_failed_queries_do_not_leak_start_times(engine):
+    for name, listener in (("before_cursor_execute", db_session._before_cursor_execute),
+                           ("after_cursor_execute", db_session._after_cursor_execute),
+                           ("handle_error", db_session._handle_error)):
+        event.listen(engine, name, listener)
+
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_start_time"] == []
@@ -0,0 +1,38 @@
+import os
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import create_engine
+from app.core.config import settings
+from app.core.profiling import install_profiling, timed_phase
+
+
+def test_server_timing_and_sampled_profile(tmp_path, monkeypatch):
+    """Test Server-Timing phases and profile dumps when profiling is enabled"""
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(settings, "PROFILING_INTERVAL_MS", 1.0)
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        with timed_phase("adapter_classifier"):
+            pass
+        return [{"id": 1}]
+
+    install_profiling(app, engine)
+
+    response = TestClient(app).get("/items")
+    assert response.status_code == 200
+
+    server_timing = response.headers["server-timing"]
+    for phase in ("db;dur=", "adapter_classifier;dur=", "serialize;dur=", "total;dur="):
+        assert phase in server_timing
+
+    profiles = os.listdir(tmp_path)
+    assert len(profiles) == 1
+    assert profiles[0].endswith("-GET-items.folded")
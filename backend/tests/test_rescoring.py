@@ -0,0 +1,79 @@
+import random
+import numpy as np
+from sqlmodel import SQLModel, Session, create_engine, select
+from app.db.models import Alert, Report
+from app.services.analyzer import ReportAnalyzer, calculate_base_severity
+from app.services.clustering import set_scoring_inputs
+from app.services.rescoring import rescore_alerts, score_severity, score_severity_vectorized
+
+TYPES = ["flood", "fire", "earthquake", "storm", "volcano", "other"]
+CONDITIONS = ["clear", "cloudy", "rainy", "stormy", "foggy", "light rain", ""]
+
+
+def test_vectorized_rules_match_scalar_rules():
+    """Test vectorized scoring agrees with the per-report rules"""
+    rng = random.Random(7)
+    types = [rng.choice(TYPES) for _ in range(2000)]
+    confidences = [rng.uniform(0, 1) for _ in range(2000)]
+    conditions = [rng.choice(CONDITIONS) for _ in range(2000)]
+    wind_speeds = [round(rng.uniform(0, 25), 1) for _ in range(2000)]
+    variations = [rng.randint(-5, 5) for _ in range(2000)]
+
+    vectorized = score_severity_vectorized(types, np.array(confidences), conditions, np.array(wind_speeds),
+                                           np.array(variations))
+    expected = [score_severity(*row) for row in zip(types, confidences, conditions, wind_speeds, variations)]
+    assert vectorized.tolist() == expected
+
+
+def test_rescore_alerts_updates_changed_rows_in_chunks():
+    """Test bulk rescoring writes back only alerts with scoring inputs"""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        report = Report(text="test", lat=0, lon=0, source="test")
+        session.add(report)
+        session.flush()
+        session.add(Alert(report_id=report.id, disaster_type="flood", severity_score=1, summary="s",
+                          location_name="l", classifier_confidence=0.9, weather_conditions="rainy",
+                          wind_speed=3.0, severity_variation=-4))
+        session.add(Alert(report_id=report.id, disaster_type="storm", severity_score=1, summary="s",
+                          location_name="l"))
+        session.commit()
+
+        stats = rescore_alerts(session, chunk_size=1)
+        assert stats == {"scanned": 1, "changed": 1}
+
+        scores = sorted(alert.severity_score for alert in session.exec(select(Alert)))
+        assert scores == [1, score_severity("flood", 0.9, "rainy", 3.0, -4)]
+
+
+def test_rescoring_reproduces_live_scores():
+    """Test rescoring an alert scored by the analyzer leaves its severity unchanged"""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(3)
+    analyzer = ReportAnalyzer()
+
+    with Session(engine) as session:
+        for _ in range(50):
+            report = Report(text="test", lat=0, lon=0, source="test")
+            session.add(report)
+            session.flush()
+            disaster_type, confidence = rng.choice(TYPES), rng.uniform(0, 1)
+            conditions, wind_speed = rng.choice(CONDITIONS), round(rng.uniform(0, 25), 1)
+            variation = rng.randint(-5, 5)
+            alert = Alert(report_id=report.id, disaster_type=disaster_type, summary="s", location_name="l")
+            alert.severity_score = analyzer._adjust_severity_by_weather(
+                calculate_base_severity(disaster_type, confidence), disaster_type,
+                {"conditions": conditions, "wind_speed": wind_speed}, variation=variation,
+            )
+            set_scoring_inputs(alert, {
+                "severity_variation": variation,
+                "evidence": {"classifier": {"confidence": confidence},
+                             "weather": {"conditions": conditions, "wind_speed": wind_speed}},
+            })
+            session.add(alert)
+        session.commit()
+
+        assert rescore_alerts(session) == {"scanned": 50, "changed": 0}
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+from sqlmodel import Session, select
+from app.db.models import AlertRollup
+from app.schemas.alert import AlertFilter
+from app.services.alerts import deactivate_alert
+from app.services.rollups import get_alert_stats, hour_bucket, rebuild_rollups, severity_bucket
+
+
+def _rollup_rows(session: Session):
+    rows = session.exec(select(AlertRollup)).all()
+    return sorted(
+        (row.bucket_start, row.disaster_type.value, row.severity_bucket, row.source, row.is_active,
+         row.alert_count, row.report_count, row.severity_sum, row.severity_max)
+        for row in rows
+    )
+
+
+def test_severity_bucket_bounds():
+    assert severity_bucket(0) == 0
+    assert severity_bucket(59) == 50
+    assert severity_bucket(90) == 90
+    assert severity_bucket(100) == 90
+
+
+def test_incremental_rollups_match_rebuild(engine, cluster):
+    """Test rollups kept up to date on insert, attach and deactivation equal a full rebuild"""
+    now = datetime.utcnow()
+
+    with Session(engine) as session:
+        flood = cluster(session, 19.07, 72.87, "flood", 62, now)
+        cluster(session, 19.08, 72.88, "flood", 85, now + timedelta(minutes=5))  # moves to the 80 band
+        cluster(session, 28.61, 77.20, "flood", 64, now, source="sms")
+        fire = cluster(session, 12.97, 77.59, "fire", 40, now + timedelta(hours=2))
+        cluster(session, 40.0, -3.7, "other", 30, now)
+        session.commit()
+
+        deactivate_alert(session, fire)
+        session.commit()
+        incremental = _rollup_rows(session)
+
+        rebuild_rollups(session)
+        assert _rollup_rows(session) == incremental
+
+        active_fire = get_alert_stats(session, AlertFilter(type="fire"), ["disaster_type"])
+        assert active_fire == []
+
+        stats = get_alert_stats(session, AlertFilter(), ["disaster_type"])
+        by_type = {bucket["disaster_type"]: bucket for bucket in stats}
+        assert by_type["flood"]["alert_count"] == 2
+        assert by_type["flood"]["report_count"] == 3
+        assert by_type["flood"]["max_severity"] == 85
+        assert by_type["flood"]["avg_severity"] == 74.5
+        assert flood.report_count == 2
+
+
+def test_stats_fast_path_matches_live_aggregation(engine, cluster):
+    """Test rollup-served stats agree with the live GROUP BY over alerts"""
+    start = datetime.utcnow()
+    since = hour_bucket(start) - timedelta(hours=1)
+    until = since + timedelta(hours=3)
+
+    with Session(engine) as session:
+        for i in range(30):
+            cluster(session, 10.0 + i, 20.0, ["flood", "fire", "storm"][i % 3], (i * 7) % 101, start,
+                    source=["twitter", "sms"][i % 2])
+        session.commit()
+
+        group_by = ["disaster_type", "severity_bucket", "source", "hour"]
+        # min_severity=40 is served from rollups, 40 - 1 (then filtered) forces the live path
+        from_rollups = get_alert_stats(session, AlertFilter(min_severity=40), group_by, since=since, until=until)
+        live = get_alert_stats(session, AlertFilter(min_severity=39), group_by, since=since, until=until)
+        live = [bucket for bucket in live if bucket["severity_bucket"] >= 40]
+
+        def key(bucket):
+            return tuple(bucket[name] for name in group_by)
+
+        assert sorted(from_rollups, key=key) == sorted(live, key=key)
+        assert sum(bucket["alert_count"] for bucket in from_rollups) > 0
+
+
+def test_stats_above_the_top_band_are_aggregated_live(engine, cluster):
+    """Test min_severity=100 counts only severity-100 alerts, though the 90 band holds 90-100"""
+    now = datetime.utcnow()
+
+    with Session(engine) as session:
+        cluster(session, 10.0, 20.0, "flood", 100, now)
+        cluster(session, 30.0, 20.0, "flood", 95, now)
+        cluster(session, 50.0, 20.0, "fire", 100, now)
+        session.commit()
+
+        stats = get_alert_stats(session, AlertFilter(min_severity=100), ["disaster_type"])
+        by_type = {bucket["disaster_type"]: bucket for bucket in stats}
+        assert by_type["flood"]["alert_count"] == 1
+        assert by_type["fire"]["alert_count"] == 1
+        assert by_type["flood"]["avg_severity"] == 100
+
+        top_band = get_alert_stats(session, AlertFilter(min_severity=90), ["disaster_type"])
+        assert {bucket["disaster_type"]: bucket["alert_count"] for bucket in top_band} == {"flood": 2, "fire": 1}
@@ -0,0 +1,108 @@
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from app.db.models import Alert, Report
+from app.db.session import get_session
+from app.main import app
+from app.schemas.alert import AlertFilter
+from app.services.search import ensure_search_index, fts_query, search
+
+
+def _incident(session: Session, text: str, summary: str, disaster_type: str, severity: int, active: bool = True):
+    report = Report(text=text, lat=19.07, lon=72.87, source="test")
+    session.add(report)
+    session.flush()
+    alert = Alert(report_id=report.id, disaster_type=disaster_type, severity_score=severity, summary=summary,
+                  location_name="Mumbai", is_active=active, created_at=datetime.utcnow())
+    session.add(alert)
+    session.flush()
+    report.alert_id = alert.id
+    session.add(report)
+    return alert
+
+
+def test_fts_query_quotes_user_input():
+    assert fts_query('bridge "main street" collaps*') == '"bridge" "main street" "collaps"*'
+    assert fts_query('NEAR(a b) OR text:x') == '"NEAR" "a" "b" "OR" "text" "x"'
+    assert fts_query(' -" ') is None
+
+
+def test_index_built_from_existing_rows_and_kept_in_sync(engine):
+    with Session(engine) as session:
+        flood_id = _incident(session, "Water rising near the old bridge", "Flooding near bridge", "flood", 60).id
+        session.commit()
+
+    ensure_search_index(engine)
+    with Session(engine) as session:
+        fire = _incident(session, "Bridge collapsed after the fire", "Bridge collapse and fire", "fire", 90)
+        _incident(session, "Bridge closed last week", "Closed bridge", "other", 10, active=False)
+        session.add(Report(text="Collapsed bridge on Linking Road, people trapped", lat=0, lon=0, source="sms"))
+        session.commit()
+
+        results = search(session, "bridge collapse", AlertFilter())
+        # Stemming matches "collapsed"; every term must match
+        assert [hit["id"] for hit in results["alerts"]] == [fire.id]
+        assert {hit["alert_id"] for hit in results["reports"]} == {fire.id, None}
+        assert "<mark>" in results["reports"][0]["snippet"]
+
+        assert search(session, "bridge", AlertFilter(active_only=False))["alerts"][-1]["alert_type"] is not None
+        filtered = search(session, "bridge", AlertFilter(type="flood"))
+        assert [hit["id"] for hit in filtered["alerts"]] == [flood_id]
+        assert [hit["alert_id"] for hit in filtered["reports"]] == [flood_id]
+
+        # Updated summaries and deleted rows leave the index
+        fire.summary = "Structure fire downtown"
+        session.add(fire)
+        session.commit()
+        assert search(session, "collapse", AlertFilter())["alerts"] == []
+        session.delete(session.get(Alert, flood_id))
+        session.commit()
+        assert search(session, "flooding", AlertFilter())["alerts"] == []
+
+
+def test_search_endpoint(engine):
+    ensure_search_index(engine)
+    with Session(engine) as session:
+        _incident(session, "Landslide blocks the highway", "Landslide on highway", "other", 70)
+        session.commit()
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = session_override
+    try:
+        client = TestClient(app)
+        response = client.get("/api/v1/search", params={"q": "highway", "min_severity": 50})
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["alerts"]) == len(body["reports"]) == 1
+        assert body["alerts"][0]["snippet"] == "Landslide on <mark>highway</mark>"
+        assert client.get("/api/v1/search", params={"q": "highway", "type": "lava"}).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_search_endpoint_without_index(engine):
+    """Test the endpoint says search is unavailable (e.g. SQLite lacking FTS5) instead of erroring"""
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = session_override
+    try:
+        assert TestClient(app).get("/api/v1/search", params={"q": "highway"}).status_code == 503
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_ranking_is_bounded_to_newest_matches(engine, monkeypatch):
+    ensure_search_index(engine)
+    monkeypatch.setattr("app.core.config.settings.SEARCH_MAX_CANDIDATES", 2)
+    with Session(engine) as session:
+        for text in ["smoke smoke smoke", "smoke", "smoke near school", "smoke over market"]:
+            session.add(Report(text=text, lat=0, lon=0, source="sms"))
+        session.commit()
+        # The best match is not among the two newest, so it is not ranked
+        ids = {hit["id"] for hit in search(session, "smoke", AlertFilter())["reports"]}
+        assert ids == {3, 4}
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from app.db.models import AlertHistogram, Report, ReportVolume
+from app.db.session import get_session
+from app.main import app
+from app.services.alert_events import alert_changed, snapshot_alert
+from app.services.alerts import deactivate_alert
+from app.services.clustering import cluster_report
+from app.services.maintenance import archive_alerts
+from app.services.timeseries import bucket_count, get_timeseries, plan_interval, rebuild_timeseries, report_received
+
+T0 = datetime(2026, 3, 1, 12, 0)
+
+
+def _alert(session: Session, created_at: datetime, disaster_type: str, severity: int, lat: float = 0.0):
+    report = Report(text="test", lat=lat, lon=0, source="test", created_at=created_at)
+    session.add(report)
+    report_received(session, report)
+    session.flush()
+    alert, _ = cluster_report(session, report, {
+        "disaster_type": disaster_type, "severity_score": severity, "summary": "s", "location_name": "l",
+    })
+    # Backdate the alert, moving its aggregates along
+    before = snapshot_alert(alert)
+    alert.created_at = created_at
+    alert_changed(session, before, snapshot_alert(alert))
+    return alert
+
+
+def _aggregates(session: Session):
+    histogram = sorted((row.resolution, row.bucket_start, row.disaster_type, row.severity_score, row.alert_count,
+                        row.report_count) for row in session.exec(select(AlertHistogram)))
+    volume = sorted((row.resolution, row.bucket_start, row.report_count) for row in session.exec(select(ReportVolume)))
+    return histogram, volume
+
+
+def test_interval_coarsens_to_fit_the_point_limit():
+    assert bucket_count(3600, T0, T0 + timedelta(hours=3)) == 3
+    assert bucket_count(3600, T0 + timedelta(minutes=30), T0 + timedelta(hours=3)) == 3
+    assert plan_interval("5m", T0, T0 + timedelta(hours=1), max_points=12)[0] == "5m"
+    assert plan_interval("5m", T0, T0 + timedelta(hours=2), max_points=12)[0] == "15m"
+    # The range is widened to whole buckets
+    assert plan_interval("1h", T0 + timedelta(minutes=10), T0 + timedelta(days=10), max_points=12) == (
+        "1d", datetime(2026, 3, 1), datetime(2026, 3, 12))
+
+    # Past the coarsest interval the most recent buckets are kept
+    interval, since, until = plan_interval("1d", T0 - timedelta(days=700), T0, max_points=10)
+    assert interval == "7d"
+    assert bucket_count(7 * 86400, since, until) == 10
+    assert since <= T0 < until
+
+
+def test_histogram_and_raw_rows_agree(engine):
+    with Session(engine) as session:
+        for minute, severity in enumerate([10, 20, 30, 40, 50, 60, 70, 80, 90, 100]):
+            # Far apart so each report opens its own alert
+            _alert(session, T0 + timedelta(minutes=minute), "flood", severity, lat=minute * 10.0)
+        fire = _alert(session, T0 + timedelta(minutes=5), "fire", 70, lat=-45.0)
+        old_fire = _alert(session, T0 + timedelta(hours=1, minutes=5), "fire", 30, lat=-60.0)
+        pending = Report(text="pending", lat=0, lon=0, source="sms", created_at=T0 + timedelta(hours=1))
+        session.add(pending)
+        report_received(session, pending)
+        session.commit()
+
+        # Deactivated and archived alerts stay in the history
+        deactivate_alert(session, fire)
+        deactivate_alert(session, old_fire)
+        fire.updated_at = old_fire.updated_at = T0
+        session.commit()
+        assert archive_alerts(session, now=T0 + timedelta(days=30)) == 2
+        incremental = _aggregates(session)
+        rebuild_timeseries(session)
+        assert _aggregates(session) == incremental
+
+        hourly = get_timeseries(session, "1h", since=T0, until=T0 + timedelta(hours=2))
+        assert hourly["interval"] == "1h"
+        points = {(point["bucket_start"], point["disaster_type"]): point for point in hourly["points"]}
+        assert set(points) == {(T0, "flood"), (T0, "fire"), (T0 + timedelta(hours=1), "fire")}
+        flood = points[(T0, "flood")]
+        assert (flood["alert_count"], flood["report_count"]) == (10, 10)
+        assert (flood["p50_severity"], flood["p90_severity"], flood["p99_severity"]) == (50, 90, 100)
+        assert (flood["avg_severity"], flood["max_severity"]) == (55.0, 100)
+        assert hourly["reports"] == [{"bucket_start": T0, "report_count": 11},
+                                     {"bucket_start": T0 + timedelta(hours=1), "report_count": 2}]
+
+        # Sub-hour intervals read the alert and report rows; summed up they match the precomputed buckets
+        fine = get_timeseries(session, "15m", since=T0, until=T0 + timedelta(hours=2))
+        assert fine["interval"] == "15m"
+        assert sum(point["alert_count"] for point in fine["points"]) == 12
+        assert sum(point["report_count"] for point in fine["reports"]) == 13
+        assert [point["p50_severity"] for point in fine["points"] if point["disaster_type"] == "flood"] == [50]
+
+        fires = get_timeseries(session, "1d", since=T0 - timedelta(days=1), until=T0 + timedelta(days=1),
+                               disaster_type="fire")
+        assert [(point["alert_count"], point["p50_severity"]) for point in fires["points"]] == [(2, 30)]
+        assert fires["reports"] == [{"bucket_start": datetime(2026, 3, 1), "report_count": 13}]
+
+
+def test_timeseries_endpoint(engine, monkeypatch):
+    with Session(engine) as session:
+        _alert(session, T0, "storm", 40)
+        session.commit()
+    monkeypatch.setattr("app.core.config.settings.TIMESERIES_MAX_POINTS", 48)
+    monkeypatch.setattr("app.api.routes_reports.submit_report", lambda report: None)
+    monkeypatch.setattr("app.services.admission.backlog_status", lambda: (0, 0.0))
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = session_override
+    try:
+        client = TestClient(app)
+        response = client.get("/api/v1/alerts/timeseries", params={
+            "interval": "5m", "since": "2026-03-01T00:00:00Z", "until": "2026-03-02T00:00:00Z"})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["interval"] == "1h"
+        assert body["points"] == [{
+            "bucket_start": "2026-03-01T12:00:00", "disaster_type": "storm", "alert_count": 1, "report_count": 1,
+            "avg_severity": 40.0, "p50_severity": 40, "p90_severity": 40, "p99_severity": 40, "max_severity": 40,
+        }]
+        assert body["reports"] == [{"bucket_start": "2026-03-01T12:00:00", "report_count": 1}]
+        assert client.get("/api/v1/alerts/timeseries", params={"interval": "2m"}).status_code == 400
+
+        # Reports posted through the API are counted as they arrive
+        client.post("/api/v1/report", json={"text": "Storm", "lat": 0, "lon": 0, "source": "sms"})
+        body = client.get("/api/v1/alerts/timeseries", params={"interval": "1d"}).json()
+        assert body["reports"][-1]["report_count"] == 1
+    finally:
+        app.dependency_overrides.clear()
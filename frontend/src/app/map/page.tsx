@@ -1,9 +1,6 @@
 "use client";
 
-import { useEffect, useState } from "react";
 import dynamic from "next/dynamic";
-import { fetchAlerts } from "@/lib/api";
-import type { Alert } from "@/lib/types";
 import { Skeleton } from "@/components/ui/skeleton";
 
 // Skeleton for loading state
@@ -25,27 +22,10 @@ const MapView = dynamic(() => import("@/components/MapView"), {
 });
 
 export default function MapPage() {
-  const [alerts, setAlerts] = useState<Alert[]>([]);
-  const [loading, setLoading] = useState(true);
-
-  useEffect(() => {
-    async function loadData() {
-      try {
-        const data = await fetchAlerts();
-        setAlerts(data);
-      } catch (error) {
-        console.error("Failed to fetch alerts:", error);
-      } finally {
-        setLoading(false);
-      }
-    }
-
-    loadData();
-  }, []);
-
+  // MapView loads the grid for the visible area, and the alert list only once zoomed in
   return (
     <div className="flex flex-col" style={{ height: "calc(100vh - 4rem)" }}>
-      {loading ? <MapSkeleton /> : <MapView alerts={alerts} />}
+      <MapView />
     </div>
   );
 }
@@ -3,11 +3,11 @@
 import { useEffect, useRef } from 'react';
 import L from 'leaflet';
 import type { Alert } from '@/lib/types';
+import { fetchAlertGrid, fetchAlerts } from '@/lib/api';
 import { format } from 'date-fns';
 
-type MapViewProps = {
-  alerts: Alert[];
-};
+// Below this zoom the map shows server-side grid cells instead of individual markers
+const GRID_MAX_ZOOM = 8;
 
 const getSeverityStyles = (severity: number) => {
   if (severity >= 70) {
@@ -28,62 +28,108 @@ const createDivIcon = (color: string) => {
     });
 };
 
-export default function MapView({ alerts }: MapViewProps) {
-  const mapRef = useRef<HTMLDivElement>(null);
-  const mapInstanceRef = useRef<L.Map | null>(null);
+const createCellMarker = (lat: number, lon: number, count: number, maxSeverity: number) => {
+  const { color, label } = getSeverityStyles(maxSeverity);
+  const marker = L.circleMarker([lat, lon], {
+    radius: Math.min(8 + 4 * Math.log2(count), 30),
+    color: 'white',
+    weight: 2,
+    fillColor: color,
+    fillOpacity: 0.8,
+  });
+  marker.bindTooltip(`${count} alert${count === 1 ? '' : 's'} · max ${label} (${maxSeverity})`);
+  return marker;
+};
 
-  useEffect(() => {
-    if (mapRef.current && !mapInstanceRef.current) {
-      const map = L.map(mapRef.current).setView([20, 0], 2);
-      mapInstanceRef.current = map;
+const createAlertMarkers = (alerts: Alert[]) => {
+  const markers = L.featureGroup();
 
-      L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
-        attribution: '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors',
-      }).addTo(map);
-    }
-  }, []);
+  alerts.forEach(alert => {
+    const { color, label } = getSeverityStyles(alert.severity);
+    const marker = L.marker([alert.lat, alert.lon], {
+      icon: createDivIcon(color),
+    });
 
-  useEffect(() => {
+    const popupContent = `
+      <div style="font-family: Inter, sans-serif; font-size: 14px; line-height: 1.6;">
+        <h3 style="font-weight: 600; font-size: 16px; margin: 0 0 8px; color: #2E4765;">${alert.alert_type}</h3>
+        <p style="margin: 0 0 4px;"><strong>Summary:</strong> ${alert.summary}</p>
+        <p style="margin: 0 0 4px;"><strong>Location:</strong> ${alert.location}</p>
+        <p style="margin: 0 0 4px;"><strong>Severity:</strong> <span style="color: ${color}; font-weight: bold;">${label} (${alert.severity})</span></p>
+        <p style="margin: 0; font-size: 12px; color: #666;">${format(new Date(alert.timestamp), 'PPpp')}</p>
+      </div>
+    `;
+
+    marker.bindPopup(popupContent);
+    markers.addLayer(marker);
+  });
+
+  return markers;
+};
+
+export default function MapView() {
+  const mapRef = useRef<HTMLDivElement>(null);
+  const mapInstanceRef = useRef<L.Map | null>(null);
+  const markersRef = useRef<Promise<L.FeatureGroup> | null>(null);
+  const gridLayerRef = useRef<L.LayerGroup | null>(null);
+  const gridRequestRef = useRef(0);
+  const fittedRef = useRef(false);
+
+  // Zoomed out: constant-size grid from the server; zoomed in: individual alert markers.
+  // The full alert list is only fetched the first time the map is zoomed in past the grid.
+  const refreshLayers = async () => {
     const map = mapInstanceRef.current;
     if (!map) return;
-    
-    // Clear existing markers
-    map.eachLayer(layer => {
-      if (layer instanceof L.Marker) {
-        map.removeLayer(layer);
+
+    const requestId = ++gridRequestRef.current;
+    if (map.getZoom() > GRID_MAX_ZOOM) {
+      gridLayerRef.current?.clearLayers();
+      markersRef.current ??= fetchAlerts().then(createAlertMarkers);
+      const markers = await markersRef.current;
+      // Zoomed back out while the alerts were loading
+      if (requestId !== gridRequestRef.current) return;
+      if (!map.hasLayer(markers)) {
+        markers.addTo(map);
       }
-    });
+      return;
+    }
 
-    if (alerts.length === 0) return;
+    markersRef.current?.then(markers => map.removeLayer(markers));
+    const grid = await fetchAlertGrid(map.getBounds().toBBoxString(), map.getZoom());
+    // Drop responses that arrive after a newer pan or zoom
+    if (!grid || requestId !== gridRequestRef.current) return;
 
-    const markers = L.featureGroup();
+    const layer = gridLayerRef.current ?? L.layerGroup().addTo(map);
+    gridLayerRef.current = layer;
+    layer.clearLayers();
+    grid.cells.forEach(cell => {
+      layer.addLayer(createCellMarker(cell.lat, cell.lon, cell.count, cell.max_severity));
+    });
 
-    alerts.forEach(alert => {
-      const { color, label } = getSeverityStyles(alert.severity);
-      const marker = L.marker([alert.lat, alert.lon], {
-        icon: createDivIcon(color),
+    if (!fittedRef.current && grid.cells.length > 0) {
+      // Frame the alerts once, from the cells of the first (world) grid
+      fittedRef.current = true;
+      const bounds = L.latLngBounds([]);
+      grid.cells.forEach(cell => {
+        bounds.extend([[cell.bounds[0], cell.bounds[1]], [cell.bounds[2], cell.bounds[3]]]);
       });
+      map.fitBounds(bounds.pad(0.2));
+    }
+  };
 
-      const popupContent = `
-        <div style="font-family: Inter, sans-serif; font-size: 14px; line-height: 1.6;">
-          <h3 style="font-weight: 600; font-size: 16px; margin: 0 0 8px; color: #2E4765;">${alert.alert_type}</h3>
-          <p style="margin: 0 0 4px;"><strong>Summary:</strong> ${alert.summary}</p>
-          <p style="margin: 0 0 4px;"><strong>Location:</strong> ${alert.location}</p>
-          <p style="margin: 0 0 4px;"><strong>Severity:</strong> <span style="color: ${color}; font-weight: bold;">${label} (${alert.severity})</span></p>
-          <p style="margin: 0; font-size: 12px; color: #666;">${format(new Date(alert.timestamp), 'PPpp')}</p>
-        </div>
-      `;
-
-      marker.bindPopup(popupContent);
-      markers.addLayer(marker);
-    });
+  useEffect(() => {
+    if (mapRef.current && !mapInstanceRef.current) {
+      const map = L.map(mapRef.current).setView([20, 0], 2);
+      mapInstanceRef.current = map;
 
-    markers.addTo(map);
+      L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+        attribution: '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors',
+      }).addTo(map);
 
-    if (markers.getLayers().length > 0) {
-        map.fitBounds(markers.getBounds().pad(0.2));
+      map.on('moveend', refreshLayers);
+      refreshLayers();
     }
-  }, [alerts]);
+  }, []);
 
   return <div ref={mapRef} className="h-full w-full z-0" />;
 }
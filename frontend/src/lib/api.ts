@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { Alert, Report, HealthStatus } from '@/lib/types';
+import type { Alert, AlertGrid, Report, HealthStatus } from '@/lib/types';
 
 export const API_BASE = process.env.NEXT_PUBLIC_API_BASE;
 
@@ -34,12 +34,30 @@ export async function fetchAlerts(): Promise<Alert[]> {
   }
 }
 
+export async function fetchAlertGrid(bbox: string, zoom: number): Promise<AlertGrid | null> {
+  try {
+    const response = await apiClient.get<AlertGrid>('/api/v1/alerts/grid', { params: { bbox, zoom } });
+    return response.data;
+  } catch (error) {
+    console.error('Failed to fetch alert grid:', error);
+    return null;
+  }
+}
+
 export async function postReport(report: Report): Promise<{ success: boolean; message: string }> {
   try {
     const response = await apiClient.post('/api/v1/report', report);
-    return { success: true, message: 'Report received! Analysis in progress.' };
+    // Under heavy load the server accepts the report but delays its analysis
+    return { success: true, message: response.data.message || 'Report received! Analysis in progress.' };
   } catch (error: any) {
     console.error('Failed to post report:', error);
+    if (error.response?.status === 429) {
+      const retryAfter = error.response.headers['retry-after'];
+      return {
+        success: false,
+        message: `Server is busy processing other reports. Please try again${retryAfter ? ` in ${retryAfter} seconds` : ' shortly'}.`
+      };
+    }
     if (error.response) {
       return {
         success: false,
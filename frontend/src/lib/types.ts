@@ -8,6 +8,22 @@ export interface Alert {
   severity: number;
   timestamp: string;
   source: string;
+  report_count?: number;
+}
+
+export interface AlertGridCell {
+  lat: number;
+  lon: number;
+  bounds: [number, number, number, number]; // south, west, north, east
+  count: number;
+  max_severity: number;
+  avg_severity: number;
+}
+
+export interface AlertGrid {
+  level: number;
+  cell_size_deg: number;
+  cells: AlertGridCell[];
 }
 
 export interface Report {